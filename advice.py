@@ -0,0 +1,199 @@
+# advice.py
+import asyncio
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+
+import metrics
+
+try:
+    import google.generativeai as genai
+except Exception:
+    genai = None
+
+DEFAULT_MODEL = "gemini-1.5-flash"
+DEFAULT_CONCURRENCY = 4
+DEFAULT_CACHE_ENTRIES = 2048
+MAX_ADVICE_LINES = 5
+
+
+def build_prompt(resume_skills, job: dict, required, matched, missing) -> str:
+    return (
+        f"User's resume skills: {', '.join(resume_skills)}\n\n"
+        f"Job title: {job['title']}\n"
+        f"Company: {job['company']}\n"
+        f"Required skills extracted: {', '.join(required)}\n"
+        f"Matched skills: {', '.join(matched)}\n"
+        f"Missing skills: {', '.join(missing)}\n"
+        f"Job requirements: {', '.join(job.get('requirements', []))}\n\n"
+        "Provide 3-5 specific pieces of improvement advice to help the user's resume better match this job. "
+        "Focus on how to acquire or highlight the missing skills."
+    )
+
+
+def parse_advice(text: str) -> list[str]:
+    advice = [line.strip() for line in text.split('\n') if line.strip() and not line.startswith('#')]
+    return advice[:MAX_ADVICE_LINES]
+
+
+def fingerprint(resume_skills, required, missing) -> str:
+    """Cache key for one skill gap; the order of the skills does not matter."""
+    digest = hashlib.sha256()
+    for group in (resume_skills, required, missing):
+        digest.update("\x1f".join(sorted(group)).encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+class GeminiBackend:
+    """Gemini client configured once per process and shared by every request."""
+
+    name = "gemini"
+
+    def __init__(self, api_key: str, model_name: str = DEFAULT_MODEL):
+        if genai is None:
+            raise RuntimeError("google-generativeai is not installed")
+        genai.configure(api_key=api_key)
+        self._model = genai.GenerativeModel(model_name)
+
+    async def generate(self, prompt: str) -> str:
+        response = await self._model.generate_content_async(prompt)
+        return response.text
+
+
+class StubBackend:
+    """Offline backend for load tests: canned advice after a fixed delay."""
+
+    name = "stub"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    async def generate(self, prompt: str) -> str:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        missing = ""
+        for line in prompt.splitlines():
+            if line.startswith("Missing skills:"):
+                missing = line.split(":", 1)[1].strip()
+        if not missing:
+            return "Highlight the matched skills with concrete project results."
+        return "\n".join(f"Add a project or certification that demonstrates {skill}." for skill in missing.split(", "))
+
+
+def backend_from_env():
+    """Pick the backend from $ADVICE_BACKEND (gemini, stub or none); defaults to gemini when a key is set."""
+    choice = os.getenv("ADVICE_BACKEND", "").lower()
+    api_key = os.getenv("GEMINI_API_KEY")
+    if choice == "stub":
+        return StubBackend(float(os.getenv("ADVICE_STUB_LATENCY", "0")))
+    if choice == "none":
+        return None
+    if not api_key:
+        if choice == "gemini":
+            logging.warning("ADVICE_BACKEND=gemini but GEMINI_API_KEY is not set; advice will be empty.")
+        else:
+            logging.warning("GEMINI_API_KEY not set in .env file. Improvement advice will be empty.")
+        return None
+    return GeminiBackend(api_key, os.getenv("ADVICE_MODEL", DEFAULT_MODEL))
+
+
+class AdviceService:
+    """Bounded-concurrency advice generation with an LRU keyed by the skill-gap fingerprint.
+
+    Concurrent requests for the same fingerprint share one backend call.
+    With a `shared` SharedCache, advice generated by any worker process is
+    reused by the others. Failures are logged and yield empty advice; they are
+    not cached.
+    """
+
+    def __init__(self, backend=None, concurrency: int = DEFAULT_CONCURRENCY,
+                 cache_entries: int = DEFAULT_CACHE_ENTRIES, shared=None):
+        self.backend = backend
+        self.cache_entries = cache_entries
+        self.shared = shared
+        self.hits = 0
+        self.misses = 0
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._cache: OrderedDict[str, list[str]] = OrderedDict()
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self._background: set[asyncio.Task] = set()
+
+    def cached(self, resume_skills, required, missing) -> list[str] | None:
+        """Advice already generated for this skill gap, without calling the backend."""
+        return self._lookup(fingerprint(resume_skills, required, missing))
+
+    def prewarm(self, resume_skills, job: dict, required, matched, missing):
+        """Start generating advice in the background; a later `advise` call joins it or hits the cache."""
+        if self.backend is None or self.cached(resume_skills, required, missing) is not None:
+            return
+        task = asyncio.create_task(self.advise(resume_skills, job, required, matched, missing))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def advise(self, resume_skills, job: dict, required, matched, missing) -> list[str]:
+        if self.backend is None:
+            return []
+        key = fingerprint(resume_skills, required, missing)
+        cached = self._lookup(key)
+        if cached is not None:
+            self.hits += 1
+            metrics.cache_requests.inc(cache="advice", result="hit")
+            return cached
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.hits += 1
+            metrics.cache_requests.inc(cache="advice", result="hit")
+            # Joining a call started elsewhere (e.g. a prewarm): only the wait shows up in this request
+            with metrics.span("advice_wait"):
+                return await asyncio.shield(pending)
+
+        self.misses += 1
+        metrics.cache_requests.inc(cache="advice", result="miss")
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        advice = []
+        try:
+            async with self._semaphore:
+                with metrics.span("advice"):
+                    text = await self.backend.generate(build_prompt(resume_skills, job, required, matched, missing))
+            metrics.llm_calls.inc(backend=self.backend.name, outcome="ok")
+            advice = parse_advice(text)
+            self._remember(key, advice)
+            if self.shared is not None:
+                self.shared.put("advice", key, advice)
+        except Exception as e:
+            metrics.llm_calls.inc(backend=self.backend.name, outcome="error")
+            logging.error(f"Advice backend error for job {job['title']}: {e}")
+        finally:
+            del self._in_flight[key]
+            future.set_result(advice)
+        return advice
+
+    def stats(self) -> dict:
+        return {
+            "backend": getattr(self.backend, "name", None),
+            "hits": self.hits,
+            "misses": self.misses,
+            "cached": len(self._cache),
+            "in_flight": len(self._in_flight),
+        }
+
+    def _lookup(self, key: str) -> list[str] | None:
+        advice = self._cache.get(key)
+        if advice is not None:
+            self._cache.move_to_end(key)
+        elif self.shared is not None:
+            advice = self.shared.get("advice", key)
+            if advice is not None:
+                self._remember(key, advice)
+        return advice
+
+    def _remember(self, key: str, advice: list[str]):
+        self._cache[key] = advice
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_entries:
+            self._cache.popitem(last=False)
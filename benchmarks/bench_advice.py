@@ -0,0 +1,91 @@
+"""Offline load test for the advice subsystem using the stub backend.
+
+Usage: python benchmarks/bench_advice.py [--jobs N] [--resumes N] [--latency S] [--concurrency N]
+
+Compares the old serial one-call-per-job loop with AdviceService (bounded
+concurrency plus the skill-gap cache) on a synthetic workload where several
+resumes share the same skill set, as happens with repeat uploads.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from advice import AdviceService, StubBackend, build_prompt  # noqa: E402
+
+SKILLS = ["python", "java", "javascript", "react", "node.js", "docker", "kubernetes", "aws",
+          "sql", "mongodb", "django", "flutter", "go", "rust", "git", "linux"]
+
+
+def workload(jobs, resumes, seed=7):
+    rng = random.Random(seed)
+    catalog = []
+    for i in range(jobs):
+        required = sorted(rng.sample(SKILLS, rng.randint(2, 6)))
+        catalog.append(({"title": f"Job {i}", "company": "Acme", "requirements": []}, required))
+    # Half the resumes repeat an earlier skill set
+    skill_sets = []
+    for i in range(resumes):
+        if skill_sets and i % 2:
+            skill_sets.append(rng.choice(skill_sets))
+        else:
+            skill_sets.append(frozenset(rng.sample(SKILLS, rng.randint(3, 8))))
+    return catalog, skill_sets
+
+
+def gap(resume_skills, required):
+    return [s for s in required if s in resume_skills], [s for s in required if s not in resume_skills]
+
+
+async def run_serial(catalog, skill_sets, latency):
+    backend = StubBackend(latency)
+    for resume_skills in skill_sets:
+        for job, required in catalog:
+            matched, missing = gap(resume_skills, required)
+            await backend.generate(build_prompt(resume_skills, job, required, matched, missing))
+    return backend.calls
+
+
+async def run_service(catalog, skill_sets, latency, concurrency):
+    backend = StubBackend(latency)
+    service = AdviceService(backend, concurrency=concurrency)
+
+    async def one_resume(resume_skills):
+        await asyncio.gather(*(service.advise(resume_skills, job, required, *gap(resume_skills, required))
+                               for job, required in catalog))
+
+    await asyncio.gather(*(one_resume(s) for s in skill_sets))
+    return backend.calls
+
+
+def timed(coro):
+    started = time.perf_counter()
+    calls = asyncio.run(coro)
+    return {"seconds": round(time.perf_counter() - started, 3), "backend_calls": calls}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=10)
+    parser.add_argument("--resumes", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated LLM round trip in seconds")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    catalog, skill_sets = workload(args.jobs, args.resumes)
+    results = {
+        "serial": timed(run_serial(catalog, skill_sets, args.latency)),
+        "service": timed(run_service(catalog, skill_sets, args.latency, args.concurrency)),
+    }
+    results["speedup"] = round(results["serial"]["seconds"] / results["service"]["seconds"], 2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
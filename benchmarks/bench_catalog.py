@@ -0,0 +1,201 @@
+"""Benchmark: load time and memory of the JSON job catalog vs the memory-mapped binary catalog.
+
+Usage: python benchmarks/bench_catalog.py [--jobs 100000] [--processes 4] [--output PATH]
+
+Writes `--jobs` synthetic postings as a job_skills.json-style file, converts
+it with job_catalog.py, then measures each way of getting to a scoreable
+catalog in a fresh interpreter:
+
+  json     json.load + skill normalization + SkillIndex build (what a worker
+           does without a catalog file)
+  catalog  MappedCatalog open (header only), then the first score
+
+Each child reports load time, first-score time and its RSS split into
+anonymous (private heap) and file-backed memory. Then `--processes` catalog
+readers run at once and their proportional set size (PSS, which divides
+shared pages between the processes mapping them) is read from
+/proc/<pid>/smaps_rollup, showing the catalog pages being shared. RSS figures
+need Linux /proc; elsewhere only peak RSS from getrusage is reported.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def memory_kb(pid="self") -> dict:
+    """RSS breakdown of a process in KiB (VmRSS, RssAnon, RssFile) plus Pss when smaps_rollup is readable."""
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "RssAnon", "RssFile"):
+                    fields[key] = int(value.split()[0])
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key == "Pss":
+                    fields[key] = int(value.split()[0])
+    except OSError:
+        if pid == "self":
+            # ru_maxrss is KiB on Linux, bytes on macOS
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            fields["PeakRSS"] = peak // 1024 if sys.platform == "darwin" else peak
+    return fields
+
+
+def sample_resume(seed: int = 3) -> set[str]:
+    import fake_bdjobs
+    with open(fake_bdjobs.DEFAULT_DICTIONARY_PATH, encoding="utf-8") as f:
+        vocabulary = sorted(json.load(f)["skills"])
+    return set(random.Random(seed).sample(vocabulary, 12))
+
+
+def child(mode: str, json_path: str, catalog_path: str, hold: bool):
+    from job_catalog import MappedCatalog
+    from skill_index import SkillIndex
+    from skill_matcher import SYNONYMS, SkillMatcher
+    matcher = SkillMatcher.from_sources(SYNONYMS)
+    resume = matcher.extract(sorted(sample_resume()))
+    # Imports and the matcher are common to both modes; report growth from here
+    before = memory_kb()
+
+    started = time.perf_counter()
+    if mode == "json":
+        with open(json_path, encoding="utf-8") as f:
+            jobs = json.load(f)
+        index = SkillIndex()
+        for job in jobs:
+            index.add_job(job["job_id"], matcher.job_skills(job))
+    else:
+        index = MappedCatalog(catalog_path)
+    load_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ranked = index.score(resume, top_k=50)
+    first_score_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    index.score(resume, top_k=50)
+    score_seconds = time.perf_counter() - started
+
+    after = memory_kb()
+    print(json.dumps({
+        "mode": mode,
+        "jobs": len(index),
+        "load_ms": round(load_seconds * 1000, 2),
+        "first_score_ms": round(first_score_seconds * 1000, 2),
+        "score_ms": round(score_seconds * 1000, 2),
+        "best_score": ranked[0]["score"] if ranked else None,
+        "memory_kb_before": before,
+        "memory_kb_after": after,
+    }), flush=True)
+    if hold:
+        # Keep the mapping alive until the parent has read /proc/<pid>/smaps_rollup
+        sys.stdin.read()
+
+
+def spawn(mode: str, json_path: str, catalog_path: str, hold: bool = False) -> subprocess.Popen:
+    args = [sys.executable, os.path.abspath(__file__), "--child", mode, "--json-path", json_path,
+            "--catalog-path", catalog_path] + (["--hold"] if hold else [])
+    return subprocess.Popen(args, stdin=subprocess.PIPE if hold else subprocess.DEVNULL,
+                            stdout=subprocess.PIPE, text=True)
+
+
+def run_once(mode: str, json_path: str, catalog_path: str) -> dict:
+    process = spawn(mode, json_path, catalog_path)
+    out, _ = process.communicate()
+    if process.returncode:
+        raise RuntimeError(f"{mode} child exited with status {process.returncode}")
+    return json.loads(out)
+
+
+def run_shared(processes: int, json_path: str, catalog_path: str) -> dict:
+    children = [spawn("catalog", json_path, catalog_path, hold=True) for _ in range(processes)]
+    try:
+        reports = [json.loads(c.stdout.readline()) for c in children]
+        memory = [memory_kb(c.pid) for c in children]
+    finally:
+        for c in children:
+            c.stdin.close()
+            c.wait()
+    return {
+        "processes": processes,
+        "rss_kb_each": [m.get("VmRSS") for m in memory],
+        "pss_kb_each": [m.get("Pss") for m in memory],
+        "load_ms_each": [r["load_ms"] for r in reports],
+    }
+
+
+def prepare(work_dir: str, count: int) -> tuple[str, str, dict]:
+    import fake_bdjobs
+    import job_catalog
+    from job_store import job_id_from_url
+    from skill_matcher import SYNONYMS, SkillMatcher
+
+    jobs = fake_bdjobs.synthetic_jobs(count)
+    for job in jobs:
+        job["url"] = f"https://jobs.bdjobs.com/jobdetails/?id={job.pop('id')}&fcatId=8&ln=1"
+        job["job_id"] = job_id_from_url(job["url"])
+    json_path = os.path.join(work_dir, "job_skills.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(jobs, f)
+
+    matcher = SkillMatcher.from_sources(SYNONYMS)
+    catalog_path = os.path.join(work_dir, "jobs.bin")
+    started = time.perf_counter()
+    size = job_catalog.write_catalog(catalog_path, jobs, [matcher.job_skills(job) for job in jobs], matcher.version)
+    return json_path, catalog_path, {
+        "json_bytes": os.path.getsize(json_path),
+        "catalog_bytes": size,
+        "convert_seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--processes", type=int, default=4, help="Concurrent catalog readers for the sharing run")
+    parser.add_argument("--output", help="Write results as JSON here as well")
+    parser.add_argument("--child", choices=["json", "catalog"], help=argparse.SUPPRESS)
+    parser.add_argument("--json-path", help=argparse.SUPPRESS)
+    parser.add_argument("--catalog-path", help=argparse.SUPPRESS)
+    parser.add_argument("--hold", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.json_path, args.catalog_path, args.hold)
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="job-catalog-") as work_dir:
+        json_path, catalog_path, files = prepare(work_dir, args.jobs)
+        print(f"{args.jobs} jobs: JSON {files['json_bytes'] / 2**20:.1f} MiB, catalog "
+              f"{files['catalog_bytes'] / 2**20:.1f} MiB (converted in {files['convert_seconds']}s)", flush=True)
+        runs = [run_once(mode, json_path, catalog_path) for mode in ("json", "catalog")]
+        for run in runs:
+            before, after = run["memory_kb_before"], run["memory_kb_after"]
+            growth = {k: after[k] - before.get(k, 0) for k in after}
+            print(f"{run['mode']:>8}: load {run['load_ms']:>9.2f} ms  first score {run['first_score_ms']:>8.2f} ms  "
+                  f"score {run['score_ms']:>7.2f} ms  memory growth {growth} KiB", flush=True)
+        shared = run_shared(args.processes, json_path, catalog_path)
+        print(f"{args.processes} catalog readers: RSS {shared['rss_kb_each']} KiB, PSS {shared['pss_kb_each']} KiB",
+              flush=True)
+
+    report = {"jobs": args.jobs, **files, "runs": runs, "shared": shared}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
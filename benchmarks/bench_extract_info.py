@@ -0,0 +1,111 @@
+"""Benchmark resume_parser.extract_info_from_text against the previous per-section regexes.
+
+Usage: python benchmarks/bench_extract_info.py [--repeat N] [--scale K]
+
+Texts come from resume/*.pdf; `--scale` also times a synthetic long CV made by
+concatenating all of them K times. Output is checked for equality with the
+legacy implementation before anything is timed.
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resume_parser  # noqa: E402
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# extract_info_from_text as it was before the single-pass section segmenter
+def legacy_extract_info(text):
+    info = {
+        "name": "Not found", "email": "Not found", "phone": "Not found", "linkedin": "Not found",
+        "github_profiles": [], "education": "Not found", "technical_skills": "Not found",
+        "projects": {"text": "Not found", "links": []}, "achievements": "Not found",
+        "experience": "Not found", "reference": "Not found"
+    }
+    name_patterns = [
+        r"(?i)(?:Md|Mr|Ms|Mrs)?\.?\s?([A-Z][a-z]+(?:\s[A-Z][a-z]+){1,4})",
+        r"(?i)^[A-Z\s]+$",
+        r"(?i)([A-Z][a-z]+\s[A-Z][a-z]+)"
+    ]
+    for pattern in name_patterns:
+        name_match = re.search(pattern, text, re.MULTILINE)
+        if name_match:
+            info["name"] = name_match.group(0).strip()
+            break
+    email_match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', text)
+    if email_match:
+        info["email"] = email_match.group(0)
+    for pattern in [r'\+880\s?\d{10}', r'\b\d{11}\b', r'\b\d{3}-\d{8}\b']:
+        phone_match = re.search(pattern, text)
+        if phone_match:
+            info["phone"] = phone_match.group(0)
+            break
+    linkedin_pattern = r'https?://(?:www\.)?linkedin\.com/in/[^\s]+'
+    github_pattern = r'https?://github\.com/[^\s]+'
+    info["linkedin"] = re.search(linkedin_pattern, text).group(0) if re.search(linkedin_pattern, text) else "Not found"
+    info["github_profiles"] = list(set(re.findall(github_pattern, text)))
+    section_patterns = {
+        "education": r'(?i)(Education|Academic Background|Qualifications|Studies)\s*([\s\S]+?)(?=(?:Technical Skills|Skills|Experience|Projects|Achievements|Extracurricular|Certifications|Reference|$))',
+        "technical_skills": r'(?i)(Technical Skills|Skills|Technologies|Proficiencies)\s*([\s\S]+?)(?=(?:Experience|Projects|Achievements|Extracurricular|Certifications|Reference|$))',
+        "projects": r'(?i)(Projects|Notable Projects|Portfolio|Work)\s*([\s\S]+?)(?=(?:Achievements|Experience|Extracurricular|Certifications|Reference|$))',
+        "achievements": r'(?i)(Achievements|Awards|Honors|Accomplishments|Volunteering)\s*([\s\S]+?)(?=(?:Experience|Extracurricular|Certifications|Reference|$))',
+        "experience": r'(?i)(Experience|Work Experience|Professional Experience|Employment)\s*([\s\S]+?)(?=(?:Projects|Achievements|Extracurricular|Certifications|Reference|$))',
+        "reference": r'(?i)(Reference|References|Referees)\s*([\s\S]+?)(?=$)'
+    }
+    for key, pattern in section_patterns.items():
+        match = re.search(pattern, text)
+        if match:
+            info[key] = resume_parser.clean_text(match.group(2).strip())
+            if key == "projects":
+                info["projects"] = {"text": info[key], "links": info["github_profiles"]}
+    return info
+
+
+def comparable(info):
+    # GitHub links used to come out of a set, so their order is not significant
+    info = dict(info, github_profiles=sorted(info["github_profiles"]))
+    info["projects"] = dict(info["projects"], links=sorted(info["projects"]["links"]))
+    return info
+
+
+def best_of(fn, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--scale", type=int, default=20)
+    args = parser.parse_args()
+
+    texts = {}
+    for path in sorted(glob.glob(os.path.join(PROJECT_DIR, "resume", "*.pdf"))):
+        text = resume_parser.extract_text_from_pdf(path)
+        if text:
+            texts[os.path.basename(path)] = text
+    if args.scale:
+        texts[f"synthetic x{args.scale}"] = " ".join(texts.values()) * args.scale
+
+    print(f"{'input':45} {'chars':>8} {'legacy ms':>10} {'new ms':>10} {'speedup':>8}")
+    for name, text in texts.items():
+        if comparable(legacy_extract_info(text)) != comparable(resume_parser.extract_info_from_text(text)):
+            print(f"MISMATCH in {name}")
+            return 1
+        legacy = best_of(legacy_extract_info, text, args.repeat)
+        new = best_of(resume_parser.extract_info_from_text, text, args.repeat)
+        print(f"{name[:45]:45} {len(text):8d} {legacy * 1000:10.3f} {new * 1000:10.3f} {legacy / new:7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
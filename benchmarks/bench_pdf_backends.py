@@ -0,0 +1,81 @@
+"""Compare PDF text extraction backends on latency and memory over resume/*.pdf.
+
+Usage: python benchmarks/bench_pdf_backends.py [--repeat N] [PDF ...]
+
+Each backend runs in a fresh process so its peak RSS is not polluted by the
+others; Python-level allocations are reported from tracemalloc as well.
+"""
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+import pdf_extraction  # noqa: E402
+
+
+def run_backend(backend, paths, repeat):
+    # Warm up imports and file cache before measuring
+    for path in paths:
+        pdf_extraction.extract_text(path, backend)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    per_file = {}
+    for path in paths:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            text, _, pages = pdf_extraction.extract_text(path, backend)
+            best = min(best, time.perf_counter() - started)
+        per_file[os.path.basename(path)] = {"ms": round(best * 1000, 3), "pages": pages, "chars": len(text)}
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "backend": backend,
+        "total_ms": round(sum(f["ms"] for f in per_file.values()), 3),
+        "python_peak_kb": traced_peak // 1024,
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "rss_growth_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before,
+        "files": per_file,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdfs", nargs="*", default=sorted(glob.glob(os.path.join(PROJECT_DIR, "resume", "*.pdf"))))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backend", help=argparse.SUPPRESS)  # internal: run one backend and print JSON
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    if args.backend:
+        print(json.dumps(run_backend(args.backend, args.pdfs, args.repeat)))
+        return 0
+
+    results = []
+    for backend in pdf_extraction.available_backends():
+        out = subprocess.run(
+            [sys.executable, __file__, "--backend", backend, "--repeat", str(args.repeat), *args.pdfs],
+            capture_output=True, text=True, check=True,
+        )
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{'backend':12} {'total ms':>10} {'per file ms':>12} {'py peak KB':>11} {'max RSS KB':>11}")
+    for r in results:
+        print(f"{r['backend']:12} {r['total_ms']:10.2f} {r['total_ms'] / max(1, len(r['files'])):12.2f} "
+              f"{r['python_peak_kb']:11d} {r['max_rss_kb']:11d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
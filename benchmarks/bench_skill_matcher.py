@@ -0,0 +1,112 @@
+"""Regression check and benchmark for skill_matcher against the previous split-and-lookup tokenizer.
+
+Usage: python benchmarks/bench_skill_matcher.py [--repeat N] [--scale K] [--update]
+
+The skill sets extracted from job_skills.json and the phrase cases in
+fixtures/skills/expected.json must match exactly (exit status 1 otherwise;
+`--update` rewrites the fixture after an intended change). Recall is then
+compared with the legacy tokenizer, and both are timed on a requirements blob
+made by repeating every requirement line K times.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from skill_matcher import SYNONYMS, SkillMatcher  # noqa: E402
+
+FIXTURE_PATH = os.path.join(PROJECT_DIR, "fixtures", "skills", "expected.json")
+
+
+# scraper._tokenize_to_skills as it was before skill_matcher
+def _legacy_normalize(tok):
+    t = tok.strip().lower().replace("+ +", "++").replace("react js", "react").replace("node js", "node.js")
+    t = t.replace("tailwindcss", "tailwind css").replace("postgre sql", "postgresql")
+    t = t.strip(".,;:·•")
+    return SYNONYMS.get(t, t)
+
+
+def legacy_tokenize(value):
+    if value is None:
+        return set()
+    text = " , ".join(map(str, value)) if isinstance(value, list) else str(value)
+    parts = re.split(r"[,\|/;:\(\)\[\]\{\}·•\-–—\+\n\t]+", text, flags=re.IGNORECASE)
+    skills = {_legacy_normalize(p) for p in parts if len(_legacy_normalize(p)) >= 2}
+    noise = {"experience", "proficiency", "knowledge", "familiarity", "tools", "frameworks", "language", "technologies", "skills"}
+    return {s for s in skills if s not in noise}
+
+
+def job_skillset(tokenize, job):
+    # Mirrors SkillMatcher.job_skills, for either tokenizer
+    return tokenize(job.get("skills", [])) | tokenize(" . ".join(job.get("requirements", [])))
+
+
+def best_of(fn, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--scale", type=int, default=200)
+    parser.add_argument("--update", action="store_true", help="Rewrite the expected skill sets")
+    args = parser.parse_args()
+
+    matcher = SkillMatcher.from_sources(SYNONYMS)
+    with open(os.path.join(PROJECT_DIR, "job_skills.json"), encoding="utf-8") as f:
+        jobs = json.load(f)
+    with open(FIXTURE_PATH, encoding="utf-8") as f:
+        fixture = json.load(f)
+
+    got_jobs = {job["url"]: sorted(job_skillset(matcher.extract, job)) for job in jobs}
+    got_cases = [{"text": c["text"], "skills": sorted(matcher.extract(c["text"]))} for c in fixture["cases"]]
+    if args.update:
+        with open(FIXTURE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"jobs": got_jobs, "cases": got_cases}, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"Updated {FIXTURE_PATH}")
+        return
+
+    failures = 0
+    for url, skills in got_jobs.items():
+        if skills != fixture["jobs"].get(url):
+            failures += 1
+            print(f"MISMATCH {url}: {skills} != {fixture['jobs'].get(url)}")
+    for case, want in zip(got_cases, fixture["cases"]):
+        if case["skills"] != want["skills"]:
+            failures += 1
+            print(f"MISMATCH {case['text']!r}: {case['skills']} != {want['skills']}")
+    print(f"regression: {len(got_jobs) + len(got_cases) - failures}/{len(got_jobs) + len(got_cases)} ok")
+
+    # Recall over dictionary skills only; the legacy tokenizer also emits sentence fragments
+    vocabulary = set(matcher.aliases.values())
+    legacy_known = new_known = legacy_junk = 0
+    for job in jobs:
+        legacy = job_skillset(legacy_tokenize, job)
+        legacy_known += len(legacy & vocabulary)
+        legacy_junk += len(legacy - vocabulary - set(map(matcher.canonical, job.get("skills", []))))
+        new_known += len(job_skillset(matcher.extract, job) & vocabulary)
+    print(f"dictionary skills found in job_skills.json: legacy {legacy_known}, matcher {new_known} "
+          f"(legacy also produced {legacy_junk} sentence fragments)")
+
+    blob = " . ".join(r for job in jobs for r in job.get("requirements", [])) + " . "
+    blob *= args.scale
+    legacy_s = best_of(legacy_tokenize, blob, args.repeat)
+    new_s = best_of(matcher.find, blob, args.repeat)
+    print(f"{len(blob) // 1024} KiB requirements blob: legacy {legacy_s * 1000:.1f} ms, "
+          f"matcher {new_s * 1000:.1f} ms ({legacy_s / new_s:.2f}x)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""Local stand-in for jobs.bdjobs.com for deterministic, offline crawler runs and load tests.
+
+Usage: python benchmarks/fake_bdjobs.py [--port N] [--jobs FILE | --synthetic N] [--per-page N]
+                                        [--latency MS] [--jitter MS] [--error-rate F] [--error-status CODE]
+                                        [--seed N]
+
+Then run the scraper against it with BDJOBS_ORIGIN=http://127.0.0.1:<port>.
+
+Listing pages (`/jobsearch.asp?pg=N`, optionally `key=` to search) carry
+`div.sout-jobs-wrapper` entries with `DivOpen(...)` onclick handlers and an
+`a.prevnext` "Next »" link; detail pages (`/jobdetails/?id=...`) carry the
+`#skills` buttons and `#requirements` list the crawler reads, with an ETag
+and Last-Modified so conditional GETs get a 304. Jobs come from
+job_skills.json or are generated from skill_dictionary.json.
+
+Every response is delayed by `latency` ± `jitter` ms, and a seeded fraction
+`error_rate` of requests fails with `error_status`. Request counts are
+served as JSON at `/__stats`.
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import random
+import sys
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_JOBS_PATH = os.path.join(PROJECT_DIR, "job_skills.json")
+DEFAULT_DICTIONARY_PATH = os.path.join(PROJECT_DIR, "skill_dictionary.json")
+DEFAULT_PER_PAGE = 10
+# Stable Last-Modified for every generated page, so revalidation always succeeds
+PUBLISHED_AT = formatdate(1_700_000_000, usegmt=True)
+
+_TITLES = ["Software Engineer", "Senior Software Engineer", "Backend Developer", "Frontend Developer",
+           "Full Stack Developer", "QA Engineer", "DevOps Engineer", "Data Analyst", "Mobile App Developer",
+           "Network Engineer"]
+_COMPANIES = ["Acme Tech Ltd.", "Delta Soft", "Northwind Systems", "Padma IT", "Orbit Digital", "Meghna Labs"]
+_REQUIREMENTS = ["At least {n} years of experience in {a} and {b}", "Working knowledge of {a}",
+                 "Hands-on experience with {a}, {b} or {c}", "Familiarity with {c} is a plus",
+                 "Bachelor of Science (BSc) in Computer Science & Engineering"]
+
+
+def load_jobs(path: str = DEFAULT_JOBS_PATH) -> list[dict]:
+    """Jobs from a job_skills.json-style file, keyed by the `id` of their original detail URL."""
+    with open(path, encoding="utf-8") as f:
+        jobs = json.load(f)
+    for i, job in enumerate(jobs):
+        job["id"] = parse_qs(urlparse(job.get("url", "")).query).get("id", [str(100000 + i)])[0]
+    return jobs
+
+
+def synthetic_jobs(count: int, seed: int = 0, dictionary_path: str = DEFAULT_DICTIONARY_PATH) -> list[dict]:
+    """`count` reproducible postings whose skills and requirements use the skill dictionary's names."""
+    with open(dictionary_path, encoding="utf-8") as f:
+        vocabulary = sorted(json.load(f)["skills"])
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        picked = rng.sample(vocabulary, 6)
+        jobs.append({
+            "id": str(2_000_000 + i),
+            "title": rng.choice(_TITLES),
+            "company": rng.choice(_COMPANIES),
+            "skills": picked[:rng.randint(0, 4)],
+            "requirements": [
+                line.format(n=rng.randint(1, 6), a=picked[3], b=picked[4], c=picked[5])
+                for line in rng.sample(_REQUIREMENTS, rng.randint(1, 4))
+            ],
+        })
+    return jobs
+
+
+def _onclick_text(value: str) -> str:
+    # DivOpen(...) arguments are single-quoted; the crawler's regex does not allow quotes inside them
+    return html.escape(value.replace("'", ""))
+
+
+def render_listing(jobs: list[dict], page: int, per_page: int, query: str = "") -> str:
+    chunk = jobs[(page - 1) * per_page:page * per_page]
+    entries = "\n".join(
+        f"<div class=\"sout-jobs-wrapper\" onclick=\"DivOpen('id={job['id']}&amp;fcatId=8&amp;ln=1',0,"
+        f"'{_onclick_text(job['title'])}','{_onclick_text(job['company'])}')\">"
+        f"<span class=\"job-title-text\">{html.escape(job['title'])}</span></div>"
+        for job in chunk
+    )
+    pager = ""
+    if page * per_page < len(jobs):
+        key = f"key={html.escape(query)}&amp;" if query else ""
+        pager = f'<a class="prevnext" href="/jobsearch.asp?{key}fcatId=8&amp;pg={page + 1}">Next »</a>'
+    return f"<!DOCTYPE html><html><body><div id=\"jobList\">{entries}</div>{pager}</body></html>"
+
+
+def render_details(job: dict) -> str:
+    requirements = "".join(f"<li>{html.escape(r)}</li>" for r in job.get("requirements", []))
+    skills = "".join(f'<button class="btn">{html.escape(s)}</button>' for s in job.get("skills", []))
+    return (
+        f"<!DOCTYPE html><html><body><h2 class=\"jtitle\">{html.escape(job['title'])}</h2>"
+        f"<h3 class=\"cname\">{html.escape(job['company'])}</h3>"
+        f"<section id=\"requirements\"><ul>{requirements}</ul></section>"
+        f"<section id=\"skills\"><div>{skills}</div></section></body></html>"
+    )
+
+
+def search(jobs: list[dict], query: str) -> list[dict]:
+    """Postings mentioning `query` in the title, skills or requirements (case-insensitive)."""
+    needle = query.lower()
+    return [job for job in jobs
+            if needle in " ".join([job["title"], *job.get("skills", []), *job.get("requirements", [])]).lower()]
+
+
+class FakeBdjobsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, jobs: list[dict], port: int = 0, per_page: int = DEFAULT_PER_PAGE, latency_ms: float = 0,
+                 jitter_ms: float = 0, error_rate: float = 0, error_status: int = 503, seed: int = 0):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.jobs = jobs
+        self.by_id = {job["id"]: job for job in jobs}
+        self.per_page = per_page
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"listing": 0, "details": 0, "not_modified": 0, "errors": 0, "not_found": 0}
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    @property
+    def listing_url(self) -> str:
+        return f"{self.base_url}/jobsearch.asp?fcatId=8&icatId="
+
+    @property
+    def details_base(self) -> str:
+        return f"{self.base_url}/jobdetails/"
+
+    def start(self):
+        """Serve from a daemon thread; returns self."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def count(self, kind: str):
+        with self._lock:
+            self.stats[kind] += 1
+
+    def draw(self) -> tuple[float, bool]:
+        """Delay in seconds for one request and whether it should fail."""
+        with self._lock:
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            return delay, self._rng.random() < self.error_rate
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without this keep-alive responses stall on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/__stats":
+            self._send(200, json.dumps(server.stats), "application/json")
+            return
+
+        delay, fail = server.draw()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            server.count("errors")
+            self._send(server.error_status, "<html><body>Service Unavailable</body></html>")
+            return
+
+        if url.path == "/jobsearch.asp":
+            server.count("listing")
+            key = query.get("key", [""])[0]
+            jobs = search(server.jobs, key) if key else server.jobs
+            self._send(200, render_listing(jobs, int(query.get("pg", ["1"])[0]), server.per_page, key))
+            return
+        job = server.by_id.get(query.get("id", [""])[0]) if url.path.rstrip("/") == "/jobdetails" else None
+        if job is None:
+            server.count("not_found")
+            self._send(404, "<html><body>Not Found</body></html>")
+            return
+        body = render_details(job)
+        etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            server.count("not_modified")
+            self._send(304, "", headers={"ETag": etag, "Last-Modified": PUBLISHED_AT})
+            return
+        server.count("details")
+        self._send(200, body, headers={"ETag": etag, "Last-Modified": PUBLISHED_AT})
+
+    def _send(self, status: int, body: str, content_type: str = "text/html; charset=utf-8", headers=None):
+        data = body.encode("utf-8") if status != 304 else b""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--jobs", default=DEFAULT_JOBS_PATH, help="job_skills.json-style file to serve")
+    parser.add_argument("--synthetic", type=int, default=0, help="Serve N generated postings instead of --jobs")
+    parser.add_argument("--per-page", type=int, default=DEFAULT_PER_PAGE)
+    parser.add_argument("--latency", type=float, default=0, help="Delay per request in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="Random ± spread of the delay in ms")
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--seed", type=int, default=0, help="Seed for synthetic jobs, jitter and errors")
+    args = parser.parse_args()
+
+    jobs = synthetic_jobs(args.synthetic, args.seed) if args.synthetic else load_jobs(args.jobs)
+    server = FakeBdjobsServer(jobs, args.port, args.per_page, args.latency, args.jitter, args.error_rate,
+                              args.error_status, args.seed)
+    print(f"Serving {len(jobs)} jobs at {server.base_url} (BDJOBS_ORIGIN={server.base_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
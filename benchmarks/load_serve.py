@@ -0,0 +1,188 @@
+"""Load test for multi-worker serving: throughput of POST /match-jobs as the worker count grows.
+
+Usage: python benchmarks/load_serve.py [--workers 1 2 4] [--jobs N] [--concurrency N] [--duration S]
+                                       [--output PATH]
+
+For each worker count, `serve.py scraper --workers N` is started on a fresh
+port over the same temporary job store (seeded with synthetic postings),
+resume cache and shared cache, then hammered by `--concurrency` concurrent
+clients for `--duration` seconds. Requests per second and latency
+percentiles are printed and written as JSON. Throughput can only scale up to
+the number of cores, which is recorded with the results; the load generator
+runs on the same host and takes a share of them.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_bdjobs  # noqa: E402
+from job_store import JobStore  # noqa: E402
+
+STARTUP_TIMEOUT_SECONDS = 60
+WARMUP_REQUESTS = 20
+
+
+def seed_store(path: str, count: int, seed: int = 0) -> int:
+    jobs = fake_bdjobs.synthetic_jobs(count, seed)
+    for job in jobs:
+        job["url"] = f"https://jobs.bdjobs.com/jobdetails/?id={job['id']}&fcatId=8&ln=1"
+    store = JobStore(path)
+    try:
+        return store.upsert_jobs(jobs)
+    finally:
+        store.close()
+
+
+def synthetic_resumes(count: int, seed: int = 1) -> list[dict]:
+    with open(fake_bdjobs.DEFAULT_DICTIONARY_PATH, encoding="utf-8") as f:
+        vocabulary = sorted(json.load(f)["skills"])
+    rng = random.Random(seed)
+    return [{"name": f"Candidate {i}", "technical_skills": rng.sample(vocabulary, rng.randint(5, 15)),
+             "projects": "Built services with " + ", ".join(rng.sample(vocabulary, 3))}
+            for i in range(count)]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers: int, port: int, env: dict) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(PROJECT_DIR, "serve.py"), "scraper", "--workers", str(workers),
+         "--port", str(port), "--log-level", "warning"],
+        cwd=PROJECT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"serve.py exited with status {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/crawl/status", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"serve.py did not come up within {STARTUP_TIMEOUT_SECONDS}s")
+
+
+def stop_server(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def percentile_ms(ordered: list[float], q: float) -> float | None:
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+
+
+async def hammer(base_url: str, resumes: list[dict], concurrency: int, duration: float) -> dict:
+    latencies, errors = [], 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        # Every worker builds its skill index on its first request; keep that out of the measurement
+        for resume in resumes[:WARMUP_REQUESTS]:
+            await client.post("/match-jobs", params={"prewarm": 0}, json=resume)
+
+        deadline = time.perf_counter() + duration
+
+        async def user(offset: int):
+            nonlocal errors
+            i = offset
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await client.post("/match-jobs", params={"prewarm": 0}, json=resumes[i % len(resumes)])
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+                i += concurrency
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user(n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 2),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": percentile_ms(latencies, 0.5),
+        "p95_ms": percentile_ms(latencies, 0.95),
+        "p99_ms": percentile_ms(latencies, 0.99),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--jobs", type=int, default=2000, help="Synthetic postings in the job store")
+    parser.add_argument("--resumes", type=int, default=200, help="Distinct resumes to cycle through")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent client connections")
+    parser.add_argument("--duration", type=float, default=15, help="Measured seconds per worker count")
+    parser.add_argument("--output", help="Write results as JSON here as well")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="resume-load-")
+    env = {
+        **os.environ,
+        "JOB_STORE_PATH": os.path.join(work_dir, "job_store.db"),
+        "RESUME_CACHE_DIR": os.path.join(work_dir, "resume_cache"),
+        "SHARED_CACHE_PATH": os.path.join(work_dir, "shared.db"),
+        "CRAWL_INTERVAL_SECONDS": "0",
+        "ADVICE_BACKEND": "stub",
+        "BROWSER_PREWARM": "0",
+        "SLOW_REQUEST_SECONDS": "0",
+    }
+    seed_store(env["JOB_STORE_PATH"], args.jobs)
+    resumes = synthetic_resumes(args.resumes)
+
+    runs = []
+    for workers in args.workers:
+        port = free_port()
+        process = start_server(workers, port, env)
+        try:
+            result = asyncio.run(hammer(f"http://127.0.0.1:{port}", resumes, args.concurrency, args.duration))
+        finally:
+            stop_server(process)
+        runs.append({"workers": workers, **result})
+        print(f"{workers:>3} worker(s): {result['requests_per_second']:>8.1f} req/s  p50 {result['p50_ms']} ms  "
+              f"p99 {result['p99_ms']} ms  errors {result['errors']}", flush=True)
+
+    baseline = runs[0]["requests_per_second"] or 1
+    for run in runs:
+        run["speedup"] = round(run["requests_per_second"] / baseline, 2)
+    report = {"cpu_count": os.cpu_count(), "jobs": args.jobs, "concurrency": args.concurrency,
+              "duration_seconds": args.duration, "runs": runs}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
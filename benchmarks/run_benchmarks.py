@@ -0,0 +1,387 @@
+"""Benchmark suite for the parse, tokenize, score and end-to-end paths, with machine-readable results.
+
+Usage: python benchmarks/run_benchmarks.py [--repeat N] [--only SUBSTR ...] [--output PATH]
+                                           [--compare BASELINE.json] [--threshold F]
+
+Every case is timed `--repeat` times after a warm-up run; min/median/mean/p95
+wall time is recorded. Results go to benchmarks/results/<commit>.json by
+default. With `--compare`, medians are checked against an earlier results
+file; the exit status is 1 if any case failed or got slower by more than
+`--threshold` (relative).
+
+The API cases run the scraper app in-process through the FastAPI TestClient,
+on a temporary job store and with the stub advice backend; crawl cases hit a
+local fake bdjobs server (benchmarks/fake_bdjobs.py). Cases whose
+prerequisites are missing (a PDF backend, a Playwright browser) are recorded
+as skipped.
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# The scraper app reads these at import time; keep the benchmark away from the real store and cache
+_WORK_DIR = tempfile.mkdtemp(prefix="resume-bench-")
+os.environ.setdefault("JOB_STORE_PATH", os.path.join(_WORK_DIR, "job_store.db"))
+os.environ.setdefault("RESUME_CACHE_DIR", os.path.join(_WORK_DIR, "resume_cache"))
+os.environ.setdefault("SHARED_CACHE_PATH", os.path.join(_WORK_DIR, "shared.db"))
+if os.getenv("JOB_CATALOG_PATH"):
+    # Catalog mode stays opt-in, but the app rewrites the file on startup; never touch the real one
+    os.environ["JOB_CATALOG_PATH"] = os.path.join(_WORK_DIR, "jobs.bin")
+os.environ["CRAWL_INTERVAL_SECONDS"] = "0"
+os.environ["ADVICE_BACKEND"] = "stub"
+
+import fake_bdjobs  # noqa: E402
+import pdf_extraction  # noqa: E402
+import resume_parser  # noqa: E402
+
+RESULTS_DIR = os.path.join(PROJECT_DIR, "benchmarks", "results")
+SCORE_CATALOG_SIZES = (10, 1000, 100000)
+
+CASES = []
+
+
+class Skip(Exception):
+    """Raised by a case setup whose prerequisites are missing."""
+
+
+def case(name):
+    """Register a setup function returning `(fn, items)` or `(fn, items, before)`; `before` runs untimed."""
+    def register(setup):
+        CASES.append((name, setup))
+        return setup
+    return register
+
+
+def resume_pdfs():
+    return sorted(glob.glob(os.path.join(PROJECT_DIR, "resume", "*.pdf")))
+
+
+def load_catalog():
+    with open(os.path.join(PROJECT_DIR, "job_skills.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def synthetic_skill_sets(n, seed=11):
+    """Job skill sets drawn from the real catalog's vocabulary, so overlap rates stay realistic."""
+    import scraper
+    vocabulary = sorted(set().union(*(scraper._extract_job_skillset(job) for job in load_catalog())))
+    rng = random.Random(seed)
+    return [set(rng.sample(vocabulary, rng.randint(3, min(25, len(vocabulary))))) for _ in range(n)]
+
+
+# ---------------- Parse ----------------
+for _backend in pdf_extraction.BACKEND_PREFERENCE:
+    @case(f"parse.pdf_text[{_backend}]")
+    def _pdf_text(backend=_backend):
+        if backend not in pdf_extraction.available_backends():
+            raise Skip(f"{backend} is not installed")
+        paths = resume_pdfs()
+        return (lambda: [pdf_extraction.extract_text(p, backend) for p in paths]), len(paths)
+
+
+@case("parse.extract_info_from_text")
+def _extract_info():
+    texts = [resume_parser.extract_text_from_pdf(p) for p in resume_pdfs()]
+    return (lambda: [resume_parser.extract_info_from_text(t) for t in texts]), len(texts)
+
+
+@case("parse.parse_pdf_resume")
+def _parse_pdf_resume():
+    import scraper
+    paths = resume_pdfs()
+    return (lambda: [scraper.parse_pdf_resume(p) for p in paths]), len(paths)
+
+
+# ---------------- Tokenize ----------------
+@case("tokenize.job_skills_json")
+def _tokenize_jobs():
+    import scraper
+    jobs = load_catalog()
+    return (lambda: [scraper._extract_job_skillset(job) for job in jobs]), len(jobs)
+
+
+@case("tokenize.resume_sections")
+def _tokenize_resumes():
+    import scraper
+    resumes = [scraper.parse_pdf_resume(p) for p in resume_pdfs()]
+    return (lambda: [scraper._tokenize_to_skills(r["technical_skills"]) | scraper._tokenize_to_skills(r["projects"])
+                     for r in resumes]), len(resumes)
+
+
+# ---------------- Score ----------------
+for _size in SCORE_CATALOG_SIZES:
+    @case(f"score.score_match[{_size}]")
+    def _score_match(size=_size):
+        import scraper
+        job_sets = synthetic_skill_sets(size)
+        resume = synthetic_skill_sets(1, seed=3)[0] | {"python", "javascript", "react"}
+        return (lambda: sorted((scraper._score_match(resume, s) for s in job_sets), reverse=True)), size
+
+    @case(f"score.skill_index[{_size}]")
+    def _skill_index(size=_size):
+        from skill_index import SkillIndex
+        index = SkillIndex()
+        for i, skills in enumerate(synthetic_skill_sets(size)):
+            index.add_job(str(i), skills)
+        resume = synthetic_skill_sets(1, seed=3)[0] | {"python", "javascript", "react"}
+        return (lambda: index.score(resume, top_k=50)), size
+
+    @case(f"score.mapped_catalog[{_size}]")
+    def _mapped_catalog(size=_size):
+        from job_catalog import MappedCatalog, write_catalog
+        path = os.path.join(_WORK_DIR, f"catalog-{size}.bin")
+        jobs = [{"job_id": str(i), "title": "", "company": "", "url": ""} for i in range(size)]
+        write_catalog(path, jobs, synthetic_skill_sets(size))
+        catalog = MappedCatalog(path)
+        resume = synthetic_skill_sets(1, seed=3)[0] | {"python", "javascript", "react"}
+        return (lambda: catalog.score(resume, top_k=50)), size
+
+
+# ---------------- End to end ----------------
+_client = None
+
+
+def api_client():
+    """TestClient over the scraper app, entered once for the whole run."""
+    global _client
+    if _client is None:
+        from fastapi.testclient import TestClient
+        import scraper
+        scraper.RESUME_DIR = os.path.join(_WORK_DIR, "uploads")
+        os.makedirs(scraper.RESUME_DIR, exist_ok=True)
+        _client = TestClient(scraper.app)
+        _client.__enter__()
+    return _client
+
+
+def close_api_client():
+    if _client is not None:
+        _client.__exit__(None, None, None)
+
+
+def upload(client, path) -> dict:
+    with open(path, "rb") as f:
+        response = client.post("/upload_resume", files={"file": (os.path.basename(path), f, "application/pdf")})
+    response.raise_for_status()
+    return response.json()
+
+
+def upload_all(client, paths):
+    for path in paths:
+        upload(client, path)
+
+
+@case("api.upload_resume[cold]")
+def _upload_cold():
+    import scraper
+    from resume_cache import ResumeCache
+    client, paths = api_client(), resume_pdfs()
+
+    def fresh_cache():
+        scraper.resume_cache = ResumeCache(tempfile.mkdtemp(dir=_WORK_DIR), version=scraper.resume_cache.version)
+
+    return (lambda: upload_all(client, paths)), len(paths), fresh_cache
+
+
+@case("api.upload_resume[cached]")
+def _upload_cached():
+    client, paths = api_client(), resume_pdfs()
+    return (lambda: upload_all(client, paths)), len(paths)
+
+
+@case("api.match_jobs")
+def _match_jobs():
+    client = api_client()
+    resumes = [upload(client, p) for p in resume_pdfs()]
+
+    def run():
+        for resume in resumes:
+            client.post("/match-jobs", params={"prewarm": 0}, json=resume).raise_for_status()
+
+    return run, len(resumes)
+
+
+@case("api.match_jobs_advice[stub]")
+def _match_advice():
+    import scraper
+    from advice import AdviceService, StubBackend
+    client = api_client()
+    resume = upload(client, resume_pdfs()[0])
+    job_ids = [m["job_id"] for m in client.post("/match-jobs", params={"prewarm": 0}, json=resume).json()["matches"]]
+
+    def cold_service():
+        # Every run generates advice from scratch instead of hitting the cache
+        scraper.advice_service = AdviceService(StubBackend(), concurrency=scraper.ADVICE_CONCURRENCY)
+
+    def run():
+        for job_id in job_ids:
+            client.post("/match-jobs/advice", json={**resume, "job_id": job_id}).raise_for_status()
+
+    return run, len(job_ids), cold_service
+
+
+_fake_server = None
+
+
+def fake_server():
+    global _fake_server
+    if _fake_server is None:
+        _fake_server = fake_bdjobs.FakeBdjobsServer(fake_bdjobs.load_jobs()).start()
+    return _fake_server
+
+
+@case("crawl.details_http")
+def _crawl_details():
+    import crawler
+    import http_extractor
+    server = fake_server()
+    links = [{"url": f"{server.details_base}?id={job['id']}&fcatId=8&ln=1", "title": job["title"],
+              "company": job["company"]} for job in server.jobs]
+
+    async def fetch():
+        # The HTTP fast path alone; the page pool is only needed when it falls back to a browser
+        async with http_extractor.new_client(max_connections=crawler.DEFAULT_CONCURRENCY) as client:
+            limiter = crawler.HostRateLimiter(rate=1e9, burst=crawler.DEFAULT_CONCURRENCY)
+            await crawler.fetch_details(None, limiter, links, http_client=client)
+
+    return (lambda: asyncio.run(fetch())), len(links)
+
+
+@case("crawl.full[fake_bdjobs]")
+def _crawl_full():
+    import crawler
+    from playwright.sync_api import sync_playwright
+    with sync_playwright() as p:
+        if not os.path.exists(p.firefox.executable_path):
+            raise Skip("Playwright Firefox is not installed (playwright install firefox)")
+    server = fake_server()
+    crawler.JOB_DETAILS_BASE = server.details_base
+    return (lambda: asyncio.run(crawler.crawl(server.listing_url, max_jobs=len(server.jobs)))), len(server.jobs)
+
+
+# ---------------- Runner ----------------
+def measure(fn, repeat, before=None):
+    if before:
+        before()
+    fn()  # warm-up: imports, file cache, lazily built state
+    samples = []
+    for _ in range(repeat):
+        if before:
+            before()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return {
+        "runs": repeat,
+        "min_ms": round(samples[0] * 1000, 3),
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(0.95 * len(samples)))] * 1000, 3),
+    }
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=PROJECT_DIR,
+                                    capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"] if "median_ms" in r}
+    regressions = 0
+    print(f"\n{'case':40} {'baseline ms':>12} {'now ms':>10} {'change':>8}")
+    for r in results:
+        old = baseline.get(r["name"])
+        if old is None or "median_ms" not in r:
+            continue
+        change = r["median_ms"] / max(old["median_ms"], 1e-9) - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        regressions += bool(flag)
+        print(f"{r['name']:40} {old['median_ms']:12.3f} {r['median_ms']:10.3f} {change:+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", default=[], help="Run only cases whose name contains one of these")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown of the median")
+    parser.add_argument("--list", action="store_true", help="List case names and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(name for name, _ in CASES))
+        return 0
+
+    commit, dirty = git_commit()
+    results = []
+    failed = 0
+    try:
+        for name, setup in CASES:
+            if args.only and not any(s in name for s in args.only):
+                continue
+            try:
+                fn, items, *before = setup()
+                stats = measure(fn, args.repeat, *before)
+                stats["items"] = items
+                stats["per_item_ms"] = round(stats["median_ms"] / max(1, items), 4)
+                results.append({"name": name, **stats})
+                print(f"{name:40} {stats['median_ms']:10.3f} ms median  ({items} items, "
+                      f"{stats['per_item_ms']:.4f} ms each)")
+            except Skip as e:
+                results.append({"name": name, "skipped": str(e)})
+                print(f"{name:40} skipped: {e}")
+            except Exception as e:
+                failed += 1
+                results.append({"name": name, "error": repr(e)})
+                print(f"{name:40} FAILED: {e!r}")
+    finally:
+        close_api_client()
+        if _fake_server is not None:
+            _fake_server.shutdown()
+
+    report = {
+        "meta": {
+            "commit": commit,
+            "dirty": dirty,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {output}")
+
+    regressions = compare(results, args.compare, args.threshold) if args.compare else 0
+    return 1 if failed or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
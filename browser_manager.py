@@ -0,0 +1,211 @@
+# browser_manager.py
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from playwright.async_api import async_playwright
+
+import metrics
+
+try:
+    import psutil
+except Exception:
+    psutil = None
+
+USER_AGENT = "Mozilla/5.0"
+DEFAULT_CONCURRENCY = 5
+DEFAULT_MAX_PAGES = 200
+DEFAULT_MAX_RSS_MB = 1024
+# Browser memory is sampled every this many pages (it walks the process tree)
+RSS_CHECK_EVERY = 10
+
+browser_launches = metrics.REGISTRY.register(metrics.Counter(
+    "browser_launches_total", "Browser launches by reason (start, recycle_pages, recycle_memory, crash).",
+    ["reason"]))
+browser_pages_in_use = metrics.REGISTRY.register(metrics.Gauge(
+    "browser_pages_in_use", "Browser pages currently handed out."))
+
+
+def child_pids() -> set[int]:
+    """Pids of this process's direct children (empty without psutil)."""
+    if psutil is None:
+        return set()
+    return {child.pid for child in psutil.Process().children()}
+
+
+def tree_rss_mb(pids) -> float | None:
+    """Resident memory of the processes `pids` and all their descendants, or None without psutil."""
+    if psutil is None:
+        return None
+    total = 0
+    for pid in pids:
+        try:
+            root = psutil.Process(pid)
+            processes = [root, *root.children(recursive=True)]
+        except psutil.Error:
+            continue
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+    return total / (1024 * 1024)
+
+
+class BrowserManager:
+    """One long-lived headless browser shared by every crawl.
+
+    `page()` hands out a fresh page in its own browser context (no cookies or
+    storage shared between tasks), at most `concurrency` at a time. The browser
+    is launched on first use (or by `start()`), replaced after `max_pages`
+    pages or once the Playwright driver's process tree exceeds `max_rss_mb`
+    (needs psutil), and relaunched if it crashes or disconnects. A replaced browser keeps serving
+    the pages already handed out and is closed when the last one is returned.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, max_pages: int = DEFAULT_MAX_PAGES,
+                 max_rss_mb: float = DEFAULT_MAX_RSS_MB, browser_type: str = "firefox", user_agent: str = USER_AGENT):
+        self.concurrency = concurrency
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.browser_type = browser_type
+        self.user_agent = user_agent
+        self.launches = 0
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._lock = asyncio.Lock()
+        self._playwright = None
+        # The Playwright driver process(es); the browsers run beneath them
+        self._driver_pids: set[int] = set()
+        self._browser = None
+        self._pages_served = 0
+        self._recycle_reason: str | None = None
+        self._leases: dict[object, int] = {}
+        self._retired: set = set()
+
+    async def start(self):
+        """Launch the browser ahead of the first crawl; failures are logged and retried on first use."""
+        try:
+            await self._current_browser()
+        except Exception as e:
+            logging.error(f"Could not launch {self.browser_type}; will retry on first crawl: {e}")
+        return self
+
+    async def stop(self):
+        async with self._lock:
+            for browser in [self._browser, *self._retired]:
+                if browser is not None:
+                    await self._close(browser)
+            self._browser = None
+            self._retired.clear()
+            self._leases.clear()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+                self._driver_pids = set()
+
+    @asynccontextmanager
+    async def page(self):
+        async with self._semaphore:
+            browser, context = await self._new_context()
+            self._leases[browser] = self._leases.get(browser, 0) + 1
+            browser_pages_in_use.inc()
+            try:
+                yield await context.new_page()
+            finally:
+                browser_pages_in_use.dec()
+                try:
+                    await context.close()
+                except Exception:
+                    pass  # the browser may already be gone
+                await self._release(browser)
+
+    def stats(self) -> dict:
+        return {
+            "browser": self.browser_type,
+            "running": self._browser is not None and self._browser.is_connected(),
+            "launches": self.launches,
+            "pages_served": self._pages_served,
+            "pages_in_use": sum(self._leases.values()),
+            "retiring": len(self._retired),
+        }
+
+    async def _new_context(self):
+        browser = await self._current_browser()
+        try:
+            return browser, await browser.new_context(user_agent=self.user_agent)
+        except Exception:
+            if browser.is_connected():
+                raise
+            # Crashed between the check and the call: relaunch once
+            browser = await self._current_browser()
+            return browser, await browser.new_context(user_agent=self.user_agent)
+
+    async def _current_browser(self):
+        async with self._lock:
+            browser = self._browser
+            if browser is not None and browser.is_connected() and self._recycle_reason is None:
+                return browser
+            reason = "start" if browser is None else self._recycle_reason or "crash"
+            if browser is not None:
+                await self._retire(browser)
+            self._browser = await self._launch(reason)
+            return self._browser
+
+    async def _launch(self, reason: str):
+        if self._playwright is None:
+            # Other children (e.g. the upload worker pool) are not ours to measure: remember what start() spawns
+            before = child_pids()
+            self._playwright = await async_playwright().start()
+            self._driver_pids = child_pids() - before
+        with metrics.span("browser_launch"):
+            browser = await getattr(self._playwright, self.browser_type).launch(headless=True)
+        browser.on("disconnected", self._on_disconnected)
+        self.launches += 1
+        self._pages_served = 0
+        self._recycle_reason = None
+        browser_launches.inc(reason=reason)
+        logging.info(f"Launched {self.browser_type} ({reason}), launch #{self.launches}")
+        return browser
+
+    def _on_disconnected(self, browser):
+        if browser is self._browser:
+            logging.warning(f"{self.browser_type} disconnected; relaunching on next use")
+
+    async def _retire(self, browser):
+        if self._leases.get(browser):
+            self._retired.add(browser)
+        else:
+            self._leases.pop(browser, None)
+            await self._close(browser)
+
+    async def _release(self, browser):
+        # stop() may have closed the browser and cleared its leases while the page was out
+        leases = self._leases.get(browser, 0) - 1
+        if leases > 0:
+            self._leases[browser] = leases
+        else:
+            self._leases.pop(browser, None)
+        if browser is self._browser:
+            self._pages_served += 1
+            if self._recycle_reason is None:
+                self._recycle_reason = self._check_recycle()
+        elif browser in self._retired and leases <= 0:
+            self._retired.discard(browser)
+            await self._close(browser)
+
+    def _check_recycle(self) -> str | None:
+        if self.max_pages and self._pages_served >= self.max_pages:
+            return "recycle_pages"
+        if self.max_rss_mb and self._pages_served % RSS_CHECK_EVERY == 0:
+            rss = tree_rss_mb(self._driver_pids) if self._driver_pids else None
+            if rss is not None and rss > self.max_rss_mb:
+                logging.info(f"Browser processes use {rss:.0f} MB (limit {self.max_rss_mb} MB), recycling")
+                return "recycle_memory"
+        return None
+
+    @staticmethod
+    async def _close(browser):
+        try:
+            await browser.close()
+        except Exception as e:
+            logging.info(f"Error closing browser: {e}")
@@ -0,0 +1,283 @@
+# bulk_match.py
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+import resume_parser
+from job_catalog import MappedCatalog, is_catalog
+from job_store import DEFAULT_DB_PATH, DEFAULT_SEED_PATH, JobStore
+from skill_matcher import DEFAULT_DICTIONARY_PATH, SYNONYMS, SkillMatcher
+
+DEFAULT_TOP_K = 10
+DEFAULT_CANDIDATES_PER_JOB = 5
+# Cap on the cells of any matrix built while scoring, to bound memory on large batches and catalogs
+MAX_BLOCK_CELLS = 16 * 1024 * 1024
+
+
+def load_resume(path: str) -> dict:
+    """Read a resume as `{name, technical_skills, projects}` from a PDF or a parsed JSON file.
+
+    JSON may be an `extracted_info_*.json` from resume_parser, an `/upload_resume`
+    response or a `parse_resume` result.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if path.lower().endswith(".pdf"):
+        info = resume_parser.parse_resume(path)
+    else:
+        with open(path, encoding="utf-8") as f:
+            info = json.load(f)
+    skills = info.get("skills", info.get("technical_skills", []))
+    if isinstance(skills, str):
+        skills = resume_parser.split_skills(skills)
+    projects = info.get("projects", "")
+    if isinstance(projects, dict):
+        projects = projects.get("text", "")
+    name = info.get("name")
+    return {
+        "name": name if name and name != "Not found" else stem,
+        "technical_skills": skills,
+        "projects": "" if projects == "Not found" else projects,
+    }
+
+
+def resume_skillset(matcher: SkillMatcher, resume: dict) -> set[str]:
+    return matcher.extract(resume["technical_skills"]) | matcher.extract(resume["projects"])
+
+
+def _rank_numpy(resume_sets, job_sets, top_k, per_job):
+    vocab = {skill: i for i, skill in enumerate(sorted(set().union(*job_sets)))}
+    sizes = np.array([len(skills) for skills in job_sets], dtype=np.int64)
+    # Scores depend only on (overlap, job size); look them up from Python's round() so they
+    # match SkillIndex exactly (np.round differs from it on some halfway cases)
+    table = np.array([[round(o / max(1, n), 4) for o in range(sizes.max() + 1)] for n in range(sizes.max() + 1)])
+
+    # Jobs are scored in blocks too, so no matrix (jobs x vocab, resumes x vocab or
+    # resumes x jobs) grows past about MAX_BLOCK_CELLS cells whatever the catalog size
+    job_block = max(1, MAX_BLOCK_CELLS // max(1, len(vocab)))
+    resume_block = max(1, MAX_BLOCK_CELLS // max(1, len(vocab), min(job_block, len(job_sets))))
+    top_scores = np.full((len(resume_sets), top_k), -1.0)
+    top_jobs = np.full((len(resume_sets), top_k), -1, dtype=np.int64)
+    best_scores = np.full((len(job_sets), per_job), -1.0)
+    best_resumes = np.full((len(job_sets), per_job), -1, dtype=np.int64)
+    for job_start in range(0, len(job_sets), job_block):
+        job_chunk = job_sets[job_start:job_start + job_block]
+        jobs_t = np.zeros((len(vocab), len(job_chunk)), dtype=np.float32)
+        for j, skills in enumerate(job_chunk):
+            jobs_t[[vocab[s] for s in skills], j] = 1
+        job_ids = np.arange(job_start, job_start + len(job_chunk))
+        job_rows = slice(job_start, job_start + len(job_chunk))
+        for start in range(0, len(resume_sets), resume_block):
+            chunk = resume_sets[start:start + resume_block]
+            resumes = np.zeros((len(chunk), len(vocab)), dtype=np.float32)
+            for i, skills in enumerate(chunk):
+                resumes[i, [vocab[s] for s in skills if s in vocab]] = 1
+            # Overlap counts for every resume/job pair of the block in one matrix product
+            overlap = (resumes @ jobs_t).astype(np.int64)
+            scores = table[sizes[job_rows], overlap]
+            # Earlier blocks go first in each merge, so stable sorts keep catalog order (jobs)
+            # and input order (resumes) for ties, like SkillIndex.score
+            rows = slice(start, start + len(chunk))
+            merged_scores = np.concatenate([top_scores[rows], scores], axis=1)
+            merged_jobs = np.concatenate([top_jobs[rows], np.broadcast_to(job_ids, scores.shape)], axis=1)
+            keep = np.argsort(-merged_scores, axis=1, kind="stable")[:, :top_k]
+            top_scores[rows] = np.take_along_axis(merged_scores, keep, axis=1)
+            top_jobs[rows] = np.take_along_axis(merged_jobs, keep, axis=1)
+
+            merged_scores = np.concatenate([best_scores[job_rows], scores.T], axis=1)
+            merged_resumes = np.concatenate(
+                [best_resumes[job_rows], np.broadcast_to(np.arange(start, start + len(chunk)), scores.T.shape)], axis=1
+            )
+            keep = np.argsort(-merged_scores, axis=1, kind="stable")[:, :per_job]
+            best_scores[job_rows] = np.take_along_axis(merged_scores, keep, axis=1)
+            best_resumes[job_rows] = np.take_along_axis(merged_resumes, keep, axis=1)
+
+    rankings = [[(int(j), float(s)) for j, s in zip(top_jobs[i], top_scores[i])] for i in range(len(resume_sets))]
+    job_best = [
+        [(int(r), float(s)) for r, s in zip(best_resumes[j], best_scores[j]) if r >= 0 and s > 0]
+        for j in range(len(job_sets))
+    ]
+    return rankings, job_best
+
+
+def _rank_python(resume_sets, job_sets, top_k, per_job):
+    postings = {}
+    for j, skills in enumerate(job_sets):
+        for skill in skills:
+            postings.setdefault(skill, []).append(j)
+    sizes = [max(1, len(skills)) for skills in job_sets]
+    rankings = []
+    job_candidates = [[] for _ in job_sets]
+    for r, skills in enumerate(resume_sets):
+        overlap = [0] * len(job_sets)
+        for skill in skills:
+            for j in postings.get(skill, ()):
+                overlap[j] += 1
+        scores = [round(o / size, 4) for o, size in zip(overlap, sizes)]
+        order = sorted(range(len(job_sets)), key=lambda j: -scores[j])[:top_k]
+        rankings.append([(j, scores[j]) for j in order])
+        for j, score in enumerate(scores):
+            if score > 0:
+                job_candidates[j].append((r, score))
+    job_best = [sorted(c, key=lambda item: -item[1])[:per_job] for c in job_candidates]
+    return rankings, job_best
+
+
+def rank_matrix(resume_sets: list[set[str]], job_sets: list[set[str]], top_k: int = DEFAULT_TOP_K,
+                per_job: int = DEFAULT_CANDIDATES_PER_JOB):
+    """Score every resume against every job.
+
+    Returns `(rankings, job_best)`: per resume its `top_k` `(job_index, score)`
+    pairs, and per job its best `per_job` `(resume_index, score)` pairs with a
+    score above zero. Scores and tie order match `SkillIndex.score`.
+    """
+    if not resume_sets or not job_sets:
+        return [[] for _ in resume_sets], [[] for _ in job_sets]
+    top_k = min(top_k, len(job_sets))
+    per_job = min(per_job, len(resume_sets))
+    if np is not None:
+        return _rank_numpy(resume_sets, job_sets, top_k, per_job)
+    return _rank_python(resume_sets, job_sets, top_k, per_job)
+
+
+def bulk_match(resumes: list[dict], resume_sets: list[set[str]], jobs: list[dict], job_sets: list[set[str]],
+               top_k: int = DEFAULT_TOP_K, per_job: int = DEFAULT_CANDIDATES_PER_JOB) -> dict:
+    """Resume-centric and job-centric views of the full score matrix, in the `matches_for_*.json` entry format."""
+    rankings, job_best = rank_matrix(resume_sets, job_sets, top_k, per_job)
+
+    def entry(job, score, matched):
+        return {"title": job["title"], "company": job["company"], "url": job["url"], "score": score,
+                "matched_skills": matched}
+
+    return {
+        "resumes": [
+            {
+                "resume": resume["name"],
+                "matches": [entry(jobs[j], score, sorted(job_sets[j] & skills)) for j, score in ranking],
+            }
+            for resume, skills, ranking in zip(resumes, resume_sets, rankings)
+        ],
+        "jobs": [
+            {
+                "job_id": job.get("job_id"),
+                "title": job["title"],
+                "company": job["company"],
+                "url": job["url"],
+                "candidates": [
+                    {"resume": resumes[r]["name"], "score": score, "matched_skills": sorted(skills & resume_sets[r])}
+                    for r, score in best
+                ],
+            }
+            for job, skills, best in zip(jobs, job_sets, job_best)
+        ],
+    }
+
+
+def output_name(resume_name: str, taken: set[str]) -> str:
+    base = "matches_for_" + re.sub(r"[^\w.-]+", "_", resume_name).strip("_")
+    name, n = f"{base}.json", 2
+    while name in taken:
+        name, n = f"{base}_{n}.json", n + 1
+    taken.add(name)
+    return name
+
+
+def write_outputs(result: dict, output_folder: str) -> list[str]:
+    """Write one `matches_for_<name>.json` per resume plus `job_candidates.json`; returns the written paths."""
+    os.makedirs(output_folder, exist_ok=True)
+    written, taken = [], set()
+    for item in result["resumes"]:
+        path = os.path.join(output_folder, output_name(item["resume"], taken))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(item["matches"], f, indent=4, ensure_ascii=False)
+        written.append(path)
+    path = os.path.join(output_folder, "job_candidates.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result["jobs"], f, indent=4, ensure_ascii=False)
+    written.append(path)
+    return written
+
+
+def load_catalog(source: str, matcher: SkillMatcher) -> tuple[list[dict], list[set[str]]]:
+    """Jobs and their skill sets from a `job_skills.json`-style file, a job store database or a binary catalog."""
+    if is_catalog(source):
+        catalog = MappedCatalog(source)
+        if catalog.normalizer_version != matcher.version:
+            # The catalog keeps canonical sets only, so it cannot be renormalized here
+            print(f"  WARNING {source} was built by another skill normalizer; rebuild it with job_catalog.py")
+        indexes = catalog.indexes(now=time.time())
+        return [catalog.job(i) for i in indexes], [set(catalog.skills_at(i)) for i in indexes]
+    if source.endswith(".json"):
+        with open(source, encoding="utf-8") as f:
+            jobs = json.load(f)
+        return jobs, [matcher.job_skills(job) for job in jobs]
+    store = JobStore(source)
+    try:
+        jobs = store.fresh_jobs()
+        names = store.skill_names()
+    finally:
+        store.close()
+    # Reuse the skill sets persisted at ingestion when they come from this normalizer
+    job_sets = [
+        {names[i] for i in job["skill_ids"]} if job["normalizer_version"] == matcher.version else matcher.job_skills(job)
+        for job in jobs
+    ]
+    return jobs, job_sets
+
+
+def iter_resume_files(inputs):
+    for item in inputs:
+        if os.path.isdir(item):
+            with os.scandir(item) as it:
+                for entry in sorted(it, key=lambda e: e.name):
+                    if entry.is_file() and (entry.name.startswith("extracted_info_") and entry.name.endswith(".json")
+                                            or entry.name.lower().endswith(".pdf")):
+                        yield entry.path
+        else:
+            yield item
+
+
+def main(argv=None):
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Rank a batch of resumes against the job catalog in one pass.")
+    parser.add_argument("inputs", nargs="*", default=[os.path.join(base_dir, "output")],
+                        help="Resume PDFs, parsed JSON files and/or directories of them (default: ./output)")
+    parser.add_argument("-j", "--jobs", default=None,
+                        help="Job store database or job_skills.json-style file (default: the job store, "
+                             "or job_skills.json if the store is missing)")
+    # Not ./output itself: that holds the per-resume matches_for_*.json written by the resume pipeline
+    parser.add_argument("-o", "--output", default=os.path.join(base_dir, "output", "bulk"),
+                        help="Directory for matches_for_*.json and job_candidates.json (default: ./output/bulk)")
+    parser.add_argument("-k", "--top-k", type=int, default=DEFAULT_TOP_K, help="Matches kept per resume")
+    parser.add_argument("-c", "--candidates-per-job", type=int, default=DEFAULT_CANDIDATES_PER_JOB,
+                        help="Candidates kept per job")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    matcher = SkillMatcher.from_sources(SYNONYMS, os.getenv("SKILL_DICTIONARY_PATH", DEFAULT_DICTIONARY_PATH))
+    source = args.jobs or (DEFAULT_DB_PATH if os.path.exists(DEFAULT_DB_PATH) else DEFAULT_SEED_PATH)
+    jobs, job_sets = load_catalog(source, matcher)
+    resumes = []
+    for path in iter_resume_files(args.inputs):
+        try:
+            resumes.append(load_resume(path))
+        except Exception as e:
+            print(f"  SKIPPED {path}: {e}")
+    resume_sets = [resume_skillset(matcher, resume) for resume in resumes]
+
+    result = bulk_match(resumes, resume_sets, jobs, job_sets, args.top_k, args.candidates_per_job)
+    written = write_outputs(result, args.output)
+    print(f"Ranked {len(resumes)} resumes against {len(jobs)} jobs from {source} "
+          f"in {time.perf_counter() - started:.2f}s; wrote {len(written)} files to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
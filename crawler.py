@@ -0,0 +1,647 @@
+# crawler.py
+import asyncio
+import logging
+import os
+import random
+import re
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from urllib.parse import quote_plus, urlparse
+
+import http_extractor
+import metrics
+from browser_manager import BrowserManager
+from job_store import job_id_from_url
+
+# Point at a stand-in such as benchmarks/fake_bdjobs.py with BDJOBS_ORIGIN=http://127.0.0.1:8765
+BDJOBS_ORIGIN = os.getenv("BDJOBS_ORIGIN", "https://jobs.bdjobs.com").rstrip("/")
+BASE_URL = f"{BDJOBS_ORIGIN}/jobsearch.asp?fcatId=8&icatId="
+JOB_DETAILS_BASE = f"{BDJOBS_ORIGIN}/jobdetails/"
+SEARCH_URL = f"{BDJOBS_ORIGIN}/jobsearch.asp?key={{query}}"
+
+DEFAULT_CONCURRENCY = 5
+DEFAULT_RATE_PER_HOST = 4.0  # requests per second
+DEFAULT_REVALIDATE_SECONDS = 6 * 3600
+DEFAULT_JOBS_PER_QUERY = 5
+DEFAULT_SEARCH_TTL_SECONDS = 30 * 60
+DEFAULT_SEARCH_CACHE_ENTRIES = 4096
+# Every page step (load + wait for content) gets this long per attempt, and is retried with exponential backoff
+DEFAULT_PAGE_DEADLINE_SECONDS = 30.0
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF_SECONDS = 1.0
+# Consecutive failures against a host that open its circuit, and how long it stays open
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_COOLDOWN_SECONDS = 60.0
+# A detail page gets this long to render either section; the other one then only gets the grace period
+SECTION_TIMEOUT_MS = 5000
+SECTION_GRACE_MS = 1000
+
+crawl_steps = metrics.REGISTRY.register(metrics.Counter(
+    "crawl_steps_total", "Crawl page steps by kind (listing, detail) and outcome (ok, retry, failed, circuit_open).",
+    ["kind", "outcome"]))
+circuit_opened = metrics.REGISTRY.register(metrics.Counter(
+    "crawl_circuit_opened_total", "Times the crawl circuit breaker opened, by host.", ["host"]))
+
+_DIVOPEN_RE = re.compile(r"DivOpen\('([^']+)',\d+,'([^']+)','([^']+)'\)")
+
+
+def parse_job_wrapper(onclick: str) -> dict | None:
+    """Turn a `div.sout-jobs-wrapper` onclick handler into a job link record."""
+    match = _DIVOPEN_RE.search(onclick or '')
+    if not match:
+        return None
+    params, title, company = match.group(1), match.group(2), match.group(3)
+    return {'url': f"{JOB_DETAILS_BASE}?{params}", 'title': title, 'company': company}
+
+
+class HostRateLimiter:
+    """Token bucket per host: allows short bursts, then spaces requests at `rate` per second."""
+
+    def __init__(self, rate: float = DEFAULT_RATE_PER_HOST, burst: int = DEFAULT_CONCURRENCY):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, url: str):
+        host = urlparse(url).netloc
+        async with self._lock:
+            now = time.monotonic()
+            tokens, last = self._buckets.get(host, (float(self.burst), now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate) - 1
+            self._buckets[host] = (tokens, now)
+        if tokens < 0:
+            await asyncio.sleep(-tokens / self.rate)
+
+
+class CrawlStepError(Exception):
+    """A crawl step that failed for good; the executor has already recorded it."""
+
+
+class CircuitOpenError(CrawlStepError):
+    """Raised instead of running a crawl step while the target host's circuit is open."""
+
+
+class CircuitBreaker:
+    """Stops crawling a host that keeps failing, so a degraded site costs one fast refusal per page.
+
+    After `threshold` consecutive failed steps against a host its circuit
+    opens and further steps are refused for `cooldown` seconds. Then a single
+    trial step is let through (half-open): success closes the circuit, failure
+    opens it for another cooldown. Keep one instance for the life of the app
+    so later crawls see the state left by earlier ones.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_BREAKER_THRESHOLD, cooldown: float = DEFAULT_BREAKER_COOLDOWN_SECONDS):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        # host -> [consecutive failures, opened at (monotonic) or None, trial step in flight]
+        self._hosts: dict[str, list] = {}
+
+    def state(self, host: str) -> str:
+        failures, opened_at, trial = self._hosts.get(host, (0, None, False))
+        if opened_at is None:
+            return "closed"
+        return "open" if trial or time.monotonic() - opened_at < self.cooldown else "half_open"
+
+    def allow(self, host: str) -> bool:
+        state = self.state(host)
+        if state == "half_open":
+            self._hosts[host][2] = True
+        return state != "open"
+
+    def release(self, host: str):
+        """Forget an in-flight trial step that ended without an outcome (e.g. it was cancelled)."""
+        entry = self._hosts.get(host)
+        if entry is not None:
+            entry[2] = False
+
+    def record_success(self, host: str):
+        self._hosts.pop(host, None)
+
+    def record_failure(self, host: str):
+        entry = self._hosts.setdefault(host, [0, None, False])
+        entry[0] += 1
+        if entry[2] or (entry[1] is None and entry[0] >= self.threshold):
+            logging.warning(f"Circuit for {host} opened after {entry[0]} consecutive failures; "
+                            f"pausing it for {self.cooldown:g}s")
+            circuit_opened.inc(host=host)
+            entry[1], entry[2] = time.monotonic(), False
+
+
+class CrawlExecutor:
+    """Runs the page steps of one crawl: a deadline per attempt, retries with exponential backoff, a circuit breaker.
+
+    A step that still fails is recorded in `failures` and raised as
+    `CrawlStepError`; the crawl functions catch it and carry on with what they
+    have, so callers get partial results and check `degraded` instead of
+    losing the whole crawl.
+    """
+
+    def __init__(self, breaker: CircuitBreaker | None = None, deadline: float = DEFAULT_PAGE_DEADLINE_SECONDS,
+                 retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF_SECONDS):
+        self.breaker = breaker or CircuitBreaker()
+        self.deadline = deadline
+        self.retries = retries
+        self.backoff = backoff
+        self.failures: list[dict] = []
+
+    @property
+    def degraded(self) -> bool:
+        return bool(self.failures)
+
+    async def run(self, kind: str, url: str, step, retries: int | None = None,
+                  limiter: HostRateLimiter | None = None):
+        """Await `step()` (a fresh attempt per call) for the page at `url`.
+
+        Each attempt first waits its turn on `limiter`; that wait does not count against the deadline.
+        """
+        host = urlparse(url).netloc
+        retries = self.retries if retries is None else retries
+        for attempt in range(retries + 1):
+            if not self.breaker.allow(host):
+                crawl_steps.inc(kind=kind, outcome="circuit_open")
+                error = CircuitOpenError(f"circuit open for {host}")
+                self.record(kind, url, error)
+                raise error
+            try:
+                if limiter is not None:
+                    await limiter.wait(url)
+                result = await asyncio.wait_for(step(), self.deadline)
+            except Exception as e:
+                self.breaker.record_failure(host)
+                if attempt == retries:
+                    crawl_steps.inc(kind=kind, outcome="failed")
+                    self.record(kind, url, e)
+                    raise CrawlStepError(f"{kind} page {url}: {_describe(e)}") from e
+                crawl_steps.inc(kind=kind, outcome="retry")
+                # Full jitter keeps concurrent retries from arriving together
+                delay = self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+                logging.info(f"{kind} step for {url} failed ({_describe(e)}), retry {attempt + 1} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            except BaseException:
+                # Cancelled mid-step: a half-open trial left in flight would keep the circuit open for good
+                self.breaker.release(host)
+                raise
+            else:
+                self.breaker.record_success(host)
+                crawl_steps.inc(kind=kind, outcome="ok")
+                return result
+
+    def record(self, kind: str, url: str, error: BaseException):
+        logging.warning(f"Giving up on {kind} page {url}: {_describe(error)}")
+        self.failures.append({"kind": kind, "url": url, "error": _describe(error)})
+
+
+def breaker_from_env() -> CircuitBreaker:
+    """Circuit breaker configured by $CRAWL_BREAKER_THRESHOLD and $CRAWL_BREAKER_COOLDOWN_SECONDS."""
+    return CircuitBreaker(
+        threshold=int(os.getenv("CRAWL_BREAKER_THRESHOLD", str(DEFAULT_BREAKER_THRESHOLD))),
+        cooldown=float(os.getenv("CRAWL_BREAKER_COOLDOWN_SECONDS", str(DEFAULT_BREAKER_COOLDOWN_SECONDS))),
+    )
+
+
+def rate_from_env() -> float:
+    """Requests per second allowed per host, from $CRAWL_RATE_PER_HOST."""
+    return float(os.getenv("CRAWL_RATE_PER_HOST", str(DEFAULT_RATE_PER_HOST)))
+
+
+def executor_from_env(breaker: CircuitBreaker) -> CrawlExecutor:
+    """Executor for one crawl, configured by $CRAWL_PAGE_DEADLINE_SECONDS, $CRAWL_RETRIES and $CRAWL_BACKOFF_SECONDS."""
+    return CrawlExecutor(
+        breaker,
+        deadline=float(os.getenv("CRAWL_PAGE_DEADLINE_SECONDS", str(DEFAULT_PAGE_DEADLINE_SECONDS))),
+        retries=int(os.getenv("CRAWL_RETRIES", str(DEFAULT_RETRIES))),
+        backoff=float(os.getenv("CRAWL_BACKOFF_SECONDS", str(DEFAULT_BACKOFF_SECONDS))),
+    )
+
+
+def _describe(error: BaseException) -> str:
+    # asyncio.TimeoutError has an empty message
+    return str(error) or type(error).__name__
+
+
+@metrics.timed("crawl_list")
+async def get_job_links(page, limiter: HostRateLimiter, start_url: str = BASE_URL, max_jobs: int = 50,
+                        known_ids: set[str] | None = None, on_page=None,
+                        executor: CrawlExecutor | None = None) -> list[dict]:
+    """Collect job links from the listing, newest first.
+
+    With `known_ids`, pagination stops after the first page on which every
+    posting is already known: everything older was seen by a previous crawl.
+    `on_page(page_no, links)` is called with every link on each listing page
+    read (1-based), and with an empty list for the page after the last one.
+    Page loads run through `executor`; if one fails for good, the links read
+    so far are returned and the failure is left in `executor.failures`.
+    """
+    executor = executor or CrawlExecutor()
+    job_links = []
+    seen = set()
+    page_no = 1
+
+    async def open_listing():
+        await page.goto(start_url, wait_until="domcontentloaded", timeout=60000)
+        await page.wait_for_selector('div.sout-jobs-wrapper', timeout=20000)
+
+    try:
+        await executor.run("listing", start_url, open_listing, limiter=limiter)
+    except CrawlStepError:
+        return []
+
+    while len(job_links) < max_jobs:
+        metrics.pages_fetched.inc(kind="listing")
+        job_wrappers = await page.query_selector_all('div.sout-jobs-wrapper')
+        first_onclick = await job_wrappers[0].get_attribute('onclick') if job_wrappers else None
+        page_links = [job for job in [parse_job_wrapper(await w.get_attribute('onclick')) for w in job_wrappers]
+                      if job]
+        if on_page is not None:
+            on_page(page_no, page_links)
+        page_has_new = False
+        for job in page_links:
+            if len(job_links) >= max_jobs:
+                break
+            if job['url'] not in seen:
+                seen.add(job['url'])
+                job_links.append(job)
+                page_has_new = page_has_new or known_ids is None or job_id_from_url(job['url']) not in known_ids
+        if len(job_links) >= max_jobs:
+            break
+        if not page_has_new:
+            logging.info(f"Listing page {page.url} has no new postings, stopping pagination")
+            break
+        next_button = await page.query_selector('a.prevnext:has-text("Next »")')
+        if not next_button:
+            if on_page is not None:
+                on_page(page_no + 1, [])
+            break
+        page_no += 1
+
+        async def next_listing_page():
+            await next_button.click()
+            # Wait for the result list to change instead of sleeping a fixed interval
+            await page.wait_for_function(
+                "(prev) => { const w = document.querySelector('div.sout-jobs-wrapper');"
+                " return w && w.getAttribute('onclick') !== prev; }",
+                arg=first_onclick,
+                timeout=20000,
+            )
+
+        try:
+            # A repeated click could skip a page, so pagination is not retried
+            await executor.run("listing", f"{start_url}#page={page_no}", next_listing_page, retries=0,
+                               limiter=limiter)
+        except CrawlStepError:
+            break
+    return job_links[:max_jobs]
+
+
+async def _find_section(page, selector: str):
+    element = await page.query_selector(selector)
+    if element is None:
+        try:
+            element = await page.wait_for_selector(selector, timeout=SECTION_GRACE_MS)
+        except Exception:
+            return None
+    return element
+
+
+async def get_job_skills_and_requirements(page, limiter: HostRateLimiter | None,
+                                          job_url: str) -> tuple[list[str], list[str]]:
+    """Read the skills and requirements of a job details page; raises if the page itself does not load.
+
+    The wait is for whichever section renders first; the other only gets a
+    short grace period, so a page without a `#skills` section costs about a
+    second instead of a full selector timeout, and one with neither costs one.
+    Without a `limiter` the caller is expected to have rate-limited the request.
+    """
+    if limiter is not None:
+        await limiter.wait(job_url)
+    await page.goto(job_url, wait_until="domcontentloaded", timeout=60000)
+    try:
+        await page.wait_for_selector('#skills, #requirements', timeout=SECTION_TIMEOUT_MS)
+    except Exception:
+        logging.info(f"No skills or requirements found for {job_url}")
+        return [], []
+
+    skills_list, requirements_list = [], []
+    if await _find_section(page, '#skills') is not None:
+        skills_list = [(await b.inner_text()).strip() for b in await page.query_selector_all('#skills >> button')]
+    else:
+        logging.info(f"No skills found for {job_url}")
+
+    requirements = await _find_section(page, '#requirements')
+    if requirements is not None:
+        requirements_list = [(await el.inner_text()).strip() for el in await page.query_selector_all('#requirements li, #requirements p')]
+        if not requirements_list:
+            req_text = (await requirements.inner_text()).strip()
+            requirements_list = [line.strip() for line in req_text.split("\n") if line.strip()]
+    else:
+        logging.info(f"No requirements found for {job_url}")
+
+    return skills_list, requirements_list
+
+
+@metrics.timed("crawl_detail")
+async def fetch_details(pool: BrowserManager, limiter: HostRateLimiter, job_links: list[dict], http_client=None,
+                        executor: CrawlExecutor | None = None) -> list[dict]:
+    """Fetch detail pages for `job_links` concurrently, bounded by the pool size.
+
+    With an `http_client`, each page is first tried as a single plain GET; the
+    browser pool is only used when the sections are missing from the raw HTML.
+    Links carrying `etag` / `last_modified` are revalidated conditionally; a 304
+    comes back as `{"not_modified": True}` without skills or requirements.
+    Plain GETs and browser loads both run through `executor`; a GET that times
+    out or hits a server error is retried rather than rendered, since the
+    browser would load the same failing host. Postings whose page still fails
+    are left out of the result and recorded in `executor.failures`.
+    """
+    executor = executor or CrawlExecutor()
+
+    async def get(job):
+        result = await http_extractor.fetch_job_details_conditional(
+            http_client, job["url"], job.get("etag"), job.get("last_modified")
+        )
+        if result["status"] == "error":
+            # Timeouts and server errors count against the host, so a failing site trips the breaker sooner
+            raise result["error"]
+        return result
+
+    async def render(url):
+        # Waiting for a free page is not part of the deadline; a retry reloads the same page
+        async with pool.page() as page:
+            return await executor.run("detail", url, lambda: get_job_skills_and_requirements(page, None, url),
+                                      limiter=limiter)
+
+    async def fetch_one(job):
+        details = None
+        validators = {"etag": None, "last_modified": None}
+        if http_client is not None:
+            try:
+                result = await executor.run("detail_http", job["url"], lambda: get(job), limiter=limiter)
+            except CrawlStepError:
+                return None
+            if result["status"] == "not_modified":
+                metrics.pages_fetched.inc(kind="not_modified")
+                return {"title": job["title"], "company": job["company"], "url": job["url"], "not_modified": True}
+            details = result["details"]
+            validators = {"etag": result["etag"], "last_modified": result["last_modified"]}
+            if details is not None:
+                metrics.pages_fetched.inc(kind="detail_http")
+        if details is None:
+            try:
+                details = await render(job["url"])
+            except CrawlStepError:
+                return None
+            except Exception as e:
+                # No page to be had (the browser failed to launch)
+                executor.record("detail", job["url"], e)
+                return None
+            metrics.pages_fetched.inc(kind="detail_browser")
+        skills, requirements = details
+        return {
+            "title": job["title"],
+            "company": job["company"],
+            "url": job["url"],
+            "skills": skills,
+            "requirements": requirements,
+            **validators,
+        }
+
+    return [job for job in await asyncio.gather(*(fetch_one(job) for job in job_links)) if job is not None]
+
+
+class TTLCache:
+    """In-memory cache whose entries expire `ttl` seconds after they were stored; the oldest go first when full."""
+
+    def __init__(self, ttl: float, max_entries: int = DEFAULT_SEARCH_CACHE_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry[1]
+
+    def put(self, key, value):
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SearchCache:
+    """State shared by skill searches: listing pages per (query, page number) and details per posting id.
+
+    Both expire after `ttl` seconds, so within that window a posting's detail
+    page is fetched at most once no matter how many searches or requests list
+    it. Details being fetched right now are tracked too, so an overlapping
+    search waits for that fetch instead of starting its own.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_SEARCH_TTL_SECONDS, max_entries: int = DEFAULT_SEARCH_CACHE_ENTRIES):
+        self.listings = TTLCache(ttl, max_entries)
+        self.details = TTLCache(ttl, max_entries)
+        self.in_flight: dict[str, asyncio.Future] = {}
+
+    def cached_links(self, query: str, max_jobs: int) -> list[dict] | None:
+        """Links for `query` from cached listing pages, or None if the cached pages do not cover `max_jobs`."""
+        links, seen, page_no = [], set(), 1
+        while len(links) < max_jobs:
+            page_links = self.listings.get((query, page_no))
+            if page_links is None:
+                return None
+            if not page_links:
+                break  # past the last page
+            for job in page_links:
+                if job["url"] not in seen:
+                    seen.add(job["url"])
+                    links.append(job)
+            page_no += 1
+        return links[:max_jobs]
+
+
+async def search_links(pool: BrowserManager, limiter: HostRateLimiter, query: str,
+                       max_jobs: int = DEFAULT_JOBS_PER_QUERY, cache: SearchCache | None = None,
+                       executor: CrawlExecutor | None = None) -> list[dict]:
+    """Job links listed for one search query, from `cache` when its listing pages are still fresh.
+
+    Failures are recorded in `executor` and yield the links found so far.
+    """
+    if cache is not None:
+        links = cache.cached_links(query, max_jobs)
+        metrics.cache_requests.inc(cache="search_listing", result="miss" if links is None else "hit")
+        if links is not None:
+            return links
+    on_page = (lambda page_no, links: cache.listings.put((query, page_no), links)) if cache is not None else None
+    logging.info(f"Searching for jobs with skill: {query}")
+    executor = executor or CrawlExecutor()
+    url = SEARCH_URL.format(query=quote_plus(query))
+    try:
+        async with pool.page() as page:
+            return await get_job_links(page, limiter, url, max_jobs=max_jobs, on_page=on_page, executor=executor)
+    except Exception as e:
+        # No page to be had (the browser failed to launch): an empty listing, not a failed request
+        executor.record("listing", url, e)
+        return []
+
+
+async def search_jobs(pool: BrowserManager, limiter: HostRateLimiter, queries: list[str],
+                      max_jobs_per_query: int = DEFAULT_JOBS_PER_QUERY, http_client=None,
+                      cache: SearchCache | None = None, executor: CrawlExecutor | None = None) -> list[dict]:
+    """Run every search query concurrently, then fetch each distinct posting they list once.
+
+    Links are merged in query order and deduplicated by posting id before any
+    detail page is requested; each job comes back with the `queries` that
+    listed it. With a `cache`, fresh listing pages and details are reused.
+    Pages that fail are skipped; `executor.degraded` says whether any did.
+    """
+    executor = executor or CrawlExecutor()
+    queries = list(dict.fromkeys(queries))
+    listed = await asyncio.gather(*(search_links(pool, limiter, q, max_jobs_per_query, cache, executor)
+                                    for q in queries))
+
+    links: dict[str, dict] = {}
+    matched: dict[str, list[str]] = {}
+    for query, query_links in zip(queries, listed):
+        for job in query_links:
+            job_id = job_id_from_url(job["url"])
+            links.setdefault(job_id, job)
+            matched.setdefault(job_id, []).append(query)
+
+    details: dict[str, dict | None] = {}
+    waiting: dict[str, asyncio.Future] = {}
+    to_fetch: list[dict] = []
+    for job_id, job in links.items():
+        cached = cache.details.get(job_id) if cache is not None else None
+        if cached is not None:
+            details[job_id] = cached
+        elif cache is not None and job_id in cache.in_flight:
+            waiting[job_id] = cache.in_flight[job_id]
+        else:
+            to_fetch.append(job)
+    if cache is not None:
+        metrics.cache_requests.inc(len(details) + len(waiting), cache="search_detail", result="hit")
+        metrics.cache_requests.inc(len(to_fetch), cache="search_detail", result="miss")
+
+    owned: dict[str, asyncio.Future] = {}
+    if cache is not None:
+        loop = asyncio.get_running_loop()
+        for job in to_fetch:
+            job_id = job_id_from_url(job["url"])
+            owned[job_id] = cache.in_flight[job_id] = loop.create_future()
+    try:
+        for job in await fetch_details(pool, limiter, to_fetch, http_client=http_client, executor=executor):
+            job_id = job_id_from_url(job["url"])
+            details[job_id] = job
+            # Empty results are usually a failed page load; leave them for the next search to retry
+            if cache is not None and (job["skills"] or job["requirements"]):
+                cache.details.put(job_id, job)
+    finally:
+        for job_id, future in owned.items():
+            cache.in_flight.pop(job_id, None)
+            future.set_result(details.get(job_id))
+    for job_id, future in waiting.items():
+        details[job_id] = await asyncio.shield(future)
+
+    return [{**details[job_id], "queries": matched[job_id]} for job_id in links if details.get(job_id) is not None]
+
+
+def plan_incremental(job_links: list[dict], known: dict[str, dict], revalidate_after: float = DEFAULT_REVALIDATE_SECONDS,
+                     now: float | None = None) -> tuple[list[dict], list[str]]:
+    """Split listed links into `(to_fetch, unchanged_ids)`.
+
+    New postings and postings whose listing entry changed are fetched; known
+    postings are revalidated (conditionally, with their stored validators) once
+    their details are older than `revalidate_after`; the rest are left alone.
+    """
+    now = time.time() if now is None else now
+    to_fetch, unchanged = [], []
+    for job in job_links:
+        job_id = job_id_from_url(job["url"])
+        record = known.get(job_id)
+        if record is None or (record["title"], record["company"]) != (job["title"], job["company"]):
+            to_fetch.append(job)
+        elif now - record["scraped_at"] >= revalidate_after:
+            to_fetch.append({**job, "etag": record.get("etag"), "last_modified": record.get("last_modified")})
+        else:
+            unchanged.append(job_id)
+    return to_fetch, unchanged
+
+
+@asynccontextmanager
+async def open_crawler(concurrency: int = DEFAULT_CONCURRENCY, rate_per_host: float | None = None,
+                       browsers: BrowserManager | None = None, executor: CrawlExecutor | None = None):
+    """Yield a page source, a shared rate limiter, HTTP client and executor for one crawl.
+
+    Pages come from `browsers`, the app's long-lived `BrowserManager`; without
+    one a private manager is used for this crawl only and shut down afterwards.
+    Either way the browser is only launched once a page is actually needed.
+    Pass an `executor` sharing the app's `CircuitBreaker`; the default one
+    has a breaker of its own. `rate_per_host` defaults to `rate_from_env()`.
+    """
+    if rate_per_host is None:
+        rate_per_host = rate_from_env()
+    own = browsers is None
+    if own:
+        browsers = BrowserManager(concurrency=concurrency)
+    try:
+        async with http_extractor.new_client(max_connections=concurrency) as client:
+            yield browsers, HostRateLimiter(rate=rate_per_host, burst=concurrency), client, executor or CrawlExecutor()
+    finally:
+        if own:
+            await browsers.stop()
+
+
+async def crawl(start_url: str = BASE_URL, max_jobs: int = 50, concurrency: int = DEFAULT_CONCURRENCY,
+                browsers: BrowserManager | None = None) -> list[dict]:
+    """Walk the listing at `start_url`, then fetch every job detail page concurrently."""
+    async with open_crawler(concurrency, browsers=browsers) as (pool, limiter, client, executor):
+        async with pool.page() as page:
+            job_links = await get_job_links(page, limiter, start_url, max_jobs=max_jobs, executor=executor)
+        return await fetch_details(pool, limiter, job_links, http_client=client, executor=executor)
+
+
+async def crawl_incremental(known: dict[str, dict], start_url: str = BASE_URL, max_jobs: int = 50,
+                            concurrency: int = DEFAULT_CONCURRENCY,
+                            revalidate_after: float = DEFAULT_REVALIDATE_SECONDS,
+                            browsers: BrowserManager | None = None, executor: CrawlExecutor | None = None,
+                            full: bool = False) -> dict:
+    """Crawl only what changed since the postings in `known` (job id -> stored listing fields and validators).
+
+    The listing is normally read only up to the first page with nothing new
+    (see `get_job_links`), so known postings further back are not re-seen and
+    their expiry is not extended. `full` reads it up to `max_jobs` regardless;
+    run one often enough that every listed posting is re-seen within its TTL.
+
+    Returns `{"jobs", "not_modified", "unchanged", "listed", "failed"}`:
+    freshly fetched postings, ids confirmed unchanged by a 304, ids skipped
+    without a request, how many listing entries were read and how many pages
+    failed for good. Failed postings are simply missing, to be retried by the
+    next crawl.
+    """
+    async with open_crawler(concurrency, browsers=browsers, executor=executor) as (pool, limiter, client, executor):
+        try:
+            async with pool.page() as page:
+                job_links = await get_job_links(page, limiter, start_url, max_jobs=max_jobs,
+                                                known_ids=None if full else set(known), executor=executor)
+        except Exception as e:
+            executor.record("listing", start_url, e)
+            job_links = []
+        to_fetch, unchanged = plan_incremental(job_links, known, revalidate_after)
+        fetched = await fetch_details(pool, limiter, to_fetch, http_client=client, executor=executor)
+    return {
+        "jobs": [job for job in fetched if not job.get("not_modified")],
+        "not_modified": [job_id_from_url(job["url"]) for job in fetched if job.get("not_modified")],
+        "unchanged": unchanged,
+        "listed": len(job_links),
+        "failed": len(executor.failures),
+    }
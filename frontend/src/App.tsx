@@ -29,6 +29,7 @@ export interface ResumeAnalysis {
 
 export interface JobMatch {
   id: string;
+  jobId: string;
   title: string;
   company: string;
   location: string;
@@ -41,9 +42,12 @@ export interface JobMatch {
   description: string;
   requirements: string[];
   url: string;
-  improvementAdvice: string[];
+  improvementAdvice: string[] | null; // null until requested from /match-jobs/advice
 }
 
+// Advice is generated lazily; fetch it up front only for the cards users read first
+const ADVICE_EAGER_CARDS = 2;
+
 type AppState = 'upload' | 'scanning' | 'results' | 'error';
 
 function App() {
@@ -51,6 +55,36 @@ function App() {
   const [analysisResults, setAnalysisResults] = useState<ResumeAnalysis | null>(null);
   const [fileName, setFileName] = useState<string>('');
   const [errorMessage, setErrorMessage] = useState<string | null>(null);
+  const [resumeData, setResumeData] = useState<any>(null);
+
+  const setJobAdvice = (jobId: string, advice: string[] | null) => {
+    setAnalysisResults((prev) =>
+      prev && {
+        ...prev,
+        jobMatches: prev.jobMatches.map((job) => (job.jobId === jobId ? { ...job, improvementAdvice: advice } : job)),
+      }
+    );
+  };
+
+  const requestAdvice = async (jobId: string, resume: any = resumeData) => {
+    try {
+      const response = await fetch('http://localhost:5001/match-jobs/advice', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ ...resume, job_id: jobId }),
+      });
+      if (!response.ok) {
+        throw new Error(`Advice failed: ${response.status} ${response.statusText}`);
+      }
+      const data = await response.json();
+      setJobAdvice(jobId, data.improvement_advice || []);
+    } catch (error) {
+      console.error('Error fetching improvement advice:', error);
+      setJobAdvice(jobId, []);
+    }
+  };
 
   const handleFileUpload = async (file: File) => {
     setFileName(file.name);
@@ -81,6 +115,7 @@ function App() {
       }
 
       const resumeData = await uploadResponse.json();
+      setResumeData(resumeData);
 
       // Step 3: Call /match-jobs with parsed resume data
       const matchJobsResponse = await fetch('http://localhost:5001/match-jobs', {
@@ -132,6 +167,7 @@ function App() {
         },
         jobMatches: matchJobsData.matches.map((job: any, index: number) => ({
           id: String(index + 1),
+          jobId: job.job_id,
           title: job.title,
           company: job.company,
           location: 'Unknown', // Placeholder
@@ -144,12 +180,16 @@ function App() {
           description: 'No description available', // Placeholder
           requirements: job.requirements || [],
           url: job.url,
-          improvementAdvice: job.improvement_advice || [],
+          improvementAdvice: job.improvement_advice ?? null,
         })),
       };
 
       setAnalysisResults(mockAnalysis);
       setCurrentState('results');
+      mockAnalysis.jobMatches
+        .slice(0, ADVICE_EAGER_CARDS)
+        .filter((job) => job.improvementAdvice === null)
+        .forEach((job) => requestAdvice(job.jobId, resumeData));
     } catch (error) {
       console.error('Error during resume analysis:', error);
       setErrorMessage(error instanceof Error ? error.message : 'An unexpected error occurred');
@@ -162,6 +202,7 @@ function App() {
     setAnalysisResults(null);
     setFileName('');
     setErrorMessage(null);
+    setResumeData(null);
   };
 
   return (
@@ -171,7 +212,12 @@ function App() {
         {currentState === 'upload' && <UploadSection onFileUpload={handleFileUpload} />}
         {currentState === 'scanning' && <ScanningLoader fileName={fileName} />}
         {currentState === 'results' && analysisResults && (
-          <ResultsSection results={analysisResults} fileName={fileName} onStartOver={handleStartOver} />
+          <ResultsSection
+            results={analysisResults}
+            fileName={fileName}
+            onStartOver={handleStartOver}
+            onRequestAdvice={requestAdvice}
+          />
         )}
         {currentState === 'error' && (
           <div className="max-w-3xl mx-auto p-6 bg-red-50 border border-red-300 rounded-xl text-red-800">
@@ -28,9 +28,10 @@ interface ResultsSectionProps {
   results: ResumeAnalysis;
   fileName: string;
   onStartOver: () => void;
+  onRequestAdvice: (jobId: string) => Promise<void>;
 }
 
-const ResultsSection: React.FC<ResultsSectionProps> = ({ results, fileName, onStartOver }) => {
+const ResultsSection: React.FC<ResultsSectionProps> = ({ results, fileName, onStartOver, onRequestAdvice }) => {
   const getScoreColor = (score: number) => {
     if (score >= 90) return 'text-green-600 bg-green-50 border-green-200';
     if (score >= 75) return 'text-blue-600 bg-blue-50 border-blue-200';
@@ -59,6 +60,14 @@ const ResultsSection: React.FC<ResultsSectionProps> = ({ results, fileName, onSt
     return 'bg-red-50 border-red-200';
   };
 
+  const [adviceLoading, setAdviceLoading] = React.useState<Record<string, boolean>>({});
+
+  const handleRequestAdvice = async (jobId: string) => {
+    setAdviceLoading((prev) => ({ ...prev, [jobId]: true }));
+    await onRequestAdvice(jobId);
+    setAdviceLoading((prev) => ({ ...prev, [jobId]: false }));
+  };
+
   const JobCard: React.FC<{ job: JobMatch }> = ({ job }) => (
     <div className={`rounded-2xl p-6 border-2 transition-all duration-300 hover:shadow-lg ${getAlignmentBgColor(job.alignmentScore)}`}>
       <div className="flex justify-between items-start mb-4">
@@ -142,14 +151,24 @@ const ResultsSection: React.FC<ResultsSectionProps> = ({ results, fileName, onSt
           <Lightbulb className="w-4 h-4 mr-1" />
           Improvement Advice
         </h5>
-        <ul className="space-y-2">
-          {job.improvementAdvice.map((advice, index) => (
-            <li key={index} className="text-sm text-slate-600 flex items-start">
-              <span className="w-1 h-1 bg-amber-400 rounded-full mt-2 mr-2 flex-shrink-0"></span>
-              {advice}
-            </li>
-          ))}
-        </ul>
+        {job.improvementAdvice === null ? (
+          <button
+            onClick={() => handleRequestAdvice(job.jobId)}
+            disabled={adviceLoading[job.jobId]}
+            className="text-sm px-3 py-1 rounded-lg bg-amber-100 hover:bg-amber-200 text-amber-800 disabled:opacity-60"
+          >
+            {adviceLoading[job.jobId] ? 'Generating advice...' : 'Get improvement advice'}
+          </button>
+        ) : (
+          <ul className="space-y-2">
+            {job.improvementAdvice.map((advice, index) => (
+              <li key={index} className="text-sm text-slate-600 flex items-start">
+                <span className="w-1 h-1 bg-amber-400 rounded-full mt-2 mr-2 flex-shrink-0"></span>
+                {advice}
+              </li>
+            ))}
+          </ul>
+        )}
       </div>
 
       <a
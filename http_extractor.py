@@ -0,0 +1,112 @@
+# http_extractor.py
+import logging
+import re
+
+import httpx
+from bs4 import BeautifulSoup
+
+USER_AGENT = "Mozilla/5.0"
+DEFAULT_TIMEOUT = 15.0
+DEFAULT_MAX_CONNECTIONS = 10
+
+
+def _inner_text(el) -> str:
+    # Approximates Playwright's inner_text(): whitespace runs inside an element collapse to one space
+    return re.sub(r"\s+", " ", el.get_text()).strip()
+
+
+def parse_job_details_html(html: str) -> tuple[list[str], list[str]] | None:
+    """Extract `(skills, requirements)` from a job details page.
+
+    Mirrors `crawler.get_job_skills_and_requirements`. Returns None when neither
+    the `#skills` nor the `#requirements` section is present in the raw HTML,
+    meaning the page has to be rendered in a browser instead.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    skills_section = soup.select_one("#skills")
+    requirements_section = soup.select_one("#requirements")
+    if skills_section is None and requirements_section is None:
+        return None
+
+    skills_list = [_inner_text(b) for b in skills_section.select("button")] if skills_section else []
+
+    requirements_list = []
+    if requirements_section is not None:
+        requirements_list = [_inner_text(el) for el in requirements_section.select("li, p")]
+        if not requirements_list:
+            req_text = requirements_section.get_text("\n")
+            requirements_list = [line.strip() for line in req_text.split("\n") if line.strip()]
+
+    return skills_list, requirements_list
+
+
+def new_client(max_connections: int = DEFAULT_MAX_CONNECTIONS, timeout: float = DEFAULT_TIMEOUT) -> httpx.AsyncClient:
+    """Shared keep-alive client; reuse one instance for a whole crawl."""
+    return httpx.AsyncClient(
+        headers={"User-Agent": USER_AGENT},
+        timeout=timeout,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+    )
+
+
+async def fetch_job_details_conditional(client: httpx.AsyncClient, job_url: str, etag: str | None = None,
+                                        last_modified: str | None = None) -> dict:
+    """GET a job details page, revalidating with If-None-Match / If-Modified-Since when validators are known.
+
+    Returns `{"status", "details", "etag", "last_modified"}` where status is
+    "not_modified" (304, details None), "ok", or "fallback" when the caller has
+    to render the page in a browser; "error" is a fallback caused by a timeout,
+    connection failure or server error, i.e. the site may be degraded, and
+    carries the exception under "error".
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    result = {"status": "fallback", "details": None, "etag": None, "last_modified": None}
+    try:
+        response = await client.get(job_url, headers=headers)
+        if response.status_code == 304:
+            return {**result, "status": "not_modified", "etag": etag, "last_modified": last_modified}
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        logging.info(f"HTTP fetch failed for {job_url}, falling back to browser: {e}")
+        client_error = isinstance(e, httpx.HTTPStatusError) and e.response.status_code < 500
+        return result if client_error else {**result, "status": "error", "error": e}
+    details = parse_job_details_html(response.text)
+    if details is None:
+        logging.info(f"Job details not in raw HTML for {job_url}, falling back to browser")
+        return result
+    return {
+        "status": "ok",
+        "details": details,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+
+
+async def fetch_job_details(client: httpx.AsyncClient, job_url: str) -> tuple[list[str], list[str]] | None:
+    """One GET for a job details page. Returns None if the caller should fall back to a browser."""
+    return (await fetch_job_details_conditional(client, job_url))["details"]
+
+
+if __name__ == "__main__":
+    # Offline check of the parser against the saved pages in fixtures/bdjobs
+    import json
+    import os
+    import sys
+
+    fixtures_dir = os.path.join(os.path.dirname(__file__), "fixtures", "bdjobs")
+    with open(os.path.join(fixtures_dir, "expected.json"), encoding="utf-8") as f:
+        expected = json.load(f)
+    failures = 0
+    for name, want in expected.items():
+        with open(os.path.join(fixtures_dir, name), encoding="utf-8") as f:
+            got = parse_job_details_html(f.read())
+        got = None if got is None else {"skills": got[0], "requirements": got[1]}
+        status = "ok" if got == want else "MISMATCH"
+        failures += got != want
+        print(f"{status:8} {name}")
+    sys.exit(1 if failures else 0)
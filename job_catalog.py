@@ -0,0 +1,350 @@
+# job_catalog.py
+import argparse
+import heapq
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from collections import Counter
+
+from job_store import job_id_from_url
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+MAGIC = b"JCAT"
+FORMAT_VERSION = 1
+# magic, format version, header offset, header length; the JSON header sits after the sections
+_PREAMBLE = struct.Struct("<4sIQI")
+_ALIGN = 8
+# Strings stored per job, in table order; requirement lines are joined with "\n"
+_FIELDS = ("job_id", "title", "company", "url", "requirements")
+_NFIELDS = len(_FIELDS)
+
+
+def _job_id(job: dict) -> str:
+    return job.get("job_id") or job_id_from_url(job["url"])
+
+
+def _le(values: array) -> bytes:
+    # The file is little-endian whatever the host
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_catalog(path: str, jobs: list[dict], job_sets: list[set[str]], normalizer_version: str = "") -> int:
+    """Write `jobs` and their canonical skill sets (parallel lists) as a catalog file; returns its size.
+
+    Catalog order is the order of `jobs`, which is also the tie-break order
+    when scoring. The file is written next to `path` and renamed into place,
+    so processes that have the previous version mapped keep a consistent view.
+    """
+    names = sorted(set().union(*job_sets)) if job_sets else []
+    vocab = {name: i for i, name in enumerate(names)}
+
+    job_skill_offsets, job_skill_ids = array("I", [0]), array("I")
+    postings: list[list[int]] = [[] for _ in names]
+    for index, skills in enumerate(job_sets):
+        # Ids follow name order, so each job's ids (and names) come out sorted
+        ids = sorted(vocab[s] for s in skills)
+        job_skill_ids.extend(ids)
+        job_skill_offsets.append(len(job_skill_ids))
+        for skill_id in ids:
+            postings[skill_id].append(index)
+    posting_offsets, posting_jobs = array("I", [0]), array("I")
+    for jobs_with_skill in postings:
+        posting_jobs.extend(jobs_with_skill)
+        posting_offsets.append(len(posting_jobs))
+
+    skill_offsets, skill_names = array("Q", [0]), bytearray()
+    for name in names:
+        skill_names += name.encode("utf-8")
+        skill_offsets.append(len(skill_names))
+
+    job_ids = [_job_id(job) for job in jobs]
+    string_offsets, strings = array("Q", [0]), bytearray()
+    for job_id, job in zip(job_ids, jobs):
+        for value in (job_id, job["title"], job["company"], job["url"], "\n".join(job.get("requirements", []))):
+            strings += value.encode("utf-8")
+            string_offsets.append(len(strings))
+    expires_at = array("d", [job.get("expires_at", math.inf) for job in jobs])
+    # Job indexes sorted by id, for lookups by binary search instead of a per-process dict
+    id_order = array("I", sorted(range(len(jobs)), key=job_ids.__getitem__))
+
+    sections = {
+        "skill_offsets": _le(skill_offsets), "skill_names": bytes(skill_names),
+        "job_skill_offsets": _le(job_skill_offsets), "job_skill_ids": _le(job_skill_ids),
+        "posting_offsets": _le(posting_offsets), "posting_jobs": _le(posting_jobs),
+        "string_offsets": _le(string_offsets), "strings": bytes(strings),
+        "expires_at": _le(expires_at), "id_order": _le(id_order),
+    }
+    header = {"jobs": len(jobs), "skills": len(names), "normalizer_version": normalizer_version,
+              "created_at": time.time(), "sections": {}}
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(b"\0" * _PREAMBLE.size)
+            for name, data in sections.items():
+                f.write(b"\0" * (-f.tell() % _ALIGN))
+                header["sections"][name] = [f.tell(), len(data)]
+                f.write(data)
+            encoded = json.dumps(header).encode("utf-8")
+            header_offset = f.tell()
+            f.write(encoded)
+            size = f.tell()
+            f.seek(0)
+            f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, header_offset, len(encoded)))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return size
+
+
+def is_catalog(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class MappedCatalog:
+    """Read-only job catalog memory-mapped from a file written by `write_catalog`.
+
+    Opening reads only the header, so it takes the same time for ten jobs or a
+    million, and the pages are shared through the OS page cache by every
+    process that maps the same file. Skill sets are interned id arrays with an
+    inverted index (skill id -> job indexes) next to them; titles, URLs and
+    requirements live in one string table and are decoded per job on access.
+
+    Scoring follows `SkillIndex.score` exactly (same scores, ties broken by
+    catalog order), skipping postings whose `expires_at` has passed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_offset, header_length = _PREAMBLE.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a job catalog")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path} has catalog format {version}, expected {FORMAT_VERSION}")
+        header = json.loads(self._mm[header_offset:header_offset + header_length])
+        self.normalizer_version = header["normalizer_version"]
+        self.created_at = header["created_at"]
+        self._jobs = header["jobs"]
+        self._sections = header["sections"]
+        self._view = memoryview(self._mm)
+        self._skill_offsets = self._section("skill_offsets", "Q")
+        self._skill_names = self._section("skill_names")
+        self._job_skill_offsets = self._section("job_skill_offsets", "I")
+        self._job_skill_ids = self._section("job_skill_ids", "I")
+        self._posting_offsets = self._section("posting_offsets", "I")
+        self._posting_jobs = self._section("posting_jobs", "I")
+        self._string_offsets = self._section("string_offsets", "Q")
+        self._strings = self._section("strings")
+        self._expires_at = self._section("expires_at", "d")
+        self._id_order = self._section("id_order", "I")
+        # Built on first use: the vocabulary is small, the per-job arrays are views over the mapping
+        self._names: list[str] | None = None
+        self._vocab: dict[str, int] | None = None
+        self._arrays = None
+        self._score_table = None
+
+    def close(self):
+        self._arrays = None
+        for name in [n for n in vars(self) if isinstance(getattr(self, n), memoryview)]:
+            getattr(self, name).release()
+        self._mm.close()
+
+    def __len__(self):
+        return self._jobs
+
+    def __contains__(self, job_id):
+        return self.index_of(job_id) is not None
+
+    def _section(self, name: str, fmt: str | None = None) -> memoryview:
+        offset, length = self._sections[name]
+        view = self._view[offset:offset + length]
+        return view.cast(fmt) if fmt else view
+
+    def _string(self, index: int, field: int) -> str:
+        k = index * _NFIELDS + field
+        return str(self._strings[self._string_offsets[k]:self._string_offsets[k + 1]], "utf-8")
+
+    def skill_names(self) -> list[str]:
+        if self._names is None:
+            offsets, data = self._skill_offsets, self._skill_names
+            self._names = [str(data[offsets[i]:offsets[i + 1]], "utf-8") for i in range(len(offsets) - 1)]
+            self._vocab = {name: i for i, name in enumerate(self._names)}
+        return self._names
+
+    def index_of(self, job_id: str) -> int | None:
+        lo, hi = 0, self._jobs
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._string(self._id_order[mid], 0) < job_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._jobs and self._string(self._id_order[lo], 0) == job_id:
+            return self._id_order[lo]
+        return None
+
+    def job_id(self, index: int) -> str:
+        return self._string(index, 0)
+
+    def indexes(self, now: float | None = None) -> list[int]:
+        """Job indexes in catalog order; with `now`, only postings that have not expired by then."""
+        if now is None:
+            return list(range(self._jobs))
+        return [i for i in range(self._jobs) if self._expires_at[i] > now]
+
+    def job_ids(self, now: float | None = None) -> list[str]:
+        return [self._string(i, 0) for i in self.indexes(now)]
+
+    def job(self, index: int) -> dict:
+        requirements = self._string(index, 4)
+        return {
+            "job_id": self._string(index, 0),
+            "title": self._string(index, 1),
+            "company": self._string(index, 2),
+            "url": self._string(index, 3),
+            "requirements": requirements.split("\n") if requirements else [],
+            "expires_at": self._expires_at[index],
+        }
+
+    def skill_ids(self, index: int) -> memoryview:
+        return self._job_skill_ids[self._job_skill_offsets[index]:self._job_skill_offsets[index + 1]]
+
+    def job_skills(self, job_id: str) -> list[str]:
+        index = self.index_of(job_id)
+        if index is None:
+            raise KeyError(job_id)
+        return self.skills_at(index)
+
+    def skills_at(self, index: int) -> list[str]:
+        names = self.skill_names()
+        return [names[skill_id] for skill_id in self.skill_ids(index)]
+
+    def score(self, resume_skills: set[str], top_k: int | None = None, min_overlap: int = 0,
+              stats: dict | None = None, now: float | None = None, include_job: bool = False) -> list[dict]:
+        """Rank the catalog for one resume, like `SkillIndex.score`.
+
+        Postings expired at `now` (default: the current time) are left out.
+        With `include_job`, each result also carries the posting under "job".
+        """
+        now = time.time() if now is None else now
+        self.skill_names()
+        skill_ids = [self._vocab[s] for s in resume_skills if s in self._vocab]
+        rank = self._rank_numpy if np is not None else self._rank_python
+        ranked, overlaps, alive, candidates = rank(skill_ids, top_k, min_overlap, now)
+        if stats is not None:
+            stats.update(catalog=alive, candidates=candidates, scored=len(ranked))
+
+        results = []
+        for index, overlap in zip(ranked, overlaps):
+            required = self.skills_at(index)
+            result = {
+                "job_id": self._string(index, 0),
+                "score": round(overlap / max(1, len(required)), 4),
+                "matched_skills": [s for s in required if s in resume_skills],
+                "missing_skills": [s for s in required if s not in resume_skills],
+                "required_skills": required,
+            }
+            if include_job:
+                result["job"] = self.job(index)
+            results.append(result)
+        return results
+
+    def _numpy_arrays(self):
+        if self._arrays is None:
+            def section(name, dtype):
+                offset, length = self._sections[name]
+                return np.frombuffer(self._mm, dtype=dtype, count=length // np.dtype(dtype).itemsize, offset=offset)
+            sizes = np.diff(section("job_skill_offsets", "<u4")).astype(np.int64)
+            self._arrays = (section("posting_offsets", "<u4"), section("posting_jobs", "<u4"),
+                            section("expires_at", "<f8"), sizes)
+        return self._arrays
+
+    def _table(self, max_size: int):
+        # Exact scores per (job skill count, overlap); numpy's rounding can differ from round() in the last place
+        if self._score_table is None or self._score_table.shape[0] <= max_size:
+            self._score_table = np.array([[round(o / max(1, s), 4) for o in range(max_size + 1)]
+                                          for s in range(max_size + 1)])
+        return self._score_table
+
+    def _rank_numpy(self, skill_ids, top_k, min_overlap, now):
+        posting_offsets, posting_jobs, expires_at, sizes = self._numpy_arrays()
+        counts = np.zeros(self._jobs, dtype=np.int64)
+        for skill_id in skill_ids:
+            # A job is listed at most once per skill, so fancy-index increments do not collide
+            counts[posting_jobs[posting_offsets[skill_id]:posting_offsets[skill_id + 1]]] += 1
+        alive = expires_at > now
+        n_alive = int(alive.sum())
+        candidates = np.flatnonzero((counts >= max(1, min_overlap)) & alive)
+        if len(candidates):
+            scores = self._table(int(sizes.max()))[sizes[candidates], counts[candidates]]
+            candidates = candidates[np.lexsort((candidates, -scores))]
+        limit = (n_alive if min_overlap <= 0 else len(candidates)) if top_k is None else top_k
+        ranked = candidates[:limit]
+        if len(ranked) < limit and min_overlap <= 0:
+            # Pad with zero-overlap jobs in catalog order
+            ranked = np.concatenate([ranked, np.flatnonzero((counts == 0) & alive)[:limit - len(ranked)]])
+        return ranked.tolist(), counts[ranked].tolist(), n_alive, len(candidates) if min_overlap > 0 else n_alive
+
+    def _rank_python(self, skill_ids, top_k, min_overlap, now):
+        counts = Counter()
+        for skill_id in skill_ids:
+            counts.update(self._posting_jobs[self._posting_offsets[skill_id]:self._posting_offsets[skill_id + 1]])
+        offsets, expires_at = self._job_skill_offsets, self._expires_at
+
+        def rank_key(index):
+            return -round(counts[index] / max(1, offsets[index + 1] - offsets[index]), 4), index
+
+        n_alive = sum(1 for i in range(self._jobs) if expires_at[i] > now)
+        candidates = [i for i, n in counts.items() if n >= min_overlap and expires_at[i] > now]
+        limit = (n_alive if min_overlap <= 0 else len(candidates)) if top_k is None else top_k
+        ranked = heapq.nsmallest(limit, candidates, key=rank_key)
+        for index in range(self._jobs) if min_overlap <= 0 else ():
+            if len(ranked) >= limit:
+                break
+            if index not in counts and expires_at[index] > now:
+                ranked.append(index)
+        return ranked, [counts.get(i, 0) for i in ranked], n_alive, len(candidates) if min_overlap > 0 else n_alive
+
+
+def main(argv=None):
+    import bulk_match
+    from skill_matcher import DEFAULT_DICTIONARY_PATH, SYNONYMS, SkillMatcher
+
+    parser = argparse.ArgumentParser(description="Convert a job catalog to the memory-mapped binary format.")
+    parser.add_argument("source", help="job_skills.json-style file or job store database")
+    parser.add_argument("output", help="Catalog file to write")
+    parser.add_argument("--dictionary", default=os.getenv("SKILL_DICTIONARY_PATH", DEFAULT_DICTIONARY_PATH),
+                        help="Skill dictionary used to normalize the postings")
+    args = parser.parse_args(argv)
+
+    matcher = SkillMatcher.from_sources(SYNONYMS, args.dictionary)
+    started = time.perf_counter()
+    jobs, job_sets = bulk_match.load_catalog(args.source, matcher)
+    size = write_catalog(args.output, jobs, job_sets, matcher.version)
+    print(f"Wrote {len(jobs)} jobs ({size / 1024:.0f} KiB) to {args.output} in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
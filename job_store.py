@@ -0,0 +1,341 @@
+# job_store.py
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import struct
+import threading
+import time
+
+PROJECT_DIR = os.path.dirname(__file__)
+DEFAULT_DB_PATH = os.path.join(PROJECT_DIR, 'job_store.db')
+DEFAULT_SEED_PATH = os.path.join(PROJECT_DIR, 'job_skills.json')
+DEFAULT_TTL_SECONDS = 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL,
+    url TEXT NOT NULL,
+    skills TEXT NOT NULL,
+    requirements TEXT NOT NULL,
+    scraped_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    content_hash TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    seen_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_expires_at ON jobs (expires_at);
+CREATE TABLE IF NOT EXISTS skills (
+    skill_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+# Columns added after the first release; created on open for older databases
+_ADDED_COLUMNS = {"content_hash": "TEXT", "etag": "TEXT", "last_modified": "TEXT", "seen_at": "REAL",
+                  "skill_ids": "BLOB", "normalizer_version": "TEXT", "change_seq": "INTEGER"}
+
+
+def job_id_from_url(url: str) -> str:
+    """Return the bdjobs posting id from a job details URL (falls back to the URL itself)."""
+    match = re.search(r"[?&]id=(\d+)", url)
+    return match.group(1) if match else url
+
+
+def pack_skill_ids(skill_ids) -> bytes:
+    """Sorted skill ids as little-endian uint32s: 4 bytes per skill."""
+    skill_ids = sorted(skill_ids)
+    return struct.pack(f"<{len(skill_ids)}I", *skill_ids)
+
+
+def unpack_skill_ids(blob: bytes) -> list[int]:
+    return list(struct.unpack(f"<{len(blob) // 4}I", blob))
+
+
+def content_hash(job: dict) -> str:
+    """Fingerprint of the parts of a posting that matching depends on."""
+    payload = [job["title"], job["company"], job.get("skills", []), job.get("requirements", [])]
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class JobStore:
+    """SQLite-backed catalog of scraped job postings with a freshness TTL per posting."""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for name, kind in _ADDED_COLUMNS.items():
+            if name not in columns:
+                try:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {kind}")
+                except sqlite3.OperationalError as e:
+                    # Another worker process opening the same database added it first
+                    if "duplicate column" not in str(e):
+                        raise
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_seen_at ON jobs (seen_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_change_seq ON jobs (change_seq)")
+        # Rows written before the counter existed count as changed once
+        self._conn.execute("UPDATE jobs SET change_seq = (SELECT COALESCE(MAX(change_seq), 0) FROM jobs) + rowid "
+                           "WHERE change_seq IS NULL")
+        # The last change_seq handed out lives in meta, so purging the newest rows never lets a number come back
+        self._conn.execute("INSERT OR IGNORE INTO meta (key, value) "
+                           "SELECT 'change_seq', COALESCE(MAX(change_seq), 0) FROM jobs")
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def upsert_jobs(self, jobs: list[dict], ttl_seconds: int | None = None, now: float | None = None) -> int:
+        """Insert or refresh job records; every written posting gets a new expiry.
+
+        Returns how many postings were new or had different content (by hash).
+        """
+        now = time.time() if now is None else now
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        rows = [
+            (
+                job_id_from_url(job["url"]),
+                job["title"],
+                job["company"],
+                job["url"],
+                json.dumps(job.get("skills", []), ensure_ascii=False),
+                json.dumps(job.get("requirements", []), ensure_ascii=False),
+                now,
+                now + ttl,
+                content_hash(job),
+                job.get("etag"),
+                job.get("last_modified"),
+                now,
+            )
+            for job in jobs
+        ]
+        with self._lock:
+            stored = self._hashes([row[0] for row in rows])
+            first = self._reserve_seqs(len(rows))
+            rows = [(*row, first + i) for i, row in enumerate(rows)]
+            self._conn.executemany(
+                "INSERT INTO jobs (job_id, title, company, url, skills, requirements, scraped_at, expires_at, "
+                "content_hash, etag, last_modified, seen_at, change_seq) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(job_id) DO UPDATE SET title=excluded.title, company=excluded.company, "
+                "url=excluded.url, skills=excluded.skills, requirements=excluded.requirements, "
+                "scraped_at=excluded.scraped_at, expires_at=excluded.expires_at, content_hash=excluded.content_hash, "
+                "etag=excluded.etag, last_modified=excluded.last_modified, seen_at=excluded.seen_at, "
+                "change_seq=excluded.change_seq, "
+                # The stored skill set stays valid only while the content it was derived from is unchanged
+                "skill_ids=CASE WHEN jobs.content_hash IS excluded.content_hash THEN jobs.skill_ids END, "
+                "normalizer_version=CASE WHEN jobs.content_hash IS excluded.content_hash THEN jobs.normalizer_version END",
+                rows,
+            )
+            self._conn.commit()
+        return len({row[0] for row in rows if stored.get(row[0]) != row[8]})
+
+    def touch_jobs(self, job_ids: list[str], validated: bool = False, ttl_seconds: int | None = None,
+                   now: float | None = None) -> int:
+        """Extend the expiry of postings that are still listed but were not refetched.
+
+        `validated` marks them as checked against the server (e.g. a 304), which
+        also resets `scraped_at`.
+        """
+        now = time.time() if now is None else now
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        set_scraped = ", scraped_at = ?" if validated else ""
+        with self._lock:
+            first = self._reserve_seqs(len(job_ids))
+            cur = self._conn.executemany(
+                f"UPDATE jobs SET expires_at = ?, seen_at = ?, change_seq = ?{set_scraped} WHERE job_id = ?",
+                [(now + ttl, now, first + i, now, job_id) if validated else (now + ttl, now, first + i, job_id)
+                 for i, job_id in enumerate(job_ids)],
+            )
+            self._conn.commit()
+        return cur.rowcount
+
+    def _reserve_seqs(self, count: int) -> int:
+        """Claim `count` consecutive change_seq values and return the first; call under the lock, before commit.
+
+        The UPDATE opens the write transaction, so concurrent writers (other
+        processes included) get disjoint, increasing ranges.
+        """
+        self._conn.execute("UPDATE meta SET value = value + ? WHERE key = 'change_seq'", (count,))
+        last = int(self._conn.execute("SELECT value FROM meta WHERE key = 'change_seq'").fetchone()[0])
+        return last - count + 1
+
+    def known_jobs(self) -> dict[str, dict]:
+        """Every stored posting's listing fields and HTTP validators, keyed by job id."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, title, company, scraped_at, content_hash, etag, last_modified FROM jobs"
+            ).fetchall()
+        return {row["job_id"]: dict(row) for row in rows}
+
+    def intern_skills(self, names) -> dict[str, int]:
+        """Stable integer id for every skill name, allocating ids for new names."""
+        names = sorted(set(names))
+        ids = {}
+        with self._lock:
+            self._conn.executemany("INSERT OR IGNORE INTO skills (name) VALUES (?)", [(n,) for n in names])
+            self._conn.commit()
+            for i in range(0, len(names), 500):
+                chunk = names[i:i + 500]
+                ids.update((row["name"], row["skill_id"]) for row in self._conn.execute(
+                    f"SELECT name, skill_id FROM skills WHERE name IN ({','.join('?' * len(chunk))})", chunk
+                ))
+        return ids
+
+    def skill_names(self) -> dict[int, str]:
+        with self._lock:
+            return {row["skill_id"]: row["name"] for row in self._conn.execute("SELECT skill_id, name FROM skills")}
+
+    def save_skill_sets(self, skill_sets: dict[str, list[int]], version: str):
+        """Persist each posting's normalized skill ids together with the normalizer version that produced them."""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE jobs SET skill_ids = ?, normalizer_version = ? WHERE job_id = ?",
+                [(pack_skill_ids(ids), version, job_id) for job_id, ids in skill_sets.items()],
+            )
+            self._conn.commit()
+
+    def jobs_needing_normalization(self, version: str, now: float | None = None) -> list[dict]:
+        """Fresh postings without a skill set from normalizer `version`."""
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE expires_at > ? AND normalizer_version IS NOT ?", (now, version)
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def _hashes(self, job_ids: list[str]) -> dict[str, str]:
+        hashes = {}
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(job_ids), 500):
+            chunk = job_ids[i:i + 500]
+            hashes.update(self._conn.execute(
+                f"SELECT job_id, content_hash FROM jobs WHERE job_id IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall())
+        return hashes
+
+    def fresh_jobs(self, now: float | None = None) -> list[dict]:
+        """Return all postings that have not expired, oldest scrape first."""
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE expires_at > ? ORDER BY scraped_at, rowid", (now,)
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def jobs_changed_since(self, cursor: int, now: float | None = None) -> list[dict]:
+        """Fresh postings written or re-seen after change `cursor`, for incremental consumers.
+
+        Every upsert or touch gives a row a new, strictly larger `change_seq`;
+        pass the largest one seen so far to get only what changed since.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE change_seq > ? AND expires_at > ? ORDER BY change_seq", (cursor, now)
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def purge_expired(self, now: float | None = None) -> int:
+        now = time.time() if now is None else now
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM jobs WHERE expires_at <= ?", (now,))
+            self._conn.commit()
+        return cur.rowcount
+
+    def count(self, fresh_only: bool = True, now: float | None = None) -> int:
+        now = time.time() if now is None else now
+        query = "SELECT COUNT(*) FROM jobs" + (" WHERE expires_at > ?" if fresh_only else "")
+        with self._lock:
+            return self._conn.execute(query, (now,) if fresh_only else ()).fetchone()[0]
+
+    def seed_from_json(self, path: str = DEFAULT_SEED_PATH, ttl_seconds: int | None = None) -> int:
+        """Load postings in the `job_skills.json` format into the store."""
+        if not os.path.exists(path):
+            logging.warning(f"Seed file not found: {path}")
+            return 0
+        with open(path, encoding='utf-8') as f:
+            jobs = json.load(f)
+        return self.upsert_jobs(jobs, ttl_seconds=ttl_seconds)
+
+    def get_meta(self, key: str, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row["value"]) if row else default
+
+    def set_meta(self, key: str, value):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                (key, json.dumps(value)),
+            )
+            self._conn.commit()
+
+    def acquire_lease(self, name: str, owner: str, ttl_seconds: float, now: float | None = None) -> bool:
+        """Take (or renew) the named lease unless another owner holds an unexpired one.
+
+        Lets several worker processes sharing this store agree on which of them
+        runs a singleton job such as the scheduled crawl.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) ON CONFLICT(name) DO UPDATE "
+                "SET owner=excluded.owner, expires_at=excluded.expires_at "
+                "WHERE leases.owner = excluded.owner OR leases.expires_at <= ?",
+                (name, owner, now + ttl_seconds, now),
+            )
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    def release_lease(self, name: str, owner: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+            self._conn.commit()
+
+    def lease_owner(self, name: str, now: float | None = None) -> str | None:
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._conn.execute("SELECT owner FROM leases WHERE name = ? AND expires_at > ?",
+                                     (name, now)).fetchone()
+        return row["owner"] if row else None
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> dict:
+        return {
+            "job_id": row["job_id"],
+            "title": row["title"],
+            "company": row["company"],
+            "url": row["url"],
+            "skills": json.loads(row["skills"]),
+            "requirements": json.loads(row["requirements"]),
+            "scraped_at": row["scraped_at"],
+            "expires_at": row["expires_at"],
+            "seen_at": row["seen_at"] if row["seen_at"] is not None else row["scraped_at"],
+            "change_seq": row["change_seq"],
+            "content_hash": row["content_hash"],
+            "skill_ids": unpack_skill_ids(row["skill_ids"]) if row["skill_ids"] is not None else None,
+            "normalizer_version": row["normalizer_version"],
+        }
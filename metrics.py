@@ -0,0 +1,337 @@
+# metrics.py
+import atexit
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from starlette.responses import Response
+
+# Requests slower than this log their per-stage breakdown; 0 disables
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", "5"))
+# Add a Server-Timing header with the per-stage breakdown to every response
+SERVER_TIMING = os.getenv("METRICS_SERVER_TIMING", "0") == "1"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Directory where each worker process snapshots its metrics, so /metrics can report
+# all workers of a multi-worker server (serve.py sets it); empty keeps metrics in-process
+MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR", "")
+# How often a worker refreshes its snapshot; other workers' numbers are at most this stale
+FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in (*zip(names, values), *extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def snapshot(self) -> list:
+        """`[labels, value]` pairs as JSON-compatible lists."""
+        with self._lock:
+            return json.loads(json.dumps([[list(key), value] for key, value in self._values.items()]))
+
+    @staticmethod
+    def combine(a, b):
+        """Merge one label set's values from two processes."""
+        return a + b
+
+    def render(self, values: dict | None = None) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        if values is None:
+            with self._lock:
+                values = dict(self._values)
+        for key, value in sorted(values.items()):
+            lines.extend(self._render_one(key, value))
+        return lines
+
+    def _render_one(self, key, value) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, then sum and count
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    @staticmethod
+    def combine(a, b):
+        return [[x + y for x, y in zip(a[0], b[0])], a[1] + b[1], a[2] + b[2]]
+
+    def _render_one(self, key, state) -> list[str]:
+        counts, total, count = state
+        lines, cumulative = [], 0
+        for bound, n in zip(self.buckets, counts):
+            cumulative += n
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', _format_value(bound))])} "
+                         f"{cumulative}")
+        lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', '+Inf')])} {count}")
+        lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except PermissionError:
+        return True
+    except (OSError, OverflowError):
+        return False
+    return True
+
+
+class Registry:
+    """Metrics of this process, or with `multiproc_dir` of every worker process sharing that directory.
+
+    In multi-process mode each process writes its values to `<dir>/<pid>.json`
+    every `flush_seconds` and at exit, and `render` sums all snapshots. Counters
+    and histograms of exited workers are kept so totals never go backwards;
+    their gauges (in-flight counts) are dropped.
+    """
+
+    def __init__(self, multiproc_dir: str = "", flush_seconds: float = FLUSH_SECONDS, worker_id: int | None = None):
+        self._metrics: list[_Metric] = []
+        self.multiproc_dir = multiproc_dir
+        self.worker_id = worker_id or os.getpid()
+        if multiproc_dir:
+            os.makedirs(multiproc_dir, exist_ok=True)
+            atexit.register(self.flush)
+            if flush_seconds > 0:
+                threading.Thread(target=self._flush_loop, args=(flush_seconds,), name="metrics-flush",
+                                 daemon=True).start()
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        if not self.multiproc_dir:
+            return "\n".join(line for metric in self._metrics for line in metric.render()) + "\n"
+        self.flush()
+        merged = self._collect()
+        return "\n".join(line for metric in self._metrics for line in metric.render(merged[metric.name])) + "\n"
+
+    def flush(self):
+        """Write this process's snapshot for the other workers to read."""
+        path = os.path.join(self.multiproc_dir, f"{self.worker_id}.json")
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({metric.name: metric.snapshot() for metric in self._metrics}, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logging.warning(f"Could not write metrics snapshot {path}: {e}")
+
+    def _collect(self) -> dict:
+        metrics = {metric.name: metric for metric in self._metrics}
+        merged = {name: {} for name in metrics}
+        with os.scandir(self.multiproc_dir) as entries:
+            paths = [entry.path for entry in entries if entry.name.endswith(".json")]
+        for path in paths:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    snapshot = json.load(f)
+                worker = int(os.path.basename(path)[:-len(".json")])
+            except (OSError, ValueError):
+                continue
+            alive = worker == self.worker_id or _pid_alive(worker)
+            for name, pairs in snapshot.items():
+                metric = metrics.get(name)
+                if metric is None or (metric.kind == "gauge" and not alive):
+                    continue
+                values = merged[name]
+                for key, value in pairs:
+                    key = tuple(key)
+                    values[key] = metric.combine(values[key], value) if key in values else value
+        return merged
+
+    def _flush_loop(self, interval: float):
+        while True:
+            time.sleep(interval)
+            self.flush()
+
+
+REGISTRY = Registry(MULTIPROC_DIR)
+
+stage_seconds = REGISTRY.register(Histogram(
+    "stage_duration_seconds", "Time spent per pipeline stage.", ["stage"]))
+stage_in_flight = REGISTRY.register(Gauge(
+    "stage_in_flight", "Stage executions currently running.", ["stage"]))
+stage_failures = REGISTRY.register(Counter(
+    "stage_failures_total", "Stage executions that raised.", ["stage"]))
+request_seconds = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ["method", "route", "status"]))
+requests_in_flight = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served."))
+pages_fetched = REGISTRY.register(Counter(
+    "pages_fetched_total", "bdjobs pages fetched, by kind (listing, detail_http, detail_browser, not_modified).",
+    ["kind"]))
+cache_requests = REGISTRY.register(Counter(
+    "cache_requests_total", "Cache lookups by cache and result (hit or miss).", ["cache", "result"]))
+llm_calls = REGISTRY.register(Counter(
+    "llm_calls_total", "Advice backend calls by backend and outcome (ok or error).", ["backend", "outcome"]))
+match_candidates = REGISTRY.register(Counter(
+    "match_candidates_total", "Jobs seen by match requests, by first-stage outcome "
+    "(pruned_overlap, pruned_top_k or scored).", ["outcome"]))
+
+# Per-request {stage: [seconds, count]} breakdown; None outside a request
+_breakdown: contextvars.ContextVar[dict | None] = contextvars.ContextVar("metrics_breakdown", default=None)
+
+
+@contextmanager
+def span(stage: str):
+    """Time a block as `stage`: histogram, in-flight gauge, failure counter and the current request's breakdown."""
+    stage_in_flight.inc(stage=stage)
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        stage_failures.inc(stage=stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        stage_in_flight.dec(stage=stage)
+        stage_seconds.observe(elapsed, stage=stage)
+        breakdown = _breakdown.get()
+        if breakdown is not None:
+            entry = breakdown.setdefault(stage, [0.0, 0])
+            entry[0] += elapsed
+            entry[1] += 1
+
+
+def timed(stage: str):
+    """Decorator form of `span` for coroutine functions."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with span(stage):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def format_breakdown(breakdown: dict) -> str:
+    return ", ".join(f"{stage}={seconds:.3f}s x{count}" for stage, (seconds, count) in breakdown.items())
+
+
+def server_timing(breakdown: dict, total: float) -> str:
+    parts = [f"{stage};dur={seconds * 1000:.1f}" for stage, (seconds, _) in breakdown.items()]
+    return ", ".join([*parts, f"total;dur={total * 1000:.1f}"])
+
+
+class MetricsMiddleware:
+    """Record latency per route and collect each request's stage breakdown.
+
+    Slow requests log their breakdown; with METRICS_SERVER_TIMING=1 it is also
+    returned as a Server-Timing header (stages finished before the response started).
+    """
+
+    def __init__(self, app, slow_seconds: float = SLOW_REQUEST_SECONDS, server_timing_header: bool = SERVER_TIMING):
+        self.app = app
+        self.slow_seconds = slow_seconds
+        self.server_timing_header = server_timing_header
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            return await self.app(scope, receive, send)
+
+        breakdown = {}
+        token = _breakdown.set(breakdown)
+        started = time.perf_counter()
+        status = 500
+        requests_in_flight.inc()
+
+        async def timed_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing_header:
+                    header = server_timing(breakdown, time.perf_counter() - started).encode("latin-1")
+                    message = {**message, "headers": [*message.get("headers", []), (b"server-timing", header)]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            elapsed = time.perf_counter() - started
+            requests_in_flight.dec()
+            _breakdown.reset(token)
+            route = scope.get("route")
+            request_seconds.observe(elapsed, method=scope["method"],
+                                    route=getattr(route, "path", "unmatched"), status=status)
+            if self.slow_seconds and elapsed >= self.slow_seconds:
+                logging.warning(f"Slow request {scope['method']} {scope['path']} took {elapsed:.2f}s: "
+                                f"{format_breakdown(breakdown) or 'no stages recorded'}")
+
+
+def metrics_response() -> Response:
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,93 @@
+# pdf_extraction.py
+import logging
+import os
+
+try:
+    import fitz  # PyMuPDF
+except Exception:
+    fitz = None
+
+try:
+    import pdfplumber
+except Exception:
+    pdfplumber = None
+
+# Fastest first (see benchmarks/bench_pdf_backends.py); PDF_BACKEND overrides the choice.
+BACKEND_PREFERENCE = ("pymupdf", "pdfplumber")
+
+
+def _pymupdf_pages(file_path):
+    doc = fitz.open(file_path)
+    try:
+        for page in doc:
+            yield page.get_text()
+    finally:
+        doc.close()
+
+
+def _pdfplumber_pages(file_path):
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            # Drop the parsed layout objects as we go so memory stays flat on long documents
+            page.close()
+            yield page_text + "\n" if page_text else ""
+
+
+_BACKENDS = {
+    "pymupdf": (_pymupdf_pages, lambda: fitz is not None),
+    "pdfplumber": (_pdfplumber_pages, lambda: pdfplumber is not None),
+}
+
+
+def available_backends() -> list[str]:
+    """Installed backends, fastest first."""
+    return [name for name in BACKEND_PREFERENCE if _BACKENDS[name][1]()]
+
+
+def select_backend(backend: str | None = None) -> str:
+    """Resolve `backend` (or $PDF_BACKEND, or the fastest installed backend) to a usable name."""
+    backend = backend or os.getenv("PDF_BACKEND")
+    if backend:
+        if backend not in _BACKENDS:
+            raise ValueError(f"Unknown PDF backend {backend!r}; choose one of {', '.join(_BACKENDS)}")
+        if not _BACKENDS[backend][1]():
+            raise RuntimeError(f"PDF backend {backend!r} is not installed")
+        return backend
+    backends = available_backends()
+    if not backends:
+        raise RuntimeError("No PDF backend installed: pip install PyMuPDF (or pdfplumber)")
+    return backends[0]
+
+
+def iter_page_texts(file_path: str, backend: str | None = None):
+    """Yield the text of each page lazily; stop iterating early to skip the remaining pages."""
+    pages, _ = _BACKENDS[select_backend(backend)]
+    yield from pages(file_path)
+
+
+def extract_text(file_path: str, backend: str | None = None, max_pages: int | None = None) -> tuple[str, str, int]:
+    """Return `(text, backend, page_count)`.
+
+    Without an explicit backend, the next installed backend is tried when the
+    preferred one fails or finds no text in the file.
+    """
+    candidates = [select_backend(backend)] if backend or os.getenv("PDF_BACKEND") else available_backends()
+    if not candidates:
+        select_backend()  # raises the "not installed" error
+    error = None
+    for name in candidates:
+        try:
+            parts = []
+            for page_text in iter_page_texts(file_path, name):
+                parts.append(page_text)
+                if max_pages is not None and len(parts) >= max_pages:
+                    break
+            text = "".join(parts)
+            if text.strip() or name == candidates[-1]:
+                return text, name, len(parts)
+            logging.info(f"{name} found no text in {file_path}, trying next backend")
+        except Exception as e:
+            error = e
+            logging.info(f"{name} failed on {file_path}: {e}")
+    raise error
@@ -0,0 +1,104 @@
+# resume_cache.py
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+PROJECT_DIR = os.path.dirname(__file__)
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_DIR, 'cache', 'resumes')
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResumeCache:
+    """Parsed-resume cache keyed by the SHA-256 of the PDF bytes plus the parser version.
+
+    A small in-memory LRU sits in front of an on-disk store of JSON files. The
+    disk store is bounded by entry count and total bytes; the least recently
+    used entries (by file mtime, refreshed on every hit) are evicted first.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, version: str = "1", max_entries: int = 5000,
+                 max_bytes: int = 64 * 1024 * 1024, memory_entries: int = 256):
+        self.directory = directory
+        self.version = version
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _key(self, digest: str) -> str:
+        return f"{self.version}-{digest}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _remember(self, key: str, value: dict):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, digest: str) -> dict | None:
+        key = self._key(digest)
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return value
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                value = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self._remember(key, value)
+            self.hits += 1
+        return value
+
+    def put(self, digest: str, value: dict):
+        key = self._key(digest)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(f"Could not write resume cache entry {key}: {e}")
+        with self._lock:
+            self._remember(key, value)
+        self._evict()
+
+    def _evict(self):
+        try:
+            entries = []
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".json"):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        while entries and (len(entries) > self.max_entries or total > self.max_bytes):
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
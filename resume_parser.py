@@ -1,34 +1,141 @@
 import re
 import json
 import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
 
-try:
-    import fitz  # PyMuPDF
-except Exception:
-    fitz = None
+import pdf_extraction
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_REPEATED_CHAR_RE = re.compile(r'(\w)\1{2,}')
 
 def clean_text(text):
     """Clean text by removing excessive whitespace, repeated characters, and common OCR artifacts."""
-    text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
-    text = re.sub(r'(\w)\1{2,}', r'\1', text)  # Remove repeated characters (e.g., FFFFF -> F)
+    text = _WHITESPACE_RE.sub(' ', text)  # Normalize whitespace
+    text = _REPEATED_CHAR_RE.sub(r'\1', text)  # Remove repeated characters (e.g., FFFFF -> F)
     text = text.strip()
     return text
 
-def extract_text_from_pdf(file_path):
-    """Extract text from a PDF file using PyMuPDF."""
+def extract_text_from_pdf(file_path, backend=None):
+    """Extract cleaned text from a PDF file with the fastest available backend (see pdf_extraction)."""
     try:
-        if fitz is None:
-            raise RuntimeError("PyMuPDF (fitz) not installed. In fish: source .venv/bin/activate.fish && pip install PyMuPDF")
-        doc = fitz.open(file_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        doc.close()
+        text, _, _ = pdf_extraction.extract_text(file_path, backend)
         return clean_text(text)
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
         return ""
 
+_NAME_PATTERNS = [
+    re.compile(r"(?i)(?:Md|Mr|Ms|Mrs)?\.?\s?([A-Z][a-z]+(?:\s[A-Z][a-z]+){1,4})", re.MULTILINE),  # Standard name with 2-5 words
+    re.compile(r"(?i)^[A-Z\s]+$", re.MULTILINE),  # All caps name at the start (common in some resumes)
+    re.compile(r"(?i)([A-Z][a-z]+\s[A-Z][a-z]+)", re.MULTILINE)  # Simple two-word name
+]
+_EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+_PHONE_PATTERNS = [
+    re.compile(r'\+880\s?\d{10}'),  # +880 followed by 10 digits
+    re.compile(r'\b\d{11}\b'),      # 11-digit number (common in Bangladesh)
+    re.compile(r'\b\d{3}-\d{8}\b')  # Format like 017-7428256
+]
+_LINKEDIN_RE = re.compile(r'https?://(?:www\.)?linkedin\.com/in/[^\s]+')
+_GITHUB_RE = re.compile(r'https?://github\.com/[^\s]+')
+
+# Section headings (case-insensitive, multiple variations): each section starts at the first
+# of its headings and runs until the next of its stop headings (or the end of the text).
+_SECTION_HEADINGS = {
+    "education": ["Education", "Academic Background", "Qualifications", "Studies"],
+    "technical_skills": ["Technical Skills", "Skills", "Technologies", "Proficiencies"],
+    "projects": ["Projects", "Notable Projects", "Portfolio", "Work"],
+    "achievements": ["Achievements", "Awards", "Honors", "Accomplishments", "Volunteering"],
+    "experience": ["Experience", "Work Experience", "Professional Experience", "Employment"],
+    "reference": ["Reference", "References", "Referees"],
+}
+_SECTION_STOPS = {
+    "education": ["Technical Skills", "Skills", "Experience", "Projects", "Achievements", "Extracurricular", "Certifications", "Reference"],
+    "technical_skills": ["Experience", "Projects", "Achievements", "Extracurricular", "Certifications", "Reference"],
+    "projects": ["Achievements", "Experience", "Extracurricular", "Certifications", "Reference"],
+    "achievements": ["Experience", "Extracurricular", "Certifications", "Reference"],
+    "experience": ["Projects", "Achievements", "Extracurricular", "Certifications", "Reference"],
+    "reference": [],
+}
+_HEADING_WORDS = sorted(
+    {w.lower() for words in (*_SECTION_HEADINGS.values(), *_SECTION_STOPS.values()) for w in words},
+    key=len, reverse=True,
+)
+# One alternation (longest words first) gives the longest heading word at an offset; shorter
+# words matching at the same offset are exactly its prefixes in _HEADING_WORDS.
+_HEADING_RE = re.compile("|".join(re.escape(w) for w in _HEADING_WORDS))
+# Matching on folded text is much faster than re.IGNORECASE. Folding maps each character to
+# exactly one character, and it equates the same characters with the ASCII heading letters
+# as re.IGNORECASE does (including "ſ" ~ "s", the Kelvin sign ~ "k", and dotted/dotless i).
+_CASE_FOLD = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s"})
+_HEADING_PREFIXES = {
+    w: frozenset(p for p in _HEADING_WORDS if w.startswith(p)) for w in _HEADING_WORDS
+}
+_LEADING_SPACE_RE = re.compile(r'\s*')
+
+class _HeadingScanner:
+    """Heading offsets in `text`, found left to right by one scan that only advances on demand."""
+
+    def __init__(self, text):
+        folded = text
+        if "\u0130" in text or "\u0131" in text or "\u017f" in text:
+            folded = text.translate(_CASE_FOLD)
+        self._folded = folded.lower()
+        self._next = _HEADING_RE.search(self._folded)
+        self.found = []  # [(offset, heading words starting at offset)]
+
+    def get(self, i):
+        """The i-th heading, or None once the text is exhausted."""
+        while len(self.found) <= i and self._next:
+            match = self._next
+            self.found.append((match.start(), _HEADING_PREFIXES[match.group()]))
+            # Resume one character later (not at match.end()) so overlapping headings are kept,
+            # e.g. "Skills" inside "Technical Skills"
+            self._next = _HEADING_RE.search(self._folded, match.start() + 1)
+        return self.found[i] if i < len(self.found) else None
+
+def _segment_sections(text):
+    """Slice every section out of `text` from a single left-to-right scan for headings.
+
+    Produces the same spans as searching each section with
+    `(?i)(heading|...)\s*([\s\S]+?)(?=(?:stop|...|$))`; the scan stops as soon
+    as every section's end is known.
+    """
+    n = len(text)
+    headings = _HeadingScanner(text)
+    sections = {}
+    for key, names in _SECTION_HEADINGS.items():
+        names = [w.lower() for w in names]
+        i, start = 0, None
+        while start is None and (heading := headings.get(i)) is not None:
+            offset, words = heading
+            for name in names:
+                # The lazy body needs at least one character after the heading
+                if name in words and offset + len(name) < n:
+                    start = offset + len(name)
+                    break
+            i += 1
+        if start is None:
+            continue
+
+        body_start = _LEADING_SPACE_RE.match(text, start).end()
+        if body_start == n:
+            # Only whitespace follows: the regex would give one whitespace character to the body
+            sections[key] = ""
+            continue
+        end = n - 1 if text.endswith("\n") and n - 1 > body_start else n
+        stops = {w.lower() for w in _SECTION_STOPS[key]}
+        while stops and (heading := headings.get(i)) is not None and heading[0] < end:
+            offset, words = heading
+            if offset > body_start and words & stops:
+                end = offset
+                break
+            i += 1
+        sections[key] = text[body_start:end]
+    return sections
+
 def extract_info_from_text(text):
     """Extract information from resume text with flexible patterns."""
     # Initialize default values
@@ -47,97 +154,174 @@ def extract_info_from_text(text):
     }
 
     # Name extraction (flexible for various formats)
-    name_patterns = [
-        r"(?i)(?:Md|Mr|Ms|Mrs)?\.?\s?([A-Z][a-z]+(?:\s[A-Z][a-z]+){1,4})",  # Standard name with 2-5 words
-        r"(?i)^[A-Z\s]+$",  # All caps name at the start (common in some resumes)
-        r"(?i)([A-Z][a-z]+\s[A-Z][a-z]+)"  # Simple two-word name
-    ]
-    for pattern in name_patterns:
-        name_match = re.search(pattern, text, re.MULTILINE)
+    for pattern in _NAME_PATTERNS:
+        name_match = pattern.search(text)
         if name_match:
             info["name"] = name_match.group(0).strip()
             break
 
     # Email extraction
-    email_pattern = r'[\w\.-]+@[\w\.-]+\.\w+'
-    email_match = re.search(email_pattern, text)
+    email_match = _EMAIL_RE.search(text)
     if email_match:
         info["email"] = email_match.group(0)
 
     # Phone number extraction (flexible for +880, spaces, or other formats)
-    phone_patterns = [
-        r'\+880\s?\d{10}',  # +880 followed by 10 digits
-        r'\b\d{11}\b',      # 11-digit number (common in Bangladesh)
-        r'\b\d{3}-\d{8}\b'  # Format like 017-7428256
-    ]
-    for pattern in phone_patterns:
-        phone_match = re.search(pattern, text)
+    for pattern in _PHONE_PATTERNS:
+        phone_match = pattern.search(text)
         if phone_match:
             info["phone"] = phone_match.group(0)
             break
 
     # LinkedIn and GitHub extraction
-    linkedin_pattern = r'https?://(?:www\.)?linkedin\.com/in/[^\s]+'
-    github_pattern = r'https?://github\.com/[^\s]+'
-    info["linkedin"] = re.search(linkedin_pattern, text).group(0) if re.search(linkedin_pattern, text) else "Not found"
-    info["github_profiles"] = list(set(re.findall(github_pattern, text)))
-
-    # Section headings (case-insensitive, multiple variations)
-    section_patterns = {
-        "education": r'(?i)(Education|Academic Background|Qualifications|Studies)\s*([\s\S]+?)(?=(?:Technical Skills|Skills|Experience|Projects|Achievements|Extracurricular|Certifications|Reference|$))',
-        "technical_skills": r'(?i)(Technical Skills|Skills|Technologies|Proficiencies)\s*([\s\S]+?)(?=(?:Experience|Projects|Achievements|Extracurricular|Certifications|Reference|$))',
-        "projects": r'(?i)(Projects|Notable Projects|Portfolio|Work)\s*([\s\S]+?)(?=(?:Achievements|Experience|Extracurricular|Certifications|Reference|$))',
-        "achievements": r'(?i)(Achievements|Awards|Honors|Accomplishments|Volunteering)\s*([\s\S]+?)(?=(?:Experience|Extracurricular|Certifications|Reference|$))',
-        "experience": r'(?i)(Experience|Work Experience|Professional Experience|Employment)\s*([\s\S]+?)(?=(?:Projects|Achievements|Extracurricular|Certifications|Reference|$))',
-        "reference": r'(?i)(Reference|References|Referees)\s*([\s\S]+?)(?=$)'
-    }
+    linkedin_match = _LINKEDIN_RE.search(text)
+    info["linkedin"] = linkedin_match.group(0) if linkedin_match else "Not found"
+    info["github_profiles"] = list(dict.fromkeys(_GITHUB_RE.findall(text)))
 
     # Extract sections
-    for key, pattern in section_patterns.items():
-        match = re.search(pattern, text)
-        if match:
-            info[key] = clean_text(match.group(2).strip())
-            if key == "projects":
-                info["projects"] = {
-                    "text": info[key],
-                    "links": info["github_profiles"]  # Use all GitHub links found in the document
-                }
+    for key, body in _segment_sections(text).items():
+        info[key] = clean_text(body.strip())
+        if key == "projects":
+            info["projects"] = {
+                "text": info[key],
+                "links": info["github_profiles"]  # Use all GitHub links found in the document
+            }
 
     return info
 
-def process_resumes(resume_files, base_dir):
-    """Process multiple resume files and save extracted info to JSON files."""
-    output_folder = os.path.join(base_dir, 'output')
+_SKILL_SPLIT_RE = re.compile(r"[,\|;\n•·]+")
+
+def split_skills(section):
+    """Split a technical skills section into individual entries."""
+    if not section or section == "Not found":
+        return []
+    return [s.strip(" \u200b") for s in _SKILL_SPLIT_RE.split(section) if s.strip(" \u200b_")]
+
+def parse_resume(file_path, backend=None, max_pages=None):
+    """Parse one resume PDF into the structured result shared by both APIs.
+
+    Contains every `extract_info_from_text` field plus `skills` (the technical
+    skills section split into entries), and the `backend` and `pages` used.
+    The name is taken from the first line of the raw text when there is one,
+    since layout is lost once the text is cleaned.
+    """
+    raw_text, backend, pages = pdf_extraction.extract_text(file_path, backend, max_pages=max_pages)
+    info = extract_info_from_text(clean_text(raw_text))
+    first_line = next((line.strip() for line in raw_text.splitlines() if line.strip()), None)
+    if first_line:
+        info["name"] = first_line
+    info["skills"] = split_skills(info["technical_skills"])
+    info["backend"] = backend
+    info["pages"] = pages
+    return info
+
+def _parse_resume_file(pdf_path):
+    """Worker entry point: parse one PDF, returning (path, info, error) instead of raising."""
+    try:
+        if not os.path.exists(pdf_path):
+            return pdf_path, None, "File not found"
+        # Not extract_text_from_pdf: it prints and swallows errors, which would hide the cause here
+        raw_text, _, _ = pdf_extraction.extract_text(pdf_path)
+        text = clean_text(raw_text)
+        if not text:
+            return pdf_path, None, "No text extracted"
+        return pdf_path, extract_info_from_text(text), None
+    except Exception as e:
+        return pdf_path, None, str(e)
+
+def output_path_for(pdf_path, output_folder):
+    """Path of the JSON file holding the extracted info for `pdf_path`."""
+    resume_file = os.path.basename(pdf_path)
+    return os.path.join(output_folder, f"extracted_info_{resume_file.replace('.pdf', '')}.json")
+
+def iter_resume_paths(resume_dir):
+    """Yield PDF paths in `resume_dir` lazily, so huge directories start processing immediately."""
+    with os.scandir(resume_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(".pdf"):
+                yield os.path.abspath(entry.path)
+
+def process_resumes_batch(pdf_paths, output_folder, workers=None, max_in_flight=None, verbose=True):
+    """Parse resumes in a process pool and write each JSON file as soon as it is ready.
+
+    `pdf_paths` may be any iterable (e.g. `iter_resume_paths`); at most
+    `max_in_flight` files are queued at once. Returns a summary with throughput
+    and the list of per-file failures.
+    """
     os.makedirs(output_folder, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    summary = {"processed": 0, "failed": [], "outputs": []}
+    started = time.perf_counter()
+
+    def fail(pdf_path, error):
+        summary["failed"].append({"file": pdf_path, "error": error})
+        if verbose:
+            print(f"Error processing {os.path.basename(pdf_path)}: {error}")
 
-    for resume_file in resume_files:
+    def handle(future):
+        pdf_path, info, error = future.result()
+        if error:
+            fail(pdf_path, error)
+            return
+        output_file_path = output_path_for(pdf_path, output_folder)
         try:
-            pdf_path = os.path.join(base_dir, 'resume', resume_file)
-            pdf_path = os.path.abspath(pdf_path)
-            
-            if not os.path.exists(pdf_path):
-                print(f"File not found: {pdf_path}")
-                continue
-
-            text = extract_text_from_pdf(pdf_path)
-            if not text:
-                print(f"No text extracted from {resume_file}")
-                continue
-
-            info = extract_info_from_text(text)
-            
-            # Save to JSON
-            output_file_name = f"extracted_info_{resume_file.replace('.pdf', '')}.json"
-            output_file_path = os.path.join(output_folder, output_file_name)
             with open(output_file_path, 'w', encoding='utf-8') as f:
                 json.dump(info, f, indent=4, ensure_ascii=False)
+        except (OSError, TypeError, ValueError) as e:
+            # One unwritable result must not abort the rest of the batch
+            fail(pdf_path, f"Could not write {output_file_path}: {e}")
+            return
+        summary["processed"] += 1
+        summary["outputs"].append(output_file_path)
+        if verbose:
             print(f"Extracted info saved to: {output_file_path}")
 
-        except Exception as e:
-            print(f"Error processing {resume_file}: {e}")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        for pdf_path in pdf_paths:
+            in_flight.add(pool.submit(_parse_resume_file, pdf_path))
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    handle(future)
+        for future in as_completed(in_flight):
+            handle(future)
+
+    elapsed = time.perf_counter() - started
+    total = summary["processed"] + len(summary["failed"])
+    summary["seconds"] = round(elapsed, 3)
+    summary["files_per_second"] = round(total / elapsed, 2) if elapsed > 0 else 0.0
+    summary["workers"] = workers
+    return summary
+
+def process_resumes(resume_files, base_dir):
+    """Process multiple resume files and save extracted info to JSON files."""
+    pdf_paths = [os.path.abspath(os.path.join(base_dir, 'resume', f)) for f in resume_files]
+    return process_resumes_batch(pdf_paths, os.path.join(base_dir, 'output'))
+
+def main(argv=None):
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Extract structured info from a directory or list of resume PDFs.")
+    parser.add_argument("inputs", nargs="*", default=[os.path.join(base_dir, "resume")],
+                        help="PDF files and/or directories of PDFs (default: ./resume)")
+    parser.add_argument("-o", "--output", default=os.path.join(base_dir, "output"), help="Directory for extracted_info_*.json")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only print the final summary")
+    args = parser.parse_args(argv)
+
+    def pdf_paths():
+        for item in args.inputs:
+            if os.path.isdir(item):
+                yield from iter_resume_paths(item)
+            else:
+                yield os.path.abspath(item)
+
+    summary = process_resumes_batch(pdf_paths(), args.output, workers=args.workers, verbose=not args.quiet)
+    print(f"Processed {summary['processed']} resumes, {len(summary['failed'])} failed, "
+          f"in {summary['seconds']}s ({summary['files_per_second']} files/s, {summary['workers']} workers)")
+    for failure in summary["failed"]:
+        print(f"  FAILED {failure['file']}: {failure['error']}")
+    return 1 if summary["failed"] else 0
 
-# === USAGE ===
-base_dir = os.path.dirname(os.path.abspath(__file__))
-resume_dir = os.path.join(base_dir, "resume")
-resume_files = [f for f in os.listdir(resume_dir) if f.lower().endswith(".pdf")]
-process_resumes(resume_files, base_dir)
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,34 @@
 # scraper.py (backend)
-from playwright.sync_api import sync_playwright
-import re
 import logging
 import time
 import os
-from fastapi import FastAPI, HTTPException, UploadFile, File
+import socket
+import asyncio
+import heapq
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks, Header
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List
-import pdfplumber
 import uvicorn
-import google.generativeai as genai
 from dotenv import load_dotenv
+from job_store import JobStore, DEFAULT_SEED_PATH
+from skill_index import SkillIndex
+from job_catalog import MappedCatalog
+import job_catalog
+from skill_matcher import SkillMatcher, SYNONYMS, DEFAULT_DICTIONARY_PATH
+from resume_cache import ResumeCache
+import resume_parser
+import uploads
+from advice import AdviceService, backend_from_env
+from tasks import DEFAULT_HEARTBEAT_SECONDS, DEFAULT_STALE_SECONDS, Task, TaskLog, TaskManager, QueueFullError, format_sse
+from shared_cache import SharedCache
+import crawler
+from browser_manager import BrowserManager
+import bulk_match
+import metrics
+from crawler import BASE_URL
 
 # Load environment variables from .env file
 load_dotenv()
@@ -20,42 +37,114 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Constants
-BASE_URL = "https://jobs.bdjobs.com/jobsearch.asp?fcatId=8&icatId="
-JOB_DETAILS_BASE = "https://jobs.bdjobs.com/jobdetails/"
 PROJECT_DIR = os.path.dirname(__file__)
 RESUME_OUTPUT_DIR = os.path.join(PROJECT_DIR, 'output')
 RESUME_DIR = os.path.join(PROJECT_DIR, 'resume')
 
+# Job catalog / ingestion settings
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", os.path.join(PROJECT_DIR, 'job_store.db'))
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", str(24 * 3600)))
+CRAWL_INTERVAL_SECONDS = int(os.getenv("CRAWL_INTERVAL_SECONDS", str(6 * 3600)))
+CRAWL_MAX_JOBS = int(os.getenv("CRAWL_MAX_JOBS", "50"))
+# Incremental crawls stop at the first listing page with nothing new, so postings behind it are not re-seen;
+# a full crawl this often re-reads the whole listing and extends their expiry before the TTL purges them
+CRAWL_FULL_INTERVAL_SECONDS = int(os.getenv("CRAWL_FULL_INTERVAL_SECONDS", str(JOB_TTL_SECONDS // 2)))
+RESUME_CACHE_DIR = os.getenv("RESUME_CACHE_DIR", os.path.join(PROJECT_DIR, 'cache', 'resumes'))
+RESUME_CACHE_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "5000"))
+RESUME_CACHE_MAX_BYTES = int(os.getenv("RESUME_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Bump when parse_pdf_resume or skill normalization changes so stale cache entries are ignored
+RESUME_PARSER_VERSION = "3"
+SKILL_DICTIONARY_PATH = os.getenv("SKILL_DICTIONARY_PATH", DEFAULT_DICTIONARY_PATH)
+ADVICE_CONCURRENCY = int(os.getenv("ADVICE_CONCURRENCY", "4"))
+ADVICE_CACHE_ENTRIES = int(os.getenv("ADVICE_CACHE_ENTRIES", "2048"))
+# First matching stage: jobs sharing fewer skills with the resume are pruned before full scoring,
+# results and advice (0 keeps every job), and at most MATCH_MAX_CANDIDATES go on (0: no limit)
+MATCH_MIN_OVERLAP = int(os.getenv("MATCH_MIN_OVERLAP", "1"))
+MATCH_MAX_CANDIDATES = int(os.getenv("MATCH_MAX_CANDIDATES", "100"))
+# Advice is generated eagerly only for the best N matches; the rest on request
+ADVICE_PREWARM_TOP_N = int(os.getenv("ADVICE_PREWARM_TOP_N", "2"))
+TASK_WORKERS = int(os.getenv("TASK_WORKERS", "4"))
+TASK_MAX_QUEUED = int(os.getenv("TASK_MAX_QUEUED", "100"))
+# Match tasks of a worker with no heartbeat for TASK_STALE_SECONDS are marked failed by the others
+TASK_STALE_SECONDS = int(os.getenv("TASK_STALE_SECONDS", str(DEFAULT_STALE_SECONDS)))
+TASK_HEARTBEAT_SECONDS = float(os.getenv("TASK_HEARTBEAT_SECONDS", str(DEFAULT_HEARTBEAT_SECONDS)))
+BULK_MATCH_MAX_RESUMES = int(os.getenv("BULK_MATCH_MAX_RESUMES", "5000"))
+CRAWL_REVALIDATE_SECONDS = int(os.getenv("CRAWL_REVALIDATE_SECONDS", str(crawler.DEFAULT_REVALIDATE_SECONDS)))
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", str(crawler.DEFAULT_CONCURRENCY)))
+# The shared browser is replaced after this many pages or once its processes exceed the RSS limit
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", "200"))
+BROWSER_MAX_RSS_MB = int(os.getenv("BROWSER_MAX_RSS_MB", "1024"))
+# Launch the browser at startup instead of on the first crawl
+BROWSER_PREWARM = os.getenv("BROWSER_PREWARM", "1") == "1"
+# Advice cache and match-task state shared by every worker process (see serve.py)
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", os.path.join(PROJECT_DIR, 'cache', 'shared.db'))
+SHARED_CACHE_MAX_ENTRIES = int(os.getenv("SHARED_CACHE_MAX_ENTRIES", "10000"))
+# A worker that dies mid-crawl blocks scheduled crawls by other workers for at most this long
+CRAWL_LEASE_SECONDS = int(os.getenv("CRAWL_LEASE_SECONDS", "3600"))
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+# Match against a memory-mapped catalog snapshot that every worker shares (rewritten after each crawl)
+# instead of a per-process in-memory index; empty keeps the in-memory index
+JOB_CATALOG_PATH = os.getenv("JOB_CATALOG_PATH", "")
+
 # Skill synonyms
-_SYNONYMS = {
-    "js": "javascript", "javascript": "javascript",
-    "react.js": "react", "reactjs": "react", "react": "react",
-    "nextjs": "next.js", "next": "next.js",
-    "nodejs": "node.js", "node": "node.js", "node.js": "node.js",
-    "mongodb": "mongodb", "mongo": "mongodb",
-    "postgres": "postgresql", "postgresql": "postgresql",
-    "mysql": "mysql",
-    "sql server": "mssql", "mssql": "mssql",
-    "redis": "redis",
-    "rest api": "rest", "restful api": "rest", "rest": "rest", "api": "api",
-    "graphql": "graphql",
-    "docker": "docker", "kubernetes": "kubernetes", "k8s": "kubernetes",
-    "cicd": "ci/cd", "ci/cd": "ci/cd",
-    "git": "git", "github": "github", "gitlab": "gitlab", "bitbucket": "bitbucket",
-    "tailwind": "tailwindcss", "tailwind css": "tailwindcss",
-    "aws": "aws", "gcp": "gcp", "google cloud": "gcp", "azure": "azure",
-    "linux": "linux", "bash": "bash",
-    "python": "python", "java": "java", "c++": "c++", "c#": "c#",
-    "dotnet": ".net", ".net": ".net",
-    "laravel": "laravel", "php": "php",
-    "vue": "vue.js", "vue.js": "vue.js",
-    "angular": "angular",
-    "selenium": "selenium", "cypress": "cypress", "appium": "appium",
-    "jmeter": "jmeter", "playwright": "playwright", "jest": "jest", "pytest": "pytest",
-    "wordpress": "wordpress",
-}
-
-app = FastAPI()
+skill_matcher = SkillMatcher.from_sources(SYNONYMS, SKILL_DICTIONARY_PATH)
+job_store = JobStore(JOB_STORE_PATH, ttl_seconds=JOB_TTL_SECONDS)
+# Cached parses hold normalized skills, so a dictionary change must miss the cache too
+resume_cache = ResumeCache(RESUME_CACHE_DIR, version=f"{RESUME_PARSER_VERSION}-{skill_matcher.version}",
+                           max_entries=RESUME_CACHE_MAX_ENTRIES, max_bytes=RESUME_CACHE_MAX_BYTES)
+_crawl_lock = asyncio.Lock()
+shared_cache = SharedCache(SHARED_CACHE_PATH, max_entries=SHARED_CACHE_MAX_ENTRIES)
+advice_service = AdviceService(concurrency=ADVICE_CONCURRENCY, cache_entries=ADVICE_CACHE_ENTRIES,
+                               shared=shared_cache)
+task_manager = TaskManager(workers=TASK_WORKERS, max_queued=TASK_MAX_QUEUED,
+                           log=TaskLog(SHARED_CACHE_PATH, worker_id=WORKER_ID), stale_seconds=TASK_STALE_SECONDS,
+                           heartbeat_seconds=TASK_HEARTBEAT_SECONDS)
+browsers = BrowserManager(concurrency=CRAWL_CONCURRENCY, max_pages=BROWSER_MAX_PAGES, max_rss_mb=BROWSER_MAX_RSS_MB)
+crawl_breaker = crawler.breaker_from_env()
+
+async def _ingestion_loop():
+    # Crawl right away only when there is nothing fresh to match against.
+    if job_store.count() > 0:
+        await asyncio.sleep(CRAWL_INTERVAL_SECONDS)
+    while True:
+        # Every worker process runs this loop; the last crawl time and the crawl lease keep it to one crawl
+        wait = _next_crawl_in()
+        if wait <= 0:
+            try:
+                await run_ingestion()
+            except Exception as e:
+                logging.error(f"Scheduled crawl failed: {e}")
+            wait = CRAWL_INTERVAL_SECONDS
+        await asyncio.sleep(wait)
+
+def _next_crawl_in() -> float:
+    last = job_store.get_meta("last_crawl")
+    if not last:
+        return 0
+    return last["started_at"] + CRAWL_INTERVAL_SECONDS - time.time()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if job_store.count(fresh_only=False) == 0:
+        seeded = job_store.seed_from_json(DEFAULT_SEED_PATH)
+        _normalize_jobs(job_store.jobs_needing_normalization(skill_matcher.version))
+        logging.info(f"Seeded job store with {seeded} jobs from {DEFAULT_SEED_PATH}")
+    if JOB_CATALOG_PATH and _mapped_catalog() is None:
+        _write_catalog()
+    task = asyncio.create_task(_ingestion_loop()) if CRAWL_INTERVAL_SECONDS > 0 else None
+    advice_service.backend = backend_from_env()
+    await task_manager.start()
+    uploads.start_workers()
+    if BROWSER_PREWARM:
+        await browsers.start()
+    yield
+    await task_manager.stop()
+    if task:
+        task.cancel()
+    await browsers.stop()
+    uploads.shutdown_workers()
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS
 app.add_middleware(
@@ -65,124 +154,200 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(uploads.MaxBodySizeMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
 
 # ---------------- Skill Helpers ----------------
-def _normalize_skill_token(tok: str) -> str:
-    t = tok.strip().lower().replace("+ +", "++").replace("react js", "react").replace("node js", "node.js")
-    t = t.replace("tailwindcss", "tailwind css").replace("postgre sql", "postgresql")
-    t = t.strip(".,;:·•")
-    return _SYNONYMS.get(t, t)
-
 def _tokenize_to_skills(value) -> set[str]:
-    if value is None:
-        return set()
-    if isinstance(value, list):
-        text = " , ".join(map(str, value))
-    else:
-        text = str(value)
-    parts = re.split(r"[,\|/;:\(\)\[\]\{\}·•\-\u2013\u2014\+\n\t]+", text, flags=re.IGNORECASE)
-    skills = {_normalize_skill_token(p) for p in parts if len(_normalize_skill_token(p)) >= 2}
-    noise = {"experience", "proficiency", "knowledge", "familiarity", "tools", "frameworks", "language", "technologies", "skills"}
-    return {s for s in skills if s not in noise}
+    return skill_matcher.extract(value)
 
 # ---------------- Resume Parsing ----------------
+def _resume_summary(parsed: dict) -> dict:
+    return {"name": parsed["name"], "technical_skills": parsed["skills"], "projects": parsed["projects"]["text"]}
+
 def parse_pdf_resume(file_path: str) -> dict:
     try:
-        text = ""
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-
-        lines = [line.strip() for line in text.splitlines() if line.strip()]
-        name = lines[0] if lines else "Unknown"
-
-        skills_section = ""
-        match = re.search(r"(?:Skills|Technical Skills)\s*[:\-]?\s*(.+?)(?:\n\n|\n[A-Z][a-z]|$)", text, re.IGNORECASE | re.DOTALL)
-        if match:
-            skills_section = match.group(1)
-        technical_skills = [s.strip() for s in re.split(r"[,\|;\n]+", skills_section) if s.strip()]
-
-        projects_section = ""
-        match_proj = re.search(r"(?:Projects|Project Experience)\s*[:\-]?\s*(.+?)(?:\n\n|\n[A-Z][a-z]|$)", text, re.IGNORECASE | re.DOTALL)
-        if match_proj:
-            projects_section = match_proj.group(1).strip()
-
-        return {"name": name, "technical_skills": technical_skills, "projects": projects_section}
+        return _resume_summary(resume_parser.parse_resume(file_path))
     except Exception as e:
         logging.error(f"Error parsing resume: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to parse resume: {str(e)}")
 
 # ---------------- Job Scraping ----------------
-def get_job_links(page, max_jobs=50):
-    try:
-        job_links = []
-        seen = set()
-        page.goto(BASE_URL, wait_until="domcontentloaded", timeout=60000)
-
-        while len(job_links) < max_jobs:
-            page.wait_for_selector('div.sout-jobs-wrapper', timeout=20000)
-            job_wrappers = page.query_selector_all('div.sout-jobs-wrapper')
-            for wrapper in job_wrappers:
-                if len(job_links) >= max_jobs:
-                    break
-                onclick = wrapper.get_attribute('onclick') or ''
-                match = re.search(r"DivOpen\('([^']+)',\d+,'([^']+)','([^']+)'\)", onclick)
-                if match:
-                    params, title, company = match.group(1), match.group(2), match.group(3)
-                    url = f"{JOB_DETAILS_BASE}?{params}"
-                    if url not in seen:
-                        seen.add(url)
-                        job_links.append({'url': url, 'title': title, 'company': company})
-            next_button = page.query_selector('a.prevnext:has-text("Next »")')
-            if not next_button:
-                break
-            next_button.click()
-            time.sleep(2)
-        return job_links[:max_jobs]
-    except Exception as e:
-        logging.error(f"Error scraping job links: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to scrape job links: {str(e)}")
-
-def get_job_skills_and_requirements(page, job_url):
-    try:
-        skills_list, requirements_list = [], []
-        page.goto(job_url, wait_until="domcontentloaded", timeout=60000)
-
-        # Skills
-        try:
-            page.wait_for_selector('#skills', timeout=5000)
-            skills_list = [b.inner_text().strip() for b in page.query_selector_all('#skills >> button')]
-        except:
-            logging.info(f"No skills found for {job_url}")
-
-        # Requirements
+async def crawl_jobs(max_jobs=CRAWL_MAX_JOBS, full: bool = False) -> dict:
+    return await crawler.crawl_incremental(job_store.known_jobs(), BASE_URL, max_jobs=max_jobs,
+                                           concurrency=CRAWL_CONCURRENCY, revalidate_after=CRAWL_REVALIDATE_SECONDS,
+                                           browsers=browsers, executor=crawler.executor_from_env(crawl_breaker),
+                                           full=full)
+
+def _full_crawl_due(now: float) -> bool:
+    return now - (job_store.get_meta("last_full_crawl") or 0) >= CRAWL_FULL_INTERVAL_SECONDS
+
+def _catalog_degraded() -> bool:
+    """Whether the last crawl was partial, so matches may miss postings it could not fetch."""
+    return bool((job_store.get_meta("last_crawl") or {}).get("degraded"))
+
+def _crawl_running() -> bool:
+    return _crawl_lock.locked() or job_store.lease_owner("crawl") is not None
+
+async def run_ingestion(max_jobs=CRAWL_MAX_JOBS) -> dict:
+    if _crawl_lock.locked():
+        return {"status": "already_running"}
+    async with _crawl_lock:
+        if not job_store.acquire_lease("crawl", WORKER_ID, CRAWL_LEASE_SECONDS):
+            return {"status": "already_running"}
         try:
-            page.wait_for_selector('#requirements', timeout=5000)
-            requirements_list = [el.inner_text().strip() for el in page.query_selector_all('#requirements li, #requirements p')]
-            if not requirements_list:
-                req_text = page.query_selector('#requirements').inner_text().strip()
-                requirements_list = [line.strip() for line in req_text.split("\n") if line.strip()]
-        except:
-            logging.info(f"No requirements found for {job_url}")
-
-        return skills_list, requirements_list
-    except Exception as e:
-        logging.error(f"Error scraping job details for {job_url}: {e}")
-        return [], []
+            return await _ingest(max_jobs)
+        finally:
+            job_store.release_lease("crawl", WORKER_ID)
+
+async def _ingest(max_jobs: int) -> dict:
+    started = time.time()
+    full = _full_crawl_due(started)
+    result = await crawl_jobs(max_jobs=max_jobs, full=full)
+    changed = job_store.upsert_jobs(result["jobs"])
+    job_store.touch_jobs(result["not_modified"], validated=True)
+    job_store.touch_jobs(result["unchanged"])
+    _normalize_jobs(job_store.jobs_needing_normalization(skill_matcher.version))
+    expired = job_store.purge_expired()
+    if JOB_CATALOG_PATH:
+        _write_catalog()
+    if full and result["failed"] == 0:
+        # A partial full crawl may not have re-seen everything; try again next time
+        job_store.set_meta("last_full_crawl", started)
+    summary = {
+        "status": "ok",
+        "full": full,
+        "started_at": started,
+        "duration_seconds": round(time.time() - started, 2),
+        "jobs_listed": result["listed"],
+        "jobs_fetched": len(result["jobs"]),
+        "jobs_changed": changed,
+        "jobs_not_modified": len(result["not_modified"]),
+        "jobs_unchanged": len(result["unchanged"]),
+        "jobs_expired": expired,
+        "pages_failed": result["failed"],
+        # Some pages failed for good: postings they would have added or refreshed are missing until the next crawl
+        "degraded": result["failed"] > 0,
+    }
+    job_store.set_meta("last_crawl", summary)
+    logging.info(f"Crawl finished: {summary}")
+    return summary
 
 def _extract_job_skillset(job: dict) -> set[str]:
-    skills = _tokenize_to_skills(job.get("skills", []))
-    req_text = " . ".join(job.get("requirements", []))
-    skills |= _tokenize_to_skills(req_text)
-    return skills
+    return skill_matcher.job_skills(job)
+
+_skill_names: dict[int, str] = {}
+
+def _normalize_jobs(jobs: list[dict]):
+    """Derive canonical skill sets for `jobs` and persist them as interned ids tagged with the matcher version."""
+    if not jobs:
+        return
+    with metrics.span("skill_normalize"):
+        skill_sets = {job["job_id"]: _extract_job_skillset(job) for job in jobs}
+    ids = job_store.intern_skills(set().union(*skill_sets.values()))
+    _skill_names.update((skill_id, name) for name, skill_id in ids.items())
+    packed = {job_id: sorted(ids[s] for s in skills) for job_id, skills in skill_sets.items()}
+    job_store.save_skill_sets(packed, skill_matcher.version)
+    for job in jobs:
+        job["skill_ids"], job["normalizer_version"] = packed[job["job_id"]], skill_matcher.version
+
+def _stored_skillset(job: dict) -> set[str]:
+    if any(skill_id not in _skill_names for skill_id in job["skill_ids"]):
+        _skill_names.update(job_store.skill_names())
+    return {_skill_names[skill_id] for skill_id in job["skill_ids"]}
 
 def _score_match(resume_skills: set[str], job_skills: set[str]) -> tuple[float, list[str]]:
     overlap = sorted(resume_skills & job_skills)
     score = len(overlap) / max(1, len(job_skills))
     return (round(score, 4), overlap)
 
+# ---------------- Skill Index ----------------
+_skill_index = SkillIndex()
+_indexed_jobs: dict[str, dict] = {}
+_index_expiry: list[tuple[float, str]] = []
+_index_cursor = 0
+
+def _sync_skill_index():
+    # Apply only what changed in the store since the last sync: new or changed postings are
+    # (re)indexed, re-seen ones get their new expiry, postings past their TTL are dropped.
+    global _index_cursor
+    now = time.time()
+    jobs = job_store.jobs_changed_since(_index_cursor, now=now)
+    # Skill sets come precomputed from the store; only ones from an older normalizer are redone (and saved)
+    _normalize_jobs([job for job in jobs if job["normalizer_version"] != skill_matcher.version])
+    for job in jobs:
+        indexed = _indexed_jobs.get(job["job_id"])
+        # Postings that were only re-seen keep their index entry; just their expiry moves
+        if indexed is None or indexed["content_hash"] != job["content_hash"]:
+            _skill_index.add_job(job["job_id"], _stored_skillset(job))
+        _indexed_jobs[job["job_id"]] = job
+        # One heap entry per distinct expiry; superseded ones are skipped when popped
+        if indexed is None or indexed["expires_at"] != job["expires_at"]:
+            heapq.heappush(_index_expiry, (job["expires_at"], job["job_id"]))
+        _index_cursor = max(_index_cursor, job["change_seq"])
+    if len(_index_expiry) > 2 * len(_indexed_jobs) + 64:
+        # Every re-crawl moves expiries; rebuild rather than let superseded entries pile up
+        _index_expiry[:] = [(job["expires_at"], job_id) for job_id, job in _indexed_jobs.items()]
+        heapq.heapify(_index_expiry)
+    while _index_expiry and _index_expiry[0][0] <= now:
+        expires_at, job_id = heapq.heappop(_index_expiry)
+        job = _indexed_jobs.get(job_id)
+        if job is not None and job["expires_at"] == expires_at:
+            _skill_index.remove_job(job_id)
+            del _indexed_jobs[job_id]
+
+# ---------------- Mapped Catalog ----------------
+_catalog: MappedCatalog | None = None
+_catalog_stat = None
+
+def _write_catalog():
+    """Snapshot the fresh postings into JOB_CATALOG_PATH; workers pick it up on their next request."""
+    jobs = job_store.fresh_jobs()
+    _normalize_jobs([job for job in jobs if job["normalizer_version"] != skill_matcher.version])
+    with metrics.span("catalog_write"):
+        job_catalog.write_catalog(JOB_CATALOG_PATH, jobs, [_stored_skillset(job) for job in jobs],
+                                  skill_matcher.version)
+
+def _mapped_catalog() -> MappedCatalog | None:
+    """The catalog snapshot, remapped when a newer file replaces it; None if missing or from another normalizer."""
+    global _catalog, _catalog_stat
+    try:
+        stat = os.stat(JOB_CATALOG_PATH)
+    except OSError:
+        return None
+    key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    if key != _catalog_stat:
+        # Requests still holding the previous mapping keep it until they finish
+        catalog = MappedCatalog(JOB_CATALOG_PATH)
+        _catalog_stat = key
+        _catalog = catalog if catalog.normalizer_version == skill_matcher.version else None
+        if _catalog is None:
+            logging.warning(f"{JOB_CATALOG_PATH} was built by another skill normalizer; using the in-memory index")
+    return _catalog
+
+def _matching_index() -> SkillIndex | MappedCatalog:
+    if JOB_CATALOG_PATH:
+        catalog = _mapped_catalog()
+        if catalog is not None:
+            return catalog
+    _sync_skill_index()
+    return _skill_index
+
+def _find_job(index: SkillIndex | MappedCatalog, job_id: str) -> dict | None:
+    if isinstance(index, MappedCatalog):
+        position = index.index_of(job_id)
+        job = index.job(position) if position is not None else None
+        return job if job is not None and job["expires_at"] > time.time() else None
+    return _indexed_jobs.get(job_id)
+
+def _catalog_jobs(index: SkillIndex | MappedCatalog) -> tuple[list[dict], list[set[str]]]:
+    """Every matchable posting and its skill set, in catalog order."""
+    if isinstance(index, MappedCatalog):
+        positions = index.indexes(now=time.time())
+        return [index.job(i) for i in positions], [set(index.skills_at(i)) for i in positions]
+    job_ids = index.job_ids()
+    return [_indexed_jobs[job_id] for job_id in job_ids], [set(index.job_skills(job_id)) for job_id in job_ids]
+
 # ---------------- API Models ----------------
 class ResumeInput(BaseModel):
     name: str
@@ -200,19 +365,31 @@ async def upload_resume(file: UploadFile = File(...)):
         if file.content_type != "application/pdf":
             raise HTTPException(status_code=400, detail="Only PDF files are allowed")
 
-        # Ensure output directory exists
-        os.makedirs(RESUME_DIR, exist_ok=True)
-        
-        # Save the uploaded PDF
-        save_path = os.path.join(RESUME_DIR, file.filename)
-        with open(save_path, "wb") as f:
-            f.write(await file.read())
-
-        # Parse resume
-        resume_data = parse_pdf_resume(save_path)
-
-        # Convert parsed skills to match /match-jobs input
-        normalized_skills = list(_tokenize_to_skills(resume_data["technical_skills"]) | _tokenize_to_skills(resume_data["projects"]))
+        # Stream the upload to disk (bounded memory, hashed on the fly)
+        temp_path, digest, _ = await uploads.stream_to_tempfile(file, RESUME_DIR)
+
+        # Same PDF seen before: skip saving and parsing entirely
+        cached = resume_cache.get(digest)
+        metrics.cache_requests.inc(cache="resume", result="miss" if cached is None else "hit")
+        if cached is not None:
+            os.unlink(temp_path)
+            resume_data, normalized_skills = cached["resume"], cached["normalized_skills"]
+        else:
+            # Parse the upload's own temp file in the worker pool so the event loop keeps serving other
+            # requests; it only takes the client's filename (shared by concurrent uploads) once parsed
+            try:
+                with metrics.span("pdf_parse"):
+                    parsed = await uploads.run_in_worker(resume_parser.parse_resume, temp_path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+            os.replace(temp_path, os.path.join(RESUME_DIR, uploads.safe_filename(file.filename)))
+            resume_data = _resume_summary(parsed)
+
+            # Convert parsed skills to match /match-jobs input
+            with metrics.span("skill_normalize"):
+                normalized_skills = sorted(_tokenize_to_skills(resume_data["technical_skills"]) | _tokenize_to_skills(resume_data["projects"]))
+            resume_cache.put(digest, {"resume": resume_data, "normalized_skills": normalized_skills})
 
         # Return in the exact format expected by /match-jobs
         match_jobs_input = {
@@ -222,80 +399,204 @@ async def upload_resume(file: UploadFile = File(...)):
         }
 
         return match_jobs_input
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error in upload_resume: {e}")
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
+@app.get("/metrics")
+def get_metrics():
+    return metrics.metrics_response()
+
+@app.post("/crawl", status_code=202)
+async def trigger_crawl(background_tasks: BackgroundTasks, max_jobs: int = CRAWL_MAX_JOBS):
+    if _crawl_running():
+        raise HTTPException(status_code=409, detail="A crawl is already running")
+    background_tasks.add_task(run_ingestion, max_jobs)
+    return {"status": "started", "max_jobs": max_jobs}
+
+@app.get("/crawl/status")
+def crawl_status():
+    return {
+        "running": _crawl_running(),
+        "fresh_jobs": job_store.count(),
+        "last_crawl": job_store.get_meta("last_crawl"),
+        "browser": browsers.stats(),
+    }
+
+def _rank_for_resume(resume: ResumeInput) -> tuple[set[str], list[tuple[dict, dict]]]:
+    with metrics.span("skill_normalize"):
+        resume_skills = _tokenize_to_skills(resume.technical_skills) | _tokenize_to_skills(resume.projects)
+    index = _matching_index()
+    if not len(index):
+        logging.warning("Job store has no fresh postings; trigger POST /crawl to refresh it.")
+    top_k, stats = MATCH_MAX_CANDIDATES or None, {}
+    with metrics.span("score"):
+        if isinstance(index, MappedCatalog):
+            ranked = index.score(resume_skills, top_k, MATCH_MIN_OVERLAP, stats, include_job=True)
+            ranking = [(r.pop("job"), r) for r in ranked]
+        else:
+            ranked = index.score(resume_skills, top_k, MATCH_MIN_OVERLAP, stats)
+            ranking = [(_indexed_jobs[r["job_id"]], r) for r in ranked]
+    metrics.match_candidates.inc(stats["catalog"] - stats["candidates"], outcome="pruned_overlap")
+    metrics.match_candidates.inc(stats["candidates"] - stats["scored"], outcome="pruned_top_k")
+    metrics.match_candidates.inc(stats["scored"], outcome="scored")
+    return resume_skills, ranking
+
+def _gap(index: SkillIndex | MappedCatalog, resume_skills: set[str], job_id: str) -> dict:
+    required = index.job_skills(job_id)
+    return {
+        "required_skills": required,
+        "matched_skills": [s for s in required if s in resume_skills],
+        "missing_skills": [s for s in required if s not in resume_skills],
+    }
+
+async def _advise(resume_skills: set[str], job: dict, ranked: dict) -> list[str]:
+    return await advice_service.advise(
+        resume_skills, job, ranked["required_skills"], ranked["matched_skills"], ranked["missing_skills"]
+    )
+
+def _prewarm_advice(resume_skills: set[str], ranking: list[tuple[dict, dict]], top_n: int) -> list[tuple[dict, dict]]:
+    """Kick off advice for the best `top_n` matches that share at least one skill."""
+    chosen = [(job, ranked) for job, ranked in ranking[:max(0, top_n)] if ranked["score"] > 0]
+    for job, ranked in chosen:
+        advice_service.prewarm(
+            resume_skills, job, ranked["required_skills"], ranked["matched_skills"], ranked["missing_skills"]
+        )
+    return chosen
+
+def _match_result(job: dict, ranked: dict, advice: list[str] | None) -> dict:
+    return {
+        "job_id": job["job_id"],
+        "title": job["title"],
+        "company": job["company"],
+        "url": job["url"],
+        "score": ranked["score"],
+        "matched_skills": ranked["matched_skills"],
+        "missing_skills": ranked["missing_skills"],
+        "required_skills": ranked["required_skills"],
+        "requirements": job.get("requirements", []),
+        # None until requested through /match-jobs/advice (or pre-warmed and finished)
+        "improvement_advice": advice
+    }
+
+def _cached_match_result(resume_skills: set[str], job: dict, ranked: dict) -> dict:
+    advice = advice_service.cached(resume_skills, ranked["required_skills"], ranked["missing_skills"])
+    return _match_result(job, ranked, advice)
+
 @app.post("/match-jobs")
-def match_jobs(resume: ResumeInput):
+async def match_jobs(resume: ResumeInput, prewarm: int = ADVICE_PREWARM_TOP_N):
+    """Ranked matches without waiting for the LLM; advice is filled in only where already cached."""
     try:
-        resume_skills = _tokenize_to_skills(resume.technical_skills) | _tokenize_to_skills(resume.projects)
-        resume_data = {"name": resume.name, "skills": resume_skills}
-
-        job_data = []
-        with sync_playwright() as p:
-            browser = p.firefox.launch(headless=True)
-            page = browser.new_page(user_agent="Mozilla/5.0")
-            job_links = get_job_links(page, max_jobs=10)
-            for job in job_links:
-                skills, requirements = get_job_skills_and_requirements(page, job["url"])
-                job_data.append({
-                    "title": job["title"],
-                    "company": job["company"],
-                    "url": job["url"],
-                    "skills": skills,
-                    "requirements": requirements
-                })
-                time.sleep(1)
-            browser.close()
-
-        results = []
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            logging.warning("GEMINI_API_KEY not set in .env file. Improvement advice will be empty.")
-
-        for job in job_data:
-            js = _extract_job_skillset(job)
-            score, overlap = _score_match(resume_data["skills"], js)
-            missing_skills = list(js - set(overlap))
-            advice = []
-            if api_key:
-                try:
-                    genai.configure(api_key=api_key)
-                    model = genai.GenerativeModel('gemini-1.5-flash')
-                    prompt = (
-                        f"User's resume skills: {', '.join(resume_skills)}\n\n"
-                        f"Job title: {job['title']}\n"
-                        f"Company: {job['company']}\n"
-                        f"Required skills extracted: {', '.join(js)}\n"
-                        f"Matched skills: {', '.join(overlap)}\n"
-                        f"Missing skills: {', '.join(missing_skills)}\n"
-                        f"Job requirements: {', '.join(job.get('requirements', []))}\n\n"
-                        "Provide 3-5 specific pieces of improvement advice to help the user's resume better match this job. "
-                        "Focus on how to acquire or highlight the missing skills."
-                    )
-                    response = model.generate_content(prompt)
-                    advice = [line.strip() for line in response.text.split('\n') if line.strip() and not line.startswith('#')]
-                    advice = advice[:5]  # Limit to 5 pieces of advice
-                except Exception as e:
-                    logging.error(f"Gemini API error for job {job['title']}: {e}")
-                    advice = []
-            results.append({
-                "title": job["title"],
-                "company": job["company"],
-                "url": job["url"],
-                "score": score,
-                "matched_skills": overlap,
-                "missing_skills": missing_skills,
-                "required_skills": list(js),
-                "requirements": job.get("requirements", []),
-                "improvement_advice": advice
-            })
-        results.sort(key=lambda x: x["score"], reverse=True)
-        return {"resume": resume.name, "matches": results}
+        resume_skills, ranking = _rank_for_resume(resume)
+        _prewarm_advice(resume_skills, ranking, prewarm)
+        results = [_cached_match_result(resume_skills, job, ranked) for job, ranked in ranking]
+        return {"resume": resume.name, "matches": results, "degraded": _catalog_degraded()}
     except Exception as e:
         logging.error(f"Error in match_jobs: {e}")
         raise HTTPException(status_code=500, detail=f"Match jobs failed: {str(e)}")
 
+class AdviceRequest(ResumeInput):
+    job_id: str
+
+@app.post("/match-jobs/advice")
+async def match_advice(request: AdviceRequest):
+    resume_skills = _tokenize_to_skills(request.technical_skills) | _tokenize_to_skills(request.projects)
+    index = _matching_index()
+    job = _find_job(index, request.job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job id")
+    ranked = _gap(index, resume_skills, request.job_id)
+    return {"job_id": request.job_id, "improvement_advice": await _advise(resume_skills, job, ranked)}
+
+class BulkMatchInput(BaseModel):
+    resumes: List[ResumeInput]
+    top_k: int = bulk_match.DEFAULT_TOP_K
+    candidates_per_job: int = bulk_match.DEFAULT_CANDIDATES_PER_JOB
+
+@app.post("/match-jobs/bulk")
+async def match_jobs_bulk(request: BulkMatchInput):
+    """Score many resumes against the whole catalog in one pass; no advice is generated."""
+    if len(request.resumes) > BULK_MATCH_MAX_RESUMES:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MATCH_MAX_RESUMES} resumes per call")
+    jobs, job_sets = _catalog_jobs(_matching_index())
+    resumes = [{"name": r.name} for r in request.resumes]
+    with metrics.span("skill_normalize"):
+        resume_sets = [_tokenize_to_skills(r.technical_skills) | _tokenize_to_skills(r.projects) for r in request.resumes]
+    # The matrix pass is CPU-bound; keep the event loop free while it runs
+    with metrics.span("score"):
+        result = await asyncio.to_thread(
+            bulk_match.bulk_match, resumes, resume_sets, jobs, job_sets,
+            max(0, request.top_k), max(0, request.candidates_per_job),
+        )
+    return {"jobs_scored": len(jobs), **result}
+
+# ---------------- Match Tasks ----------------
+async def _run_match_task(task: Task, resume: ResumeInput, prewarm: int) -> dict:
+    resume_skills, ranking = _rank_for_resume(resume)
+    chosen = _prewarm_advice(resume_skills, ranking, prewarm)
+    await task.advance(done=0, total=len(ranking) + len(chosen))
+    matches = {}
+    for job, ranked in ranking:
+        result = matches[job["job_id"]] = _cached_match_result(resume_skills, job, ranked)
+        # Matches arrive in ranking order, so clients can render each card as it is emitted
+        await task.emit("match", result)
+        await task.advance()
+    for job, ranked in chosen:
+        advice = matches[job["job_id"]]["improvement_advice"] = await _advise(resume_skills, job, ranked)
+        await task.emit("advice", {"job_id": job["job_id"], "improvement_advice": advice})
+        await task.advance()
+    return {"resume": resume.name, "matches": list(matches.values()), "degraded": _catalog_degraded()}
+
+def _get_task(task_id: str) -> Task:
+    task = task_manager.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Unknown task id")
+    return task
+
+@app.post("/match-jobs/tasks", status_code=202)
+async def submit_match_task(resume: ResumeInput, prewarm: int = ADVICE_PREWARM_TOP_N):
+    try:
+        task = task_manager.submit("match-jobs", _run_match_task, resume, prewarm)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"Too many pending match tasks: {e}")
+    return {
+        "task_id": task.id,
+        "status": task.status,
+        "status_url": f"/match-jobs/tasks/{task.id}",
+        "events_url": f"/match-jobs/tasks/{task.id}/events",
+    }
+
+@app.get("/match-jobs/tasks/{task_id}")
+async def get_match_task(task_id: str):
+    task = _get_task(task_id)
+    snapshot = task.snapshot()
+    # While running, expose the matches scored so far
+    if not task.finished:
+        matches = {}
+        for e in task.events:
+            if e["event"] == "match":
+                matches[e["data"]["job_id"]] = dict(e["data"])
+            elif e["event"] == "advice":
+                matches[e["data"]["job_id"]]["improvement_advice"] = e["data"]["improvement_advice"]
+        snapshot["result"] = {"matches": list(matches.values())}
+    return snapshot
+
+@app.get("/match-jobs/tasks/{task_id}/events")
+async def stream_match_task(task_id: str, last_event_id: str | None = Header(default=None)):
+    task = _get_task(task_id)
+    start_after = int(last_event_id) if last_event_id and last_event_id.isdigit() else -1
+
+    async def event_source():
+        async for event in task.stream(start_after):
+            yield format_sse(event)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 if __name__ == "__main__":
     uvicorn.run("scraper:app", host="127.0.0.1", port=5001, reload=True)
\ No newline at end of file
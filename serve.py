@@ -0,0 +1,70 @@
+"""Production entry point: run an app under several uvicorn worker processes.
+
+Usage: python serve.py [scraper|main] [--workers N] [--host HOST] [--port PORT]
+
+Workers share state through local files rather than memory: the job catalog
+(JOB_STORE_PATH), the parsed-resume cache (RESUME_CACHE_DIR) and, for the
+scraper app, the advice cache and match-task log (SHARED_CACHE_PATH). A match
+task submitted to one worker can be polled or streamed from any other, and
+only one worker at a time holds the crawl lease. Every worker must see the
+same paths (the defaults do).
+
+With more than one worker, /metrics would only describe whichever worker
+answered, so each worker snapshots its metrics into METRICS_MULTIPROC_DIR
+(a fresh temporary directory unless set) and /metrics sums all of them.
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+
+import uvicorn
+
+DEFAULT_PORTS = {"scraper": 5001, "main": 5000}
+
+
+def default_workers() -> int:
+    return int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+
+
+def configure_workers(workers: int):
+    """Defaults that keep N workers from oversubscribing the host; explicit env settings win."""
+    cpus = os.cpu_count() or 1
+    # Each worker has its own PDF parsing pool; split the cores between them
+    os.environ.setdefault("PARSE_WORKERS", str(max(1, cpus // workers)))
+    if workers > 1:
+        # One browser per worker would multiply memory; launch lazily, so only the worker that crawls starts one
+        os.environ.setdefault("BROWSER_PREWARM", "0")
+        # Snapshots left by an earlier run would be summed into this one's totals
+        if not os.getenv("METRICS_MULTIPROC_DIR"):
+            os.environ["METRICS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="metrics-")
+        metrics_dir = os.environ["METRICS_MULTIPROC_DIR"]
+        os.makedirs(metrics_dir, exist_ok=True)
+        with os.scandir(metrics_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json"):
+                    os.unlink(entry.path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("app", nargs="?", choices=sorted(DEFAULT_PORTS), default="scraper")
+    parser.add_argument("--workers", type=int, default=default_workers(),
+                        help="Worker processes (default: $WEB_CONCURRENCY or the CPU count)")
+    parser.add_argument("--host", default=os.getenv("HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    workers = max(1, args.workers)
+    configure_workers(workers)
+    port = args.port or DEFAULT_PORTS[args.app]
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logging.info(f"Serving {args.app}:app on {args.host}:{port} with {workers} worker(s)")
+    uvicorn.run(f"{args.app}:app", host=args.host, port=port, workers=workers, log_level=args.log_level)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
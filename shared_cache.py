@@ -0,0 +1,107 @@
+# shared_cache.py
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+PROJECT_DIR = os.path.dirname(__file__)
+DEFAULT_PATH = os.path.join(PROJECT_DIR, 'cache', 'shared.db')
+DEFAULT_MAX_ENTRIES = 10000
+# A hit only rewrites an entry's accessed_at once it is this stale, so hot keys don't take the write lock per read
+DEFAULT_TOUCH_INTERVAL_SECONDS = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS entries_lru ON entries (namespace, accessed_at);
+"""
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """SQLite connection for state shared between worker processes (WAL, waits on writer locks)."""
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+    conn.row_factory = sqlite3.Row
+    if path != ":memory:":
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class SharedCache:
+    """JSON key/value cache in one SQLite file, shared by every worker process on the host.
+
+    Entries live in namespaces, each bounded to `max_entries` with least
+    recently used eviction (recency is tracked to within `touch_interval`
+    seconds). Callers keep their own small in-memory LRU in front of it; this is the layer that saves other workers the recomputation.
+    Errors are logged and treated as misses so a locked or broken file never
+    fails a request.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 touch_interval: float = DEFAULT_TOUCH_INTERVAL_SECONDS):
+        self.path = path
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._writes = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get(self, namespace: str, key: str):
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, accessed_at FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+                ).fetchone()
+                if row is None:
+                    return None
+                now = time.time()
+                if now - row["accessed_at"] >= self.touch_interval:
+                    self._conn.execute("UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                                       (now, namespace, key))
+                    self._conn.commit()
+            return json.loads(row["value"])
+        except (sqlite3.Error, ValueError) as e:
+            logging.warning(f"Shared cache read failed ({namespace}): {e}")
+            return None
+
+    def put(self, namespace: str, key: str, value):
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT INTO entries (namespace, key, value, accessed_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(namespace, key) DO UPDATE SET value=excluded.value, accessed_at=excluded.accessed_at",
+                    (namespace, key, json.dumps(value, ensure_ascii=False), time.time()),
+                )
+                self._writes += 1
+                # Trimming scans the namespace, so only do it every so often
+                if self._writes % 100 == 0:
+                    self._evict(namespace)
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"Shared cache write failed ({namespace}): {e}")
+
+    def count(self, namespace: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries WHERE namespace = ?", (namespace,)).fetchone()[0]
+
+    def _evict(self, namespace: str):
+        self._conn.execute(
+            "DELETE FROM entries WHERE namespace = ? AND key IN (SELECT key FROM entries WHERE namespace = ? "
+            "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (namespace, namespace, self.max_entries),
+        )
@@ -0,0 +1,122 @@
+# skill_index.py
+import heapq
+from collections import Counter
+
+
+class SkillIndex:
+    """Inverted index (skill -> job ids) over a catalog of per-job canonical skill sets.
+
+    Scores are identical to `scraper._score_match`: overlap size divided by the
+    size of the job's skill set, rounded to 4 places. Jobs can be added, replaced
+    or removed one at a time, so the index never has to be rebuilt from scratch.
+    """
+
+    def __init__(self):
+        self._vocab: dict[str, int] = {}
+        self._skills: list[str] = []
+        self._postings: dict[int, set[str]] = {}
+        self._job_skills: dict[str, frozenset[int]] = {}
+        self._job_seq: dict[str, int] = {}
+        self._next_seq = 0
+
+    def __len__(self):
+        return len(self._job_skills)
+
+    def __contains__(self, job_id):
+        return job_id in self._job_skills
+
+    def skill_id(self, skill: str) -> int:
+        sid = self._vocab.get(skill)
+        if sid is None:
+            sid = self._vocab[skill] = len(self._skills)
+            self._skills.append(skill)
+        return sid
+
+    def add_job(self, job_id: str, skills: set[str]):
+        """Index `job_id`; re-adding an existing id replaces it and moves it to the end of catalog order."""
+        self.remove_job(job_id)
+        self._job_seq[job_id] = self._next_seq
+        self._next_seq += 1
+        ids = frozenset(self.skill_id(s) for s in skills)
+        self._job_skills[job_id] = ids
+        for sid in ids:
+            self._postings.setdefault(sid, set()).add(job_id)
+
+    def remove_job(self, job_id: str):
+        if job_id in self._job_skills:
+            self._unlink(job_id)
+            del self._job_skills[job_id]
+            del self._job_seq[job_id]
+
+    def job_ids(self) -> list[str]:
+        """Indexed job ids in catalog order (the order used to break score ties)."""
+        return list(self._job_skills)
+
+    def job_skills(self, job_id: str) -> list[str]:
+        return sorted(self._skills[sid] for sid in self._job_skills[job_id])
+
+    def overlap_counts(self, resume_skills: set[str]) -> Counter:
+        """Number of shared skills per job, for every job sharing at least one skill."""
+        counts = Counter()
+        for skill in resume_skills:
+            sid = self._vocab.get(skill)
+            if sid is not None:
+                counts.update(self._postings.get(sid, ()))
+        return counts
+
+    def score(self, resume_skills: set[str], top_k: int | None = None, min_overlap: int = 0,
+              stats: dict | None = None) -> list[dict]:
+        """Rank the catalog for one resume.
+
+        Returns up to `top_k` (default: all) results ordered by score, ties
+        broken by insertion order, each with matched and missing skill lists.
+        With `min_overlap`, jobs sharing fewer skills with the resume are
+        dropped before scoring instead of padding the tail. If given, `stats`
+        is filled with the job counts at each stage (catalog, candidates, scored).
+        """
+        counts = self.overlap_counts(resume_skills)
+        # Only jobs found through the inverted index can reach the threshold; the rest are never looked at
+        candidates = [job_id for job_id, n in counts.items() if n >= min_overlap] if min_overlap > 0 else counts
+
+        def rank_key(job_id):
+            return (self._score(counts.get(job_id, 0), job_id), -self._job_seq[job_id])
+
+        if top_k is not None and len(candidates) >= top_k:
+            ranked = heapq.nlargest(top_k, candidates, key=rank_key)
+        else:
+            ranked = sorted(candidates, key=rank_key, reverse=True)
+            # Pad with zero-overlap jobs in catalog order
+            limit = len(self._job_skills) if top_k is None else top_k
+            for job_id in self._job_skills if min_overlap <= 0 else ():
+                if len(ranked) >= limit:
+                    break
+                if job_id not in counts:
+                    ranked.append(job_id)
+        if stats is not None:
+            stats.update(catalog=len(self._job_skills),
+                         candidates=len(candidates) if min_overlap > 0 else len(self._job_skills),
+                         scored=len(ranked))
+
+        results = []
+        for job_id in ranked:
+            required = self.job_skills(job_id)
+            matched = [s for s in required if s in resume_skills]
+            results.append({
+                "job_id": job_id,
+                "score": self._score(counts.get(job_id, 0), job_id),
+                "matched_skills": matched,
+                "missing_skills": [s for s in required if s not in resume_skills],
+                "required_skills": required,
+            })
+        return results
+
+    def _score(self, overlap: int, job_id: str) -> float:
+        return round(overlap / max(1, len(self._job_skills[job_id])), 4)
+
+    def _unlink(self, job_id: str):
+        for sid in self._job_skills[job_id]:
+            postings = self._postings.get(sid)
+            if postings is not None:
+                postings.discard(job_id)
+                if not postings:
+                    del self._postings[sid]
@@ -0,0 +1,157 @@
+# skill_matcher.py
+import hashlib
+import json
+import logging
+import os
+import re
+
+DEFAULT_DICTIONARY_PATH = os.path.join(os.path.dirname(__file__), "skill_dictionary.json")
+# Bump when the matching rules change; dictionary changes are picked up by `SkillMatcher.version` itself
+MATCHER_REVISION = "1"
+
+# Built-in aliases; skill_dictionary.json extends them
+SYNONYMS = {
+    "js": "javascript", "javascript": "javascript",
+    "react.js": "react", "reactjs": "react", "react": "react",
+    "nextjs": "next.js", "next": "next.js",
+    "nodejs": "node.js", "node": "node.js", "node.js": "node.js",
+    "mongodb": "mongodb", "mongo": "mongodb",
+    "postgres": "postgresql", "postgresql": "postgresql",
+    "mysql": "mysql",
+    "sql server": "mssql", "mssql": "mssql",
+    "redis": "redis",
+    "rest api": "rest", "restful api": "rest", "rest": "rest", "api": "api",
+    "graphql": "graphql",
+    "docker": "docker", "kubernetes": "kubernetes", "k8s": "kubernetes",
+    "cicd": "ci/cd", "ci/cd": "ci/cd",
+    "git": "git", "github": "github", "gitlab": "gitlab", "bitbucket": "bitbucket",
+    "tailwind": "tailwindcss", "tailwind css": "tailwindcss",
+    "aws": "aws", "gcp": "gcp", "google cloud": "gcp", "azure": "azure",
+    "linux": "linux", "bash": "bash",
+    "python": "python", "java": "java", "c++": "c++", "c#": "c#",
+    "dotnet": ".net", ".net": ".net",
+    "laravel": "laravel", "php": "php",
+    "vue": "vue.js", "vue.js": "vue.js",
+    "angular": "angular",
+    "selenium": "selenium", "cypress": "cypress", "appium": "appium",
+    "jmeter": "jmeter", "playwright": "playwright", "jest": "jest", "pytest": "pytest",
+    "wordpress": "wordpress",
+}
+
+# Separators inside a skill-list entry ("Java/Kotlin", "React | Redux")
+_LIST_SPLIT_RE = re.compile(r"[,\|/;:\(\)\[\]\{\}·•\-–—\+\n\t]+")
+_SPACE_RE = re.compile(r"\s+")
+_STRIP_CHARS = ".,;:·•"
+_NOISE = frozenset({"experience", "proficiency", "knowledge", "familiarity", "tools", "frameworks",
+                    "language", "technologies", "skills"})
+# Punctuation that never belongs to a skill name; ".", "+" and "#" do (node.js, c++, c#, .net)
+_WORD_SEPARATORS = str.maketrans({c: " " for c in ",;:()[]{}<>|!?\"'`/\\-–—·•*\n\t\r"})
+
+
+def _alias_key(alias: str) -> str:
+    return _SPACE_RE.sub(" ", alias.strip().lower())
+
+
+def _words(text: str) -> list[str]:
+    """Lower-cased words with separators removed; a sentence-final "." is dropped ("Node.js." -> "node.js")."""
+    return (text.lower().translate(_WORD_SEPARATORS) + " ").replace(". ", " ").split()
+
+
+class SkillMatcher:
+    """Find canonical skill names in free text.
+
+    The alias dictionary is compiled once into a hash of single-word aliases and
+    a table of multi-word phrases. Matching is one pass of C-level string
+    operations (translate, split, set intersection) over the text, plus a
+    substring check for each phrase whose words all occur; phrases win over the
+    words inside them ("react native" does not also yield "react").
+
+    `aliases` maps a lower-case alias to its canonical skill. Aliases listed in
+    `exact_only` are ordinary words in prose ("next", "rest", "excel") and are
+    only recognised when they make up a whole skill-list entry.
+    """
+
+    def __init__(self, aliases: dict[str, str], exact_only=()):
+        self.aliases = {_alias_key(a): c for a, c in aliases.items()}
+        self.exact_only = frozenset(_alias_key(a) for a in exact_only)
+        self._unigrams: dict[str, str] = {}
+        phrases: dict[str, str] = {}
+        for alias, canonical in self.aliases.items():
+            if alias in self.exact_only:
+                continue
+            words = _words(alias)
+            if len(words) == 1:
+                self._unigrams[words[0]] = canonical
+            elif words:
+                phrases[" ".join(words)] = canonical
+        self._phrases = [(f" {p} ", frozenset(p.split()), c) for p, c in phrases.items()]
+        self._phrase_words = frozenset().union(*(words for _, words, _ in self._phrases))
+        fingerprint = json.dumps([sorted(self.aliases.items()), sorted(self.exact_only)], ensure_ascii=False)
+        # Identifies the normalizer output; stored skill sets with another version are stale
+        self.version = f"{MATCHER_REVISION}-{hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:12]}"
+
+    @classmethod
+    def from_sources(cls, synonyms: dict[str, str], path: str | None = DEFAULT_DICTIONARY_PATH):
+        """Build from a synonym map plus a dictionary file of {"skills": {canonical: [aliases]}, "exact_only": [...]}."""
+        aliases = dict(synonyms)
+        exact_only = []
+        if path:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                for canonical, names in data.get("skills", {}).items():
+                    aliases[canonical] = canonical
+                    for name in names:
+                        aliases[name] = canonical
+                exact_only = data.get("exact_only", [])
+            except (OSError, ValueError) as e:
+                logging.warning(f"Could not load skill dictionary {path}: {e}")
+        return cls(aliases, exact_only)
+
+    def canonical(self, token: str) -> str:
+        """Canonical name for one skill-list entry; unknown entries are returned cleaned but kept."""
+        key = _alias_key(token).strip(_STRIP_CHARS).strip()
+        return self.aliases.get(key, key)
+
+    def find(self, text: str) -> set[str]:
+        """Canonical skills mentioned anywhere in `text`."""
+        words = _words(text)
+        present = set(words)
+        single = present & self._unigrams.keys()
+        found = set()
+        if not present.isdisjoint(self._phrase_words):
+            joined = None
+            matched = []
+            for phrase, phrase_words, canonical in self._phrases:
+                if phrase_words <= present:
+                    joined = joined or " " + " ".join(words) + " "
+                    if phrase in joined:
+                        found.add(canonical)
+                        matched.append((phrase, phrase_words))
+            # A word that only ever occurs inside matched phrases is not a skill of its own
+            # ("react native" should not also yield "react")
+            for word in single & {w for _, phrase_words in matched for w in phrase_words}:
+                inside = sum(joined.count(phrase) for phrase, phrase_words in matched if word in phrase_words)
+                if joined.count(f" {word} ") <= inside:
+                    single.discard(word)
+        found.update(self._unigrams[w] for w in single)
+        return found
+
+    def extract(self, value) -> set[str]:
+        """Skills from a skill list (entries are kept even if unknown) or from free text (dictionary hits only)."""
+        if value is None:
+            return set()
+        if not isinstance(value, list):
+            return self.find(str(value))
+        skills = set()
+        for item in map(str, value):
+            skills |= self.find(item)
+            for part in _LIST_SPLIT_RE.split(item):
+                skill = self.canonical(part)
+                if len(skill) >= 2 and skill not in _NOISE:
+                    skills.add(skill)
+        return skills
+
+    def job_skills(self, job: dict) -> set[str]:
+        """Canonical skill set of a job posting: its skill tags plus skills named in the requirements."""
+        return self.extract(job.get("skills", [])) | self.extract(" . ".join(job.get("requirements", [])))
@@ -0,0 +1,409 @@
+# tasks.py
+import asyncio
+import atexit
+import json
+import logging
+import os
+import queue
+import socket
+import time
+import sqlite3
+import threading
+import uuid
+
+import shared_cache
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_QUEUED = 100
+DEFAULT_RETENTION_SECONDS = 3600
+# An unfinished task whose worker has not sent a heartbeat for this long is presumed orphaned by a dead worker
+DEFAULT_STALE_SECONDS = 900
+# How often a TaskManager renews its worker's heartbeat (and purges and expires the shared log)
+DEFAULT_HEARTBEAT_SECONDS = 30
+STALE_ERROR = "worker stopped before the task finished"
+# How often a stream of a task run by another worker process checks the shared log
+POLL_SECONDS = 0.25
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    progress TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL,
+    owner TEXT
+);
+CREATE TABLE IF NOT EXISTS task_workers (
+    worker_id TEXT PRIMARY KEY,
+    heartbeat_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS task_events (
+    task_id TEXT NOT NULL,
+    event_id INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (task_id, event_id)
+);
+"""
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class Task:
+    """State of one background job; `emit` appends an event that pollers and SSE streams can see."""
+
+    def __init__(self, kind: str, log=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued"
+        self.created_at = time.time()
+        self.finished_at = None
+        self.progress = {"done": 0, "total": None}
+        self.result = None
+        self.error = None
+        self.events: list[dict] = []
+        self._log = log
+        self._changed = asyncio.Condition()
+        self._record()
+
+    async def emit(self, event: str, data):
+        async with self._changed:
+            self.events.append({"id": len(self.events), "event": event, "data": data})
+            self._record(self.events[-1])
+            self._changed.notify_all()
+
+    async def finish(self, result=None, error: str | None = None):
+        """Record the outcome and emit the final `done` / `failed` event in one step."""
+        async with self._changed:
+            self.result, self.error = result, error
+            self.status = "failed" if error is not None else "done"
+            self.finished_at = time.time()
+            payload = {"error": error} if error is not None else result
+            self.events.append({"id": len(self.events), "event": self.status, "data": payload})
+            self._record(self.events[-1])
+            self._changed.notify_all()
+
+    def start(self):
+        self.status = "running"
+        self._record()
+
+    async def advance(self, done: int | None = None, total: int | None = None):
+        if total is not None:
+            self.progress["total"] = total
+        self.progress["done"] = self.progress["done"] + 1 if done is None else done
+        await self.emit("progress", dict(self.progress))
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def snapshot(self) -> dict:
+        return {
+            "task_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+        }
+
+    async def stream(self, last_event_id: int = -1):
+        """Yield events after `last_event_id` as they arrive, until the task has finished."""
+        next_id = last_event_id + 1
+        while True:
+            async with self._changed:
+                while next_id >= len(self.events) and not self.finished:
+                    await self._changed.wait()
+                pending = self.events[next_id:]
+                finished = self.finished
+            for event in pending:
+                yield event
+            next_id += len(pending)
+            if finished and next_id >= len(self.events):
+                return
+
+    def _record(self, event: dict | None = None):
+        if self._log is not None:
+            self._log.record(self, event)
+
+
+class StoredTask:
+    """Read-only view of a task run by another worker process, loaded from the shared TaskLog."""
+
+    def __init__(self, log, row: sqlite3.Row, events: list[dict]):
+        self._log = log
+        self.id = row["task_id"]
+        self.kind = row["kind"]
+        self.status = row["status"]
+        self.created_at = row["created_at"]
+        self.finished_at = row["finished_at"]
+        self.progress = json.loads(row["progress"])
+        self.result = json.loads(row["result"]) if row["result"] is not None else None
+        self.error = row["error"]
+        self.events = events
+
+    finished = Task.finished
+    snapshot = Task.snapshot
+
+    async def stream(self, last_event_id: int = -1):
+        """Like Task.stream, polling the shared log for new events."""
+        next_id = last_event_id + 1
+        while True:
+            finished = self._log.status(self.id) in ("done", "failed")
+            for event in self._log.events(self.id, after=next_id - 1):
+                yield event
+                next_id = event["id"] + 1
+            if finished:
+                return
+            await asyncio.sleep(POLL_SECONDS)
+
+
+class TaskLog:
+    """Task state and events in a SQLite file, so any worker process can report on any task.
+
+    `record` only queues the write: a background thread commits whatever has
+    queued up in one transaction, so the event loop never waits on SQLite.
+    Each task records `worker_id` as its owner; `heartbeat` tells the other
+    processes that this worker, and so its tasks, are still alive.
+    """
+
+    def __init__(self, path: str = shared_cache.DEFAULT_PATH, worker_id: str | None = None):
+        self.path = path
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._lock = threading.Lock()
+        self._writes: queue.Queue = queue.Queue()
+        self._conn = shared_cache.connect(path)
+        self._conn.executescript(_SCHEMA)
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        for name, kind in (("updated_at", "REAL"), ("owner", "TEXT")):
+            if name in columns:
+                continue
+            try:
+                self._conn.execute(f"ALTER TABLE tasks ADD COLUMN {name} {kind}")
+            except sqlite3.OperationalError as e:
+                # Another worker process opening the same file added it first
+                if "duplicate column" not in str(e):
+                    raise
+        self._conn.commit()
+        self._writer = threading.Thread(target=self._write_loop, name="task-log-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def close(self):
+        if self._writer.is_alive():
+            self._writes.put(None)
+            self._writer.join()
+        with self._lock:
+            self._conn.close()
+
+    def flush(self):
+        """Wait until every recorded change has been committed."""
+        if self._writer.is_alive():
+            self._writes.join()
+
+    def record(self, task: Task, event: dict | None = None):
+        """Save the task's current state, plus `event` if given (asynchronously; see `flush`)."""
+        # Serialized now, so the write reflects the task as it is at this call
+        row = (task.id, task.kind, task.status, task.created_at, task.finished_at, json.dumps(task.progress),
+               json.dumps(task.result, ensure_ascii=False) if task.result is not None else None, task.error,
+               time.time(), self.worker_id)
+        event_row = None if event is None else (
+            task.id, event["id"], event["event"], json.dumps(event["data"], ensure_ascii=False))
+        self._writes.put((row, event_row))
+
+    def _write_loop(self):
+        while True:
+            batch = [self._writes.get()]
+            while True:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+            writes = [item for item in batch if item is not None]
+            try:
+                with self._lock:
+                    for row, event_row in writes:
+                        self._conn.execute(
+                            "INSERT INTO tasks (task_id, kind, status, created_at, finished_at, progress, result, "
+                            "error, updated_at, owner) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(task_id) DO "
+                            "UPDATE SET status=excluded.status, finished_at=excluded.finished_at, "
+                            "progress=excluded.progress, result=excluded.result, error=excluded.error, "
+                            "updated_at=excluded.updated_at, owner=excluded.owner", row)
+                        if event_row is not None:
+                            self._conn.execute("INSERT OR REPLACE INTO task_events (task_id, event_id, event, data) "
+                                               "VALUES (?, ?, ?, ?)", event_row)
+                    self._conn.commit()
+            except sqlite3.Error as e:
+                task_ids = sorted({row[0] for row, _ in writes})
+                logging.warning(f"Could not record task(s) {', '.join(task_ids)}: {e}")
+            finally:
+                for _ in batch:
+                    self._writes.task_done()
+            if len(writes) < len(batch):
+                return
+
+    def load(self, task_id: str) -> StoredTask | None:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return StoredTask(self, row, self.events(task_id)) if row else None
+
+    def status(self, task_id: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return row["status"] if row else None
+
+    def events(self, task_id: str, after: int = -1) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT event_id, event, data FROM task_events WHERE task_id = ? AND event_id > ? ORDER BY event_id",
+                (task_id, after),
+            ).fetchall()
+        return [{"id": r["event_id"], "event": r["event"], "data": json.loads(r["data"])} for r in rows]
+
+    def purge(self, cutoff: float):
+        """Drop tasks that finished before `cutoff`."""
+        with self._lock:
+            self._conn.execute("DELETE FROM task_events WHERE task_id IN "
+                               "(SELECT task_id FROM tasks WHERE finished_at < ?)", (cutoff,))
+            self._conn.execute("DELETE FROM tasks WHERE finished_at < ?", (cutoff,))
+            self._conn.commit()
+
+    def heartbeat(self, now: float | None = None):
+        """Mark this worker, and so every task it owns, as alive."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO task_workers (worker_id, heartbeat_at) VALUES (?, ?) "
+                "ON CONFLICT(worker_id) DO UPDATE SET heartbeat_at = excluded.heartbeat_at",
+                (self.worker_id, time.time() if now is None else now),
+            )
+            self._conn.commit()
+
+    def expire(self, cutoff: float) -> int:
+        """Mark unfinished tasks of workers silent since `cutoff` as failed.
+
+        A task is expired only when neither its owner's heartbeat nor its own
+        record is newer than `cutoff`, and never when this worker owns it, so
+        quiet tasks (e.g. still queued) of live workers are left alone. The
+        final `failed` event is appended too, so streams of those tasks end.
+        Returns how many tasks were expired.
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT t.task_id FROM tasks t LEFT JOIN task_workers w ON w.worker_id = t.owner "
+                "WHERE t.status NOT IN ('done', 'failed') AND COALESCE(t.owner, '') != ? "
+                "AND MAX(COALESCE(w.heartbeat_at, 0), COALESCE(t.updated_at, t.created_at)) < ?",
+                (self.worker_id, cutoff),
+            ).fetchall()
+            stale = [row["task_id"] for row in rows]
+            for task_id in stale:
+                self._conn.execute(
+                    "INSERT INTO task_events (task_id, event_id, event, data) SELECT ?, COALESCE(MAX(event_id) + 1, 0), "
+                    "'failed', ? FROM task_events WHERE task_id = ?",
+                    (task_id, json.dumps({"error": STALE_ERROR}), task_id),
+                )
+                self._conn.execute("UPDATE tasks SET status = 'failed', error = ?, finished_at = ?, updated_at = ? "
+                                   "WHERE task_id = ?", (STALE_ERROR, now, now, task_id))
+            self._conn.execute("DELETE FROM task_workers WHERE heartbeat_at < ? AND worker_id != ?",
+                               (cutoff, self.worker_id))
+            self._conn.commit()
+        if stale:
+            logging.warning(f"Marked {len(stale)} task(s) of unresponsive workers as failed: {', '.join(stale)}")
+        return len(stale)
+
+
+def format_sse(event: dict) -> str:
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'], ensure_ascii=False)}\n\n"
+
+
+class TaskManager:
+    """Bounded in-process work queue: submit returns immediately, workers run the coroutines.
+
+    With a `log`, every task is also recorded there so that `get` works for
+    tasks submitted to another worker process. Every `heartbeat_seconds` the
+    manager renews its worker's heartbeat in the log; unfinished tasks of
+    workers without a heartbeat for `stale_seconds` are marked failed, since
+    the process running them has presumably died.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_queued: int = DEFAULT_MAX_QUEUED,
+                 retention_seconds: int = DEFAULT_RETENTION_SECONDS, log: TaskLog | None = None,
+                 stale_seconds: int = DEFAULT_STALE_SECONDS, heartbeat_seconds: float = DEFAULT_HEARTBEAT_SECONDS):
+        self.workers = workers
+        self.retention_seconds = retention_seconds
+        self.stale_seconds = stale_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.log = log
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self._tasks: dict[str, Task] = {}
+        self._worker_tasks: list[asyncio.Task] = []
+
+    async def start(self):
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if self.log is not None:
+            await asyncio.to_thread(self.log.heartbeat)
+            self._worker_tasks.append(asyncio.create_task(self._heartbeat_loop()))
+
+    async def stop(self):
+        for worker in self._worker_tasks:
+            worker.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    def submit(self, kind: str, fn, *args) -> Task:
+        """Queue `fn(task, *args)`; raises QueueFullError when the backlog is at capacity."""
+        self._purge_finished()
+        if self._queue.full():
+            raise QueueFullError(f"{self._queue.qsize()} tasks already queued")
+        task = Task(kind, self.log)
+        self._queue.put_nowait((task, fn, args))
+        self._tasks[task.id] = task
+        return task
+
+    def get(self, task_id: str) -> Task | StoredTask | None:
+        task = self._tasks.get(task_id)
+        if task is None and self.log is not None:
+            return self.log.load(task_id)
+        return task
+
+    def stats(self) -> dict:
+        statuses = [t.status for t in self._tasks.values()]
+        return {s: statuses.count(s) for s in ("queued", "running", "done", "failed")}
+
+    async def _worker(self):
+        while True:
+            task, fn, args = await self._queue.get()
+            task.start()
+            try:
+                await task.finish(result=await fn(task, *args))
+            except Exception as e:
+                logging.error(f"Task {task.id} ({task.kind}) failed: {e}")
+                await task.finish(error=str(e))
+            finally:
+                self._queue.task_done()
+
+    def _purge_finished(self):
+        cutoff = time.time() - self.retention_seconds
+        for task_id in [t.id for t in self._tasks.values() if t.finished and t.finished_at < cutoff]:
+            del self._tasks[task_id]
+
+    def _maintain_log(self):
+        self.log.heartbeat()
+        self.log.purge(time.time() - self.retention_seconds)
+        self.log.expire(time.time() - self.stale_seconds)
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                await asyncio.to_thread(self._maintain_log)
+            except sqlite3.Error as e:
+                logging.warning(f"Could not update the task log: {e}")
@@ -0,0 +1,12 @@
+# conftest.py
+import os
+import tempfile
+
+# The apps read these at import time; keep the tests away from the real store, caches and crawler
+_WORK_DIR = tempfile.mkdtemp(prefix="resume-tests-")
+os.environ.setdefault("JOB_STORE_PATH", os.path.join(_WORK_DIR, "job_store.db"))
+os.environ.setdefault("RESUME_CACHE_DIR", os.path.join(_WORK_DIR, "resume_cache"))
+os.environ.setdefault("SHARED_CACHE_PATH", os.path.join(_WORK_DIR, "shared.db"))
+os.environ["CRAWL_INTERVAL_SECONDS"] = "0"
+os.environ["BROWSER_PREWARM"] = "0"
+os.environ["ADVICE_BACKEND"] = "stub"
@@ -0,0 +1,65 @@
+# test_bulk_match.py
+import random
+
+import pytest
+
+import bulk_match
+from skill_index import SkillIndex
+
+pytestmark = pytest.mark.skipif(bulk_match.np is None, reason="numpy is not installed")
+
+
+def _sets(count, vocab, rng, most=6):
+    # A small vocabulary gives many equal scores, so tie order is exercised
+    return [set(rng.sample(vocab, rng.randint(0, most))) for _ in range(count)]
+
+
+def _both_paths(monkeypatch, resume_sets, job_sets, top_k, per_job):
+    with_numpy = bulk_match.rank_matrix(resume_sets, job_sets, top_k, per_job)
+    with monkeypatch.context() as m:
+        m.setattr(bulk_match, "np", None)
+        with_python = bulk_match.rank_matrix(resume_sets, job_sets, top_k, per_job)
+    return with_numpy, with_python
+
+
+@pytest.mark.parametrize("block_cells", [bulk_match.MAX_BLOCK_CELLS, 64, 1])
+def test_numpy_and_python_rankings_are_identical(monkeypatch, block_cells):
+    rng = random.Random(11)
+    vocab = [f"s{i}" for i in range(12)]
+    job_sets = _sets(90, vocab, rng)
+    resume_sets = _sets(70, vocab + ["unknown"], rng, most=8)
+    # Small caps split both the jobs and the resumes into many blocks
+    monkeypatch.setattr(bulk_match, "MAX_BLOCK_CELLS", block_cells)
+    (rankings, job_best), (expected_rankings, expected_best) = _both_paths(monkeypatch, resume_sets, job_sets, 25, 7)
+
+    assert rankings == expected_rankings
+    assert job_best == expected_best
+    assert all(len(ranking) == 25 for ranking in rankings)
+
+
+def test_ties_keep_catalog_and_input_order(monkeypatch):
+    job_sets = [{"a"}, {"b"}, {"a"}, {"a", "b"}, {"a"}]
+    resume_sets = [{"a"}, {"a"}, {"a", "b"}]
+    monkeypatch.setattr(bulk_match, "MAX_BLOCK_CELLS", 2)
+    for rankings, job_best in _both_paths(monkeypatch, resume_sets, job_sets, 5, 3):
+        assert rankings[0] == [(0, 1.0), (2, 1.0), (4, 1.0), (3, 0.5), (1, 0.0)]
+        assert rankings[2] == [(0, 1.0), (1, 1.0), (2, 1.0), (3, 1.0), (4, 1.0)]
+        assert job_best[0] == [(0, 1.0), (1, 1.0), (2, 1.0)]
+        assert job_best[3] == [(2, 1.0), (0, 0.5), (1, 0.5)]
+        # Only resumes scoring above zero are candidates
+        assert job_best[1] == [(2, 1.0)]
+
+
+def test_rankings_match_skill_index(monkeypatch):
+    rng = random.Random(3)
+    vocab = [f"s{i}" for i in range(9)]
+    job_sets = _sets(40, vocab, rng)
+    resume_sets = _sets(15, vocab, rng)
+    index = SkillIndex()
+    for j, skills in enumerate(job_sets):
+        index.add_job(j, skills)
+    monkeypatch.setattr(bulk_match, "MAX_BLOCK_CELLS", 16)
+    rankings, _ = bulk_match.rank_matrix(resume_sets, job_sets, 10, 1)
+
+    for skills, ranking in zip(resume_sets, rankings):
+        assert ranking == [(r["job_id"], r["score"]) for r in index.score(skills, top_k=10)]
@@ -0,0 +1,226 @@
+# test_crawler.py
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+
+import crawler
+import http_extractor
+
+PAGE_SIZE = 10
+
+
+class FakeElement:
+    def __init__(self, onclick=None, page=None):
+        self.onclick = onclick
+        self.page = page
+
+    async def get_attribute(self, name):
+        return self.onclick
+
+    async def click(self):
+        self.page.page_no += 1
+
+
+class FakeListingPage:
+    """The bdjobs listing as a browser page: `ids` newest first, PAGE_SIZE per page."""
+
+    def __init__(self, ids):
+        self.ids = ids
+        self.page_no = 0
+        self.url = crawler.BASE_URL
+        self.pages_read = 0
+
+    async def goto(self, url, **kwargs):
+        self.page_no = 0
+
+    async def wait_for_selector(self, selector, **kwargs):
+        return True
+
+    async def wait_for_function(self, *args, **kwargs):
+        return True
+
+    async def query_selector_all(self, selector):
+        self.pages_read += 1
+        ids = self.ids[self.page_no * PAGE_SIZE:(self.page_no + 1) * PAGE_SIZE]
+        return [FakeElement(f"DivOpen('id={i}&fcatId=8',1,'Title {i}','Acme')") for i in ids]
+
+    async def query_selector(self, selector):
+        if (self.page_no + 1) * PAGE_SIZE < len(self.ids):
+            return FakeElement(page=self)
+        return None
+
+
+class FakePool:
+    def __init__(self, page):
+        self._page = page
+
+    @asynccontextmanager
+    async def page(self):
+        yield self._page
+
+
+def _known(ids, scraped_at):
+    return {str(i): {"title": f"Title {i}", "company": "Acme", "scraped_at": scraped_at, "etag": None,
+                     "last_modified": None} for i in ids}
+
+
+@pytest.fixture
+def no_http(monkeypatch):
+    # Every posting in these tests is known and fresh, so nothing should be fetched
+    def handler(request):
+        raise AssertionError(f"unexpected fetch of {request.url}")
+    monkeypatch.setattr(http_extractor, "new_client",
+                        lambda **kwargs: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+
+def _crawl(page, known, full):
+    return asyncio.run(crawler.crawl_incremental(known, max_jobs=100, browsers=FakePool(page), full=full,
+                                                 executor=crawler.CrawlExecutor(retries=0)))
+
+
+def test_incremental_crawl_stops_at_first_known_page(no_http):
+    page = FakeListingPage(list(range(130, 100, -1)))
+    result = _crawl(page, _known(range(101, 131), time.time()), full=False)
+    assert page.pages_read == 1
+    assert result["unchanged"] == [str(i) for i in range(130, 120, -1)]
+
+
+def test_full_crawl_re_sees_every_listed_posting(no_http):
+    page = FakeListingPage(list(range(130, 100, -1)))
+    result = _crawl(page, _known(range(101, 131), time.time()), full=True)
+    assert page.pages_read == 3
+    assert sorted(result["unchanged"]) == sorted(str(i) for i in range(101, 131))
+    assert result["listed"] == 30
+
+
+def _executor(**kwargs):
+    breaker = crawler.CircuitBreaker(threshold=kwargs.pop("threshold", 3), cooldown=kwargs.pop("cooldown", 60))
+    return crawler.CrawlExecutor(breaker, **{"deadline": 1, "retries": 2, "backoff": 0.001, **kwargs})
+
+
+def _flaky(failures: int, calls: list):
+    async def step():
+        calls.append(time.monotonic())
+        if len(calls) <= failures:
+            raise RuntimeError("boom")
+        return "ok"
+    return step
+
+
+def test_executor_retries_then_succeeds():
+    executor, calls = _executor(), []
+    assert asyncio.run(executor.run("detail", "http://h/1", _flaky(2, calls))) == "ok"
+    assert len(calls) == 3
+    assert not executor.degraded
+    assert executor.breaker.state("h") == "closed"
+
+
+def test_executor_backs_off_exponentially(monkeypatch):
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+    monkeypatch.setattr(crawler.asyncio, "sleep", sleep)
+    executor = _executor(backoff=1.0, retries=3, threshold=10)
+    with pytest.raises(crawler.CrawlStepError):
+        asyncio.run(executor.run("detail", "http://h/1", _flaky(10, [])))
+    assert len(delays) == 3
+    # Full jitter: each delay is within [0.5, 1.5] of backoff * 2**attempt
+    for attempt, delay in enumerate(delays):
+        assert 0.5 * 2 ** attempt <= delay <= 1.5 * 2 ** attempt
+
+
+def test_executor_applies_the_deadline_per_attempt():
+    executor = _executor(deadline=0.05, retries=1, threshold=10)
+    started = time.monotonic()
+    with pytest.raises(crawler.CrawlStepError, match="TimeoutError"):
+        asyncio.run(executor.run("detail", "http://h/slow", lambda: asyncio.sleep(5)))
+    assert time.monotonic() - started < 1
+    assert executor.failures == [{"kind": "detail", "url": "http://h/slow", "error": "TimeoutError"}]
+    assert executor.degraded
+
+
+def test_breaker_opens_refuses_then_closes_after_a_good_trial():
+    executor = _executor(threshold=3, cooldown=0.05, retries=0)
+    for i in range(3):
+        with pytest.raises(crawler.CrawlStepError):
+            asyncio.run(executor.run("detail", f"http://h/{i}", _flaky(1, [])))
+    assert executor.breaker.state("h") == "open"
+
+    calls = []
+    with pytest.raises(crawler.CircuitOpenError):
+        asyncio.run(executor.run("detail", "http://h/refused", _flaky(0, calls)))
+    assert calls == []
+    # Other hosts are unaffected
+    assert asyncio.run(executor.run("detail", "http://other/1", _flaky(0, []))) == "ok"
+
+    time.sleep(0.06)
+    assert executor.breaker.state("h") == "half_open"
+    assert asyncio.run(executor.run("detail", "http://h/trial", _flaky(0, []))) == "ok"
+    assert executor.breaker.state("h") == "closed"
+
+
+def test_failed_trial_reopens_the_circuit():
+    breaker = crawler.CircuitBreaker(threshold=1, cooldown=0.05)
+    breaker.record_failure("h")
+    time.sleep(0.06)
+    assert breaker.allow("h")
+    # Only one trial at a time
+    assert not breaker.allow("h")
+    breaker.record_failure("h")
+    assert breaker.state("h") == "open"
+
+
+def test_cancelled_trial_does_not_wedge_the_circuit():
+    executor = _executor(threshold=1, cooldown=0.05, retries=0)
+    executor.breaker.record_failure("h")
+    time.sleep(0.06)
+
+    async def cancel_trial():
+        task = asyncio.create_task(executor.run("detail", "http://h/1", lambda: asyncio.sleep(5)))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    asyncio.run(cancel_trial())
+    assert executor.breaker.state("h") == "half_open"
+
+
+_DETAIL_HTML = ('<div id="skills"><button>Python</button></div>'
+                '<div id="requirements"><ul><li>Three years of Python</li></ul></div>')
+
+
+def test_fetch_details_returns_partial_results(monkeypatch):
+    def handler(request):
+        if request.url.params["id"] == "2":
+            return httpx.Response(503)
+        return httpx.Response(200, text=_DETAIL_HTML)
+    links = [{"url": f"https://jobs.bdjobs.com/jobdetails/?id={i}&fcatId=8", "title": "T", "company": "C"}
+             for i in (1, 2, 3)]
+    executor = _executor(retries=1, threshold=10)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await crawler.fetch_details(None, crawler.HostRateLimiter(rate=1000), links, http_client=client,
+                                               executor=executor)
+    jobs = asyncio.run(run())
+    assert [job["url"] for job in jobs] == [links[0]["url"], links[2]["url"]]
+    assert [failure["url"] for failure in executor.failures] == [links[1]["url"]]
+
+
+def test_rate_per_host_comes_from_the_environment(monkeypatch):
+    monkeypatch.setenv("CRAWL_RATE_PER_HOST", "0.5")
+
+    async def limits():
+        async with crawler.open_crawler(2, browsers=FakePool(None)) as (_, default, _, _):
+            pass
+        async with crawler.open_crawler(2, rate_per_host=8, browsers=FakePool(None)) as (_, explicit, _, _):
+            pass
+        return default, explicit
+
+    default, explicit = asyncio.run(limits())
+    assert (default.rate, default.burst) == (0.5, 2)
+    assert explicit.rate == 8
@@ -0,0 +1,126 @@
+# test_http_extractor.py
+"""The raw-HTML parser against the saved pages in fixtures/bdjobs, and the conditional GET outcomes."""
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+
+import crawler
+import http_extractor
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "bdjobs")
+URL = "https://jobs.bdjobs.com/jobdetails/?id=1394395&fcatId=8"
+
+with open(os.path.join(FIXTURES_DIR, "expected.json"), encoding="utf-8") as f:
+    EXPECTED = json.load(f)
+
+
+def _page(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_parse_job_details_html(name):
+    got = http_extractor.parse_job_details_html(_page(name))
+    assert (None if got is None else {"skills": got[0], "requirements": got[1]}) == EXPECTED[name]
+
+
+def _fetch(handler, **validators) -> dict:
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await http_extractor.fetch_job_details_conditional(client, URL, **validators)
+    return asyncio.run(run())
+
+
+def test_conditional_fetch_ok():
+    result = _fetch(lambda request: httpx.Response(200, text=_page("job_details_1394395.html"), headers={"ETag": '"v1"'}))
+    assert result["status"] == "ok"
+    assert result["etag"] == '"v1"'
+    assert list(result["details"]) == [EXPECTED["job_details_1394395.html"]["skills"],
+                                       EXPECTED["job_details_1394395.html"]["requirements"]]
+
+
+def test_conditional_fetch_not_modified():
+    def handler(request):
+        assert request.headers["If-None-Match"] == '"v1"'
+        return httpx.Response(304)
+    result = _fetch(handler, etag='"v1"')
+    assert result["status"] == "not_modified"
+    assert result["details"] is None
+
+
+@pytest.mark.parametrize("response, status", [
+    (httpx.Response(200, text="<div id=__next></div>"), "fallback"),
+    (httpx.Response(404), "fallback"),
+    (httpx.Response(503), "error"),
+])
+def test_conditional_fetch_fallbacks(response, status):
+    result = _fetch(lambda request: response)
+    assert result["status"] == status
+    assert result["details"] is None
+
+
+class _Text:
+    def __init__(self, text):
+        self.text = text
+
+    async def inner_text(self):
+        return self.text
+
+
+class _DetailPage:
+    """Browser page that renders every job with one skill and one requirement, recording what it loaded."""
+
+    def __init__(self, loaded):
+        self.loaded = loaded
+
+    async def goto(self, url, **kwargs):
+        self.loaded.append(url)
+
+    async def wait_for_selector(self, selector, **kwargs):
+        return _Text("")
+
+    async def query_selector(self, selector):
+        return _Text("")
+
+    async def query_selector_all(self, selector):
+        return [_Text("Rendered skill")] if selector.startswith("#skills") else [_Text("Rendered requirement")]
+
+
+class _Pool:
+    def __init__(self):
+        self.loaded = []
+
+    @asynccontextmanager
+    async def page(self):
+        yield _DetailPage(self.loaded)
+
+
+def test_fetch_details_uses_the_browser_only_when_html_lacks_the_sections():
+    pages = {"1": _page("job_details_1394395.html"), "2": _page("job_details_client_rendered.html")}
+    links = [{"url": f"https://jobs.bdjobs.com/jobdetails/?id={i}&fcatId=8", "title": "T", "company": "C"}
+             for i in pages]
+    pool = _Pool()
+
+    async def run():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, text=pages[request.url.params["id"]]))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await crawler.fetch_details(pool, crawler.HostRateLimiter(rate=1000), links, http_client=client)
+
+    jobs = {job["url"]: job for job in asyncio.run(run())}
+    assert pool.loaded == [links[1]["url"]]
+    assert jobs[links[0]["url"]]["skills"] == EXPECTED["job_details_1394395.html"]["skills"]
+    assert jobs[links[1]["url"]]["skills"] == ["Rendered skill"]
+    assert jobs[links[1]["url"]]["requirements"] == ["Rendered requirement"]
+
+
+def test_fetch_job_details_returns_none_for_fallback():
+    async def run():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, text=_page("job_details_client_rendered.html")))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await http_extractor.fetch_job_details(client, URL)
+    assert asyncio.run(run()) is None
@@ -0,0 +1,94 @@
+# test_job_catalog.py
+import math
+import random
+
+import pytest
+
+import job_catalog
+from job_catalog import MappedCatalog, is_catalog, write_catalog
+from skill_index import SkillIndex
+
+NOW = 100.0
+
+
+def _catalog(n=400, seed=5):
+    rng = random.Random(seed)
+    vocab = [f"s{i}" for i in range(60)] + ["c++", "ünïcode"]
+    jobs, sets = [], []
+    for i in range(n):
+        # Every 7th posting has expired by NOW
+        expires_at = 0 if i % 7 == 0 else (math.inf if i % 2 else 1e12)
+        jobs.append({"job_id": f"job{i}", "title": f"Title {i}", "company": "Cömpany", "url": f"https://x/?id={i}",
+                     "requirements": ["First line", "Second line"] if i % 3 else [], "expires_at": expires_at})
+        sets.append(set(rng.sample(vocab, rng.randint(0, 10))))
+    return jobs, sets, vocab
+
+
+@pytest.fixture(params=["numpy", "python"])
+def ranking_path(request, monkeypatch):
+    if request.param == "numpy" and job_catalog.np is None:
+        pytest.skip("numpy is not installed")
+    if request.param == "python":
+        monkeypatch.setattr(job_catalog, "np", None)
+    return request.param
+
+
+def test_scores_match_skill_index(tmp_path, ranking_path):
+    jobs, sets, vocab = _catalog()
+    path = str(tmp_path / "jobs.bin")
+    write_catalog(path, jobs, sets, "v1")
+    catalog = MappedCatalog(path)
+    index = SkillIndex()
+    for job, skills in zip(jobs, sets):
+        if job["expires_at"] > NOW:
+            index.add_job(job["job_id"], skills)
+
+    rng = random.Random(9)
+    for _ in range(10):
+        resume = set(rng.sample(vocab, rng.randint(0, 15))) | {"not-in-catalog"}
+        for top_k in (None, 0, 5, 1000):
+            for min_overlap in (0, 1, 3):
+                got_stats, want_stats = {}, {}
+                got = catalog.score(resume, top_k=top_k, min_overlap=min_overlap, stats=got_stats, now=NOW)
+                want = index.score(resume, top_k=top_k, min_overlap=min_overlap, stats=want_stats)
+                assert got == want
+                assert got_stats == want_stats
+    catalog.close()
+
+
+def test_round_trips_postings(tmp_path):
+    jobs, sets, _ = _catalog(n=20)
+    path = str(tmp_path / "jobs.bin")
+    size = write_catalog(path, jobs, sets, "v7")
+    assert size > 0 and is_catalog(path)
+    catalog = MappedCatalog(path)
+    assert len(catalog) == 20
+    assert catalog.normalizer_version == "v7"
+    for i, (job, skills) in enumerate(zip(jobs, sets)):
+        assert catalog.index_of(job["job_id"]) == i
+        assert catalog.job(i) == job
+        assert catalog.job_skills(job["job_id"]) == sorted(skills)
+    assert catalog.index_of("missing") is None and "missing" not in catalog
+    assert catalog.job_ids(now=NOW) == [job["job_id"] for job in jobs if job["expires_at"] > NOW]
+    with pytest.raises(KeyError):
+        catalog.job_skills("missing")
+    catalog.close()
+
+
+def test_replacing_the_file_leaves_open_mappings_intact(tmp_path):
+    path = str(tmp_path / "jobs.bin")
+    write_catalog(path, [{"job_id": "old", "title": "Old", "company": "C", "url": "u"}], [{"python"}])
+    old = MappedCatalog(path)
+    write_catalog(path, [{"job_id": "new", "title": "New", "company": "C", "url": "u"}], [{"go"}])
+    new = MappedCatalog(path)
+    assert old.job_ids() == ["old"] and old.job_skills("old") == ["python"]
+    assert new.job_ids() == ["new"]
+    old.close()
+    new.close()
+
+
+def test_is_catalog_rejects_other_files(tmp_path):
+    other = tmp_path / "job_skills.json"
+    other.write_text("[]", encoding="utf-8")
+    assert not is_catalog(str(other))
+    assert not is_catalog(str(tmp_path / "missing.bin"))
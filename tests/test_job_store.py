@@ -0,0 +1,128 @@
+# test_job_store.py
+import json
+
+import pytest
+
+from job_store import JobStore
+
+NOW = 1_000_000.0
+
+
+def _job(n: int, title: str = "Engineer") -> dict:
+    return {"url": f"https://jobs.bdjobs.com/jobdetails/?id={n}&fcatId=8", "title": title, "company": "Acme",
+            "skills": ["Python"], "requirements": []}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"), ttl_seconds=100)
+    yield store
+    store.close()
+
+
+def _changed(store, cursor, now=NOW):
+    return [job["job_id"] for job in store.jobs_changed_since(cursor, now=now)]
+
+
+def test_cursor_returns_only_later_changes(store):
+    store.upsert_jobs([_job(1), _job(2)], now=NOW)
+    jobs = store.jobs_changed_since(0, now=NOW)
+    assert [job["job_id"] for job in jobs] == ["1", "2"]
+    cursor = max(job["change_seq"] for job in jobs)
+    assert _changed(store, cursor) == []
+
+    store.touch_jobs(["2"], now=NOW + 1)
+    store.upsert_jobs([_job(1, title="Senior Engineer"), _job(3)], now=NOW + 2)
+    assert _changed(store, cursor) == ["2", "1", "3"]
+
+
+def test_cursor_skips_expired_jobs(store):
+    store.upsert_jobs([_job(1)], now=NOW)
+    store.upsert_jobs([_job(2)], now=NOW + 50)
+    assert _changed(store, 0, now=NOW + 120) == ["2"]
+
+
+def test_sequence_is_not_reused_after_purge(store):
+    store.upsert_jobs([_job(1), _job(2)], now=NOW)
+    store.upsert_jobs([_job(3)], now=NOW + 50)
+    cursor = max(job["change_seq"] for job in store.jobs_changed_since(0, now=NOW))
+    # The newest row goes too, so MAX(change_seq) over the table drops to nothing
+    assert store.purge_expired(now=NOW + 500) == 3
+
+    store.upsert_jobs([_job(4)], now=NOW + 500)
+    assert _changed(store, cursor, now=NOW + 500) == ["4"]
+
+
+def test_sequence_survives_reopen(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = JobStore(path, ttl_seconds=100)
+    store.upsert_jobs([_job(1)], now=NOW)
+    cursor = store.jobs_changed_since(0, now=NOW)[0]["change_seq"]
+    store.purge_expired(now=NOW + 500)
+    store.close()
+
+    store = JobStore(path, ttl_seconds=100)
+    store.upsert_jobs([_job(2)], now=NOW + 500)
+    assert _changed(store, cursor, now=NOW + 500) == ["2"]
+    store.close()
+
+
+def test_upsert_counts_new_and_changed_postings(store):
+    assert store.upsert_jobs([_job(1), _job(2)], now=NOW) == 2
+    assert store.upsert_jobs([_job(1), _job(2, title="Lead")], now=NOW + 1) == 1
+    assert [job["title"] for job in store.fresh_jobs(now=NOW + 1)] == ["Engineer", "Lead"]
+
+
+def test_purge_drops_only_expired_postings(store):
+    store.upsert_jobs([_job(1)], now=NOW)
+    store.upsert_jobs([_job(2)], now=NOW + 60)
+    # A touch extends the expiry of a posting that is still listed
+    store.touch_jobs(["1"], now=NOW + 90)
+    store.upsert_jobs([_job(3)], now=NOW)
+
+    assert store.purge_expired(now=NOW + 150) == 1
+    assert [job["job_id"] for job in store.fresh_jobs(now=NOW + 150)] == ["1", "2"]
+    assert store.count(now=NOW + 150) == 2
+    assert store.count(fresh_only=False) == 2
+
+
+def test_touch_validated_resets_scraped_at(store):
+    store.upsert_jobs([_job(1), _job(2)], now=NOW)
+    store.touch_jobs(["1"], validated=True, now=NOW + 10)
+    store.touch_jobs(["2"], now=NOW + 10)
+    jobs = {job["job_id"]: job for job in store.fresh_jobs(now=NOW + 10)}
+    assert jobs["1"]["scraped_at"] == NOW + 10
+    assert jobs["2"]["scraped_at"] == NOW
+    assert jobs["1"]["expires_at"] == jobs["2"]["expires_at"] == NOW + 110
+
+
+def test_seed_from_json(store, tmp_path):
+    path = tmp_path / "seed.json"
+    path.write_text(json.dumps([_job(7), _job(8)]), encoding="utf-8")
+    assert store.seed_from_json(str(path)) == 2
+    assert store.seed_from_json(str(tmp_path / "missing.json")) == 0
+    assert sorted(store.known_jobs()) == ["7", "8"]
+
+
+def test_lease_is_exclusive_until_released_or_expired(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    # Two handles on one file, as two worker processes would have
+    first, second = JobStore(path), JobStore(path)
+    assert first.acquire_lease("crawl", "worker-a", 60, now=NOW)
+    assert not second.acquire_lease("crawl", "worker-b", 60, now=NOW + 1)
+    assert second.lease_owner("crawl", now=NOW + 1) == "worker-a"
+    # The holder may renew
+    assert first.acquire_lease("crawl", "worker-a", 60, now=NOW + 30)
+    assert not second.acquire_lease("crawl", "worker-b", 60, now=NOW + 61)
+
+    # A holder that died without releasing loses the lease when it runs out
+    assert second.acquire_lease("crawl", "worker-b", 60, now=NOW + 91)
+    assert first.lease_owner("crawl", now=NOW + 91) == "worker-b"
+
+    # Only the owner's release counts
+    first.release_lease("crawl", "worker-a")
+    assert first.lease_owner("crawl", now=NOW + 92) == "worker-b"
+    second.release_lease("crawl", "worker-b")
+    assert first.lease_owner("crawl", now=NOW + 92) is None
+    first.close()
+    second.close()
@@ -0,0 +1,59 @@
+# test_metrics.py
+import json
+import os
+
+from metrics import Counter, Gauge, Histogram, Registry
+
+
+def _registry(directory, worker_id):
+    registry = Registry(str(directory), flush_seconds=0, worker_id=worker_id)
+    registry.register(Counter("requests_total", "Requests.", ["route"]))
+    registry.register(Gauge("in_flight", "In flight."))
+    registry.register(Histogram("latency_seconds", "Latency.", buckets=(0.1, 1)))
+    return registry
+
+
+def _metric(registry, name):
+    return next(metric for metric in registry._metrics if metric.name == name)
+
+
+def test_render_sums_every_worker(tmp_path):
+    # Worker ids double as pids for the liveness check; the current pid is alive
+    first, second = _registry(tmp_path, os.getpid()), _registry(tmp_path, os.getppid())
+    _metric(first, "requests_total").inc(route="/a")
+    _metric(second, "requests_total").inc(2, route="/a")
+    _metric(second, "requests_total").inc(route="/b")
+    _metric(first, "in_flight").inc()
+    _metric(second, "in_flight").inc(3)
+    _metric(first, "latency_seconds").observe(0.05)
+    _metric(second, "latency_seconds").observe(0.5)
+    second.flush()
+    text = first.render()
+
+    assert 'requests_total{route="/a"} 3' in text
+    assert 'requests_total{route="/b"} 1' in text
+    assert "in_flight 4" in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert "latency_seconds_count 2" in text
+
+
+def test_exited_workers_keep_counters_but_not_gauges(tmp_path):
+    registry = _registry(tmp_path, os.getpid())
+    # A pid above the kernel maximum cannot belong to a running process
+    (tmp_path / "99999999.json").write_text(json.dumps({
+        "requests_total": [[["/a"], 5]], "in_flight": [[[], 2]],
+    }))
+    text = registry.render()
+
+    assert 'requests_total{route="/a"} 5' in text
+    assert "in_flight" in text and "in_flight 2" not in text
+
+
+def test_without_a_directory_only_local_values_are_rendered():
+    registry = Registry()
+    counter = registry.register(Counter("requests_total", "Requests."))
+    counter.inc()
+
+    assert registry.multiproc_dir == ""
+    assert "requests_total 1" in registry.render()
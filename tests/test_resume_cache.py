@@ -0,0 +1,71 @@
+# test_resume_cache.py
+import os
+
+from resume_cache import ResumeCache, content_digest
+
+PARSED = {"resume": {"name": "A"}, "normalized_skills": ["python"]}
+
+
+def _set_mtime(cache, digest, mtime):
+    path = cache._path(cache._key(digest))
+    os.utime(path, (mtime, mtime))
+
+
+def test_entries_persist_across_instances(tmp_path):
+    digest = content_digest(b"%PDF-1.4 one")
+    ResumeCache(str(tmp_path), version="1").put(digest, PARSED)
+    cache = ResumeCache(str(tmp_path), version="1")
+    assert cache.get(digest) == PARSED
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_version_change_misses(tmp_path):
+    digest = content_digest(b"%PDF-1.4 one")
+    ResumeCache(str(tmp_path), version="1").put(digest, PARSED)
+    cache = ResumeCache(str(tmp_path), version="2")
+    assert cache.get(digest) is None
+    assert cache.misses == 1
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = ResumeCache(str(tmp_path), memory_entries=0)
+    digest = content_digest(b"x")
+    cache.put(digest, PARSED)
+    with open(cache._path(cache._key(digest)), "w", encoding="utf-8") as f:
+        f.write("{not json")
+    assert cache.get(digest) is None
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = ResumeCache(str(tmp_path), max_entries=3, memory_entries=0)
+    digests = [content_digest(bytes([i])) for i in range(3)]
+    for i, digest in enumerate(digests):
+        cache.put(digest, PARSED)
+        _set_mtime(cache, digest, 1000 + i)
+    # A hit refreshes the entry, so the oldest untouched one goes first
+    assert cache.get(digests[0]) == PARSED
+    cache.put(content_digest(b"new"), PARSED)
+    assert cache.get(digests[1]) is None
+    assert cache.get(digests[0]) == PARSED
+    assert len(os.listdir(tmp_path)) == 3
+
+
+def test_eviction_bounds_total_bytes(tmp_path):
+    cache = ResumeCache(str(tmp_path), max_bytes=2500, memory_entries=0)
+    big = {"resume": {"text": "x" * 1000}}
+    for i in range(5):
+        cache.put(content_digest(bytes([i])), big)
+    total = sum(entry.stat().st_size for entry in os.scandir(tmp_path))
+    assert total <= 2500
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_memory_layer_serves_without_disk(tmp_path):
+    cache = ResumeCache(str(tmp_path), memory_entries=1)
+    first, second = content_digest(b"1"), content_digest(b"2")
+    cache.put(first, PARSED)
+    os.remove(cache._path(cache._key(first)))
+    assert cache.get(first) == PARSED
+    cache.put(second, PARSED)
+    # Pushed out of the one-entry memory layer, and gone from disk
+    assert cache.get(first) is None
@@ -0,0 +1,34 @@
+# test_resume_parser.py
+import os
+import shutil
+
+import resume_parser
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PDFS = sorted(os.path.join(BASE_DIR, "resume", name) for name in os.listdir(os.path.join(BASE_DIR, "resume"))
+              if name.endswith(".pdf"))[:2]
+
+
+def test_parse_errors_report_their_cause(tmp_path):
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not a pdf at all")
+    path, info, error = resume_parser._parse_resume_file(str(broken))
+
+    assert path == str(broken) and info is None
+    assert error and error != "No text extracted"
+
+
+def test_write_errors_fail_one_file_and_keep_going(tmp_path):
+    inputs = []
+    for pdf in PDFS:
+        shutil.copy(pdf, tmp_path / os.path.basename(pdf))
+        inputs.append(str(tmp_path / os.path.basename(pdf)))
+    output = tmp_path / "out"
+    # A directory where the first JSON file should go makes that write fail
+    os.makedirs(resume_parser.output_path_for(inputs[0], str(output)))
+    summary = resume_parser.process_resumes_batch(inputs, str(output), workers=1, verbose=False)
+
+    assert summary["processed"] == 1
+    assert summary["outputs"] == [resume_parser.output_path_for(inputs[1], str(output))]
+    assert [item["file"] for item in summary["failed"]] == [inputs[0]]
+    assert "Could not write" in summary["failed"][0]["error"]
@@ -0,0 +1,48 @@
+# test_shared_cache.py
+import time
+
+from shared_cache import SharedCache
+
+
+def _accessed_at(cache, key):
+    return cache._conn.execute("SELECT accessed_at FROM entries WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_values_are_shared_between_handles(tmp_path):
+    path = str(tmp_path / "shared.db")
+    writer, reader = SharedCache(path), SharedCache(path)
+    writer.put("advice", "k", {"text": "Learn Go", "n": [1, 2]})
+    assert reader.get("advice", "k") == {"text": "Learn Go", "n": [1, 2]}
+    assert reader.get("advice", "missing") is None
+    assert reader.get("other", "k") is None
+    writer.close()
+    reader.close()
+
+
+def test_hits_only_refresh_stale_recency(tmp_path):
+    cache = SharedCache(str(tmp_path / "shared.db"), touch_interval=60)
+    cache.put("ns", "k", 1)
+    stored = _accessed_at(cache, "k")
+    changes = cache._conn.total_changes
+    for _ in range(5):
+        assert cache.get("ns", "k") == 1
+    assert cache._conn.total_changes == changes
+    assert _accessed_at(cache, "k") == stored
+
+    cache._conn.execute("UPDATE entries SET accessed_at = ?", (time.time() - 120,))
+    cache._conn.commit()
+    cache.get("ns", "k")
+    assert _accessed_at(cache, "k") > time.time() - 5
+
+
+def test_eviction_keeps_the_most_recently_used(tmp_path):
+    cache = SharedCache(str(tmp_path / "shared.db"), max_entries=10, touch_interval=0)
+    for i in range(99):
+        cache.put("ns", str(i), i)
+    assert cache.get("ns", "0") == 0
+    # Trimming runs on every 100th write
+    cache.put("ns", "99", 99)
+    assert cache.count("ns") == 10
+    assert cache.get("ns", "0") == 0
+    assert cache.get("ns", "90") is None
+    assert cache.get("ns", "91") == 91
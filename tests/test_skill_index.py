@@ -0,0 +1,119 @@
+# test_skill_index.py
+import random
+import time
+import types
+
+import pytest
+
+import scraper
+from job_store import JobStore
+from skill_index import SkillIndex
+
+VOCAB = [f"skill{i}" for i in range(30)]
+
+
+def _reference(catalog: dict[str, set[str]], resume: set[str]) -> list[tuple[str, float]]:
+    """Brute-force ranking with scraper._score_match, ties in catalog order."""
+    scored = [(scraper._score_match(resume, skills)[0], -seq, job_id)
+              for seq, (job_id, skills) in enumerate(catalog.items())]
+    return [(job_id, score) for score, _, job_id in sorted(scored, reverse=True)]
+
+
+def test_incremental_updates_rank_like_a_fresh_build():
+    rng = random.Random(5)
+    index, catalog = SkillIndex(), {}
+    for step in range(400):
+        job_id = f"job{rng.randrange(60)}"
+        if rng.random() < 0.25:
+            index.remove_job(job_id)
+            catalog.pop(job_id, None)
+        else:
+            skills = set(rng.sample(VOCAB, rng.randint(1, 8)))
+            index.add_job(job_id, skills)
+            # A replaced job moves to the end of catalog order
+            catalog.pop(job_id, None)
+            catalog[job_id] = skills
+    assert index.job_ids() == list(catalog)
+
+    for _ in range(20):
+        resume = set(rng.sample(VOCAB, 6))
+        got = [(r["job_id"], r["score"]) for r in index.score(resume)]
+        assert got == _reference(catalog, resume)
+        assert [(r["job_id"], r["score"]) for r in index.score(resume, top_k=5)] == got[:5]
+
+
+def test_removed_skills_leave_the_postings():
+    index = SkillIndex()
+    index.add_job("a", {"python", "go"})
+    index.add_job("a", {"rust"})
+    assert index.overlap_counts({"python", "go"}) == {}
+    assert index.job_skills("a") == ["rust"]
+    index.remove_job("a")
+    assert len(index) == 0 and "a" not in index
+
+
+def test_min_overlap_drops_weak_candidates():
+    index = SkillIndex()
+    index.add_job("one", {"python", "sql", "docker"})
+    index.add_job("two", {"python", "go"})
+    index.add_job("none", {"rust"})
+    stats = {}
+    results = index.score({"python", "go"}, min_overlap=2, stats=stats)
+    assert [r["job_id"] for r in results] == ["two"]
+    assert stats == {"catalog": 3, "candidates": 1, "scored": 1}
+    assert [r["job_id"] for r in index.score({"python", "go"})] == ["two", "one", "none"]
+
+
+@pytest.fixture
+def synced_scraper(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path / "jobs.db"), ttl_seconds=3600)
+    monkeypatch.setattr(scraper, "job_store", store)
+    monkeypatch.setattr(scraper, "_skill_index", SkillIndex())
+    monkeypatch.setattr(scraper, "_indexed_jobs", {})
+    monkeypatch.setattr(scraper, "_index_expiry", [])
+    monkeypatch.setattr(scraper, "_index_cursor", 0)
+    monkeypatch.setattr(scraper, "_skill_names", {})
+    yield store
+    store.close()
+
+
+def _posting(n: int, skills: list[str]) -> dict:
+    return {"url": f"https://jobs.bdjobs.com/jobdetails/?id={n}&fcatId=8", "title": f"Job {n}", "company": "Acme",
+            "skills": skills, "requirements": []}
+
+
+def test_sync_applies_only_store_changes(synced_scraper):
+    store = synced_scraper
+    store.upsert_jobs([_posting(i, ["Python"]) for i in range(10)])
+    for _ in range(5):
+        scraper._sync_skill_index()
+    assert len(scraper._skill_index) == 10
+    assert len(scraper._index_expiry) == 10
+
+    store.upsert_jobs([_posting(3, ["Go"])])
+    store.touch_jobs(["4"])
+    scraper._sync_skill_index()
+    assert scraper._skill_index.job_skills("3") == sorted(scraper.skill_matcher.job_skills(_posting(3, ["Go"])))
+    assert len(scraper._index_expiry) == 12
+
+    # Every re-seen posting moves its expiry; superseded heap entries must not pile up
+    for _ in range(30):
+        store.touch_jobs([str(i) for i in range(10)])
+        scraper._sync_skill_index()
+    assert len(scraper._index_expiry) <= 2 * 10 + 64
+    assert {job_id for _, job_id in scraper._index_expiry} == set(scraper._indexed_jobs)
+
+
+def test_sync_drops_expired_postings(synced_scraper, monkeypatch):
+    store = synced_scraper
+    store.upsert_jobs([_posting(1, ["Python"])], ttl_seconds=3600)
+    store.upsert_jobs([_posting(2, ["Python"])], ttl_seconds=60)
+    store.upsert_jobs([_posting(3, ["Python"])], ttl_seconds=-1)
+    scraper._sync_skill_index()
+    assert scraper._skill_index.job_ids() == ["1", "2"]
+
+    later = time.time() + 120
+    monkeypatch.setattr(scraper, "time", types.SimpleNamespace(time=lambda: later))
+    scraper._sync_skill_index()
+    assert scraper._skill_index.job_ids() == ["1"]
+    assert set(scraper._indexed_jobs) == {"1"}
@@ -0,0 +1,34 @@
+# test_skill_matcher.py
+"""Skill extraction must keep matching fixtures/skills/expected.json.
+
+After an intended change, regenerate the fixture with
+`python benchmarks/bench_skill_matcher.py --update` and review the diff.
+"""
+import json
+import os
+
+import pytest
+
+from skill_matcher import SYNONYMS, SkillMatcher
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+with open(os.path.join(PROJECT_DIR, "fixtures", "skills", "expected.json"), encoding="utf-8") as f:
+    EXPECTED = json.load(f)
+with open(os.path.join(PROJECT_DIR, "job_skills.json"), encoding="utf-8") as f:
+    JOBS = {job["url"]: job for job in json.load(f)}
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return SkillMatcher.from_sources(SYNONYMS)
+
+
+@pytest.mark.parametrize("url", sorted(EXPECTED["jobs"]))
+def test_job_skills(matcher, url):
+    assert sorted(matcher.job_skills(JOBS[url])) == EXPECTED["jobs"][url]
+
+
+@pytest.mark.parametrize("case", EXPECTED["cases"], ids=lambda case: case["text"][:40])
+def test_phrase_cases(matcher, case):
+    assert sorted(matcher.extract(case["text"])) == case["skills"]
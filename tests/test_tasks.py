@@ -0,0 +1,123 @@
+# test_tasks.py
+import asyncio
+import sqlite3
+import time
+
+import tasks
+from tasks import STALE_ERROR, Task, TaskLog, TaskManager
+
+
+def test_records_are_written_in_order_off_the_caller(tmp_path):
+    path = str(tmp_path / "shared.db")
+    log, other = TaskLog(path), TaskLog(path)
+
+    async def run():
+        task = Task("match", log)
+        task.start()
+        for i in range(50):
+            await task.advance(done=i + 1, total=50)
+        await task.finish(result={"ok": True})
+        return task
+
+    task = asyncio.run(run())
+    log.flush()
+    # Another process's handle sees the final state and every event
+    stored = other.load(task.id)
+    assert stored.status == "done" and stored.result == {"ok": True}
+    assert stored.progress == {"done": 50, "total": 50}
+    assert [e["id"] for e in stored.events] == list(range(51))
+    assert stored.events[-1]["event"] == "done"
+    log.close()
+    other.close()
+
+
+def test_close_commits_pending_records(tmp_path):
+    path = str(tmp_path / "shared.db")
+    log = TaskLog(path)
+    task = Task("match", log)
+    log.close()
+
+    reopened = TaskLog(path)
+    assert reopened.status(task.id) == "queued"
+    reopened.close()
+
+
+def _stale_task(log, age):
+    """A running task of `log`'s worker whose record was last written `age` seconds ago."""
+    task = Task("match", log)
+    task.start()
+    log.flush()
+    with log._lock:
+        log._conn.execute("UPDATE tasks SET updated_at = ? WHERE task_id = ?", (time.time() - age, task.id))
+        log._conn.commit()
+    return task
+
+
+def test_expire_fails_tasks_of_silent_workers_only(tmp_path):
+    path = str(tmp_path / "shared.db")
+    dead, alive, me = TaskLog(path, "dead"), TaskLog(path, "alive"), TaskLog(path, "me")
+    dead.heartbeat(now=time.time() - 2000)
+    alive.heartbeat()
+    orphan, quiet, mine = _stale_task(dead, 2000), _stale_task(alive, 2000), _stale_task(me, 2000)
+
+    assert me.expire(time.time() - 900) == 1
+    stored = me.load(orphan.id)
+    assert stored.status == "failed" and stored.error == STALE_ERROR
+    assert stored.events[-1] == {"id": 0, "event": "failed", "data": {"error": STALE_ERROR}}
+    # A live worker's quiet task, and this worker's own, are left alone
+    assert me.status(quiet.id) == "running"
+    assert me.status(mine.id) == "running"
+    for log in (dead, alive, me):
+        log.close()
+
+
+def test_recent_records_outlive_a_missing_heartbeat(tmp_path):
+    path = str(tmp_path / "shared.db")
+    other, me = TaskLog(path, "other"), TaskLog(path, "me")
+    # `other` has never sent a heartbeat, but its task was written just now
+    fresh = _stale_task(other, 0)
+    old = _stale_task(other, 2000)
+
+    assert me.expire(time.time() - 900) == 1
+    assert me.status(fresh.id) == "running"
+    assert me.status(old.id) == "failed"
+    other.close()
+    me.close()
+
+
+def test_old_logs_gain_the_owner_column(tmp_path):
+    path = str(tmp_path / "shared.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(tasks._SCHEMA.replace(",\n    updated_at REAL,\n    owner TEXT", ""))
+    conn.execute("INSERT INTO tasks (task_id, kind, status, created_at, progress) VALUES ('legacy', 'match', "
+                 "'running', ?, '{}')", (time.time() - 2000,))
+    conn.commit()
+    conn.close()
+
+    log = TaskLog(path, "me")
+    # Rows without an owner fall back to their own timestamps
+    assert log.expire(time.time() - 900) == 1
+    assert log.status("legacy") == "failed"
+    log.close()
+
+
+def test_manager_heartbeats_and_expires_on_its_own(tmp_path):
+    path = str(tmp_path / "shared.db")
+    dead, log = TaskLog(path, "dead"), TaskLog(path, "me")
+    dead.heartbeat(now=time.time() - 2000)
+    orphan = _stale_task(dead, 2000)
+
+    async def run():
+        manager = TaskManager(workers=1, log=log, stale_seconds=900, heartbeat_seconds=0.01)
+        await manager.start()
+        await asyncio.sleep(0.2)
+        await manager.stop()
+
+    asyncio.run(run())
+    assert log.status(orphan.id) == "failed"
+    with log._lock:
+        beats = {row["worker_id"] for row in log._conn.execute("SELECT worker_id FROM task_workers")}
+    # The dead worker's heartbeat row is cleaned up along with its tasks
+    assert beats == {"me"}
+    dead.close()
+    log.close()
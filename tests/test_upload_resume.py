@@ -0,0 +1,62 @@
+# test_upload_resume.py
+import asyncio
+import glob
+import os
+
+import httpx
+import pytest
+
+import resume_parser
+import scraper
+from resume_cache import ResumeCache
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PDFS = sorted(glob.glob(os.path.join(PROJECT_DIR, "resume", "*.pdf")))
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(scraper, "RESUME_DIR", str(tmp_path / "resume"))
+    os.makedirs(scraper.RESUME_DIR)
+    monkeypatch.setattr(scraper, "resume_cache", ResumeCache(str(tmp_path / "cache"), version="test"))
+    return scraper.app
+
+
+async def _upload_all(app, payloads: list[bytes], filename: str) -> list[dict]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(*(
+            client.post("/upload_resume", files={"file": (filename, payload, "application/pdf")})
+            for payload in payloads
+        ))
+    for response in responses:
+        assert response.status_code == 200, response.text
+    return [response.json() for response in responses]
+
+async def _upload_raw(app, payload: bytes) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post("/upload_resume", files={"file": ("broken.pdf", payload, "application/pdf")})
+
+
+def test_concurrent_uploads_with_the_same_filename(app):
+    payloads = []
+    for path in PDFS:
+        with open(path, "rb") as f:
+            payloads.append(f.read())
+    expected = [resume_parser.parse_resume(path)["name"] for path in PDFS]
+    assert len(set(expected)) == len(PDFS)
+
+    got = asyncio.run(_upload_all(app, payloads, "CV.pdf"))
+    assert [result["name"] for result in got] == expected
+
+    # The cache holds each upload's own parse, not whichever file won the shared path
+    again = asyncio.run(_upload_all(app, payloads, "CV.pdf"))
+    assert [result["name"] for result in again] == expected
+    assert os.listdir(scraper.RESUME_DIR) == ["CV.pdf"]
+
+
+def test_failed_parse_leaves_no_file_behind(app):
+    response = asyncio.run(_upload_raw(app, b"%PDF-1.4 not really a pdf"))
+    assert response.status_code == 500
+    assert os.listdir(scraper.RESUME_DIR) == []
@@ -0,0 +1,79 @@
+# test_uploads.py
+import asyncio
+
+from uploads import MaxBodySizeMiddleware
+
+
+def _run(middleware, headers, chunks, path="/upload_resume"):
+    """Send `chunks` as the request body; returns (sent messages, messages the app received)."""
+    scope = {"type": "http", "method": "POST", "path": path, "headers": headers}
+    bodies = [{"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+              for i, chunk in enumerate(chunks)]
+    sent, seen = [], []
+
+    async def receive():
+        return bodies.pop(0) if bodies else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    async def app(scope, receive, send):
+        while True:
+            message = await receive()
+            seen.append(message)
+            if message["type"] == "http.disconnect" or not message.get("more_body"):
+                break
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    asyncio.run(middleware(app)(scope, receive, send))
+    return sent, seen
+
+
+def _middleware(max_bytes):
+    def wrap(app):
+        middleware = MaxBodySizeMiddleware(app, max_bytes=max_bytes)
+        # Drop the multipart allowance so the limit is exactly max_bytes
+        middleware.max_bytes = max_bytes
+        return middleware
+    return wrap
+
+
+def _status(sent):
+    return next(message["status"] for message in sent if message["type"] == "http.response.start")
+
+
+def test_bodies_within_the_limit_reach_the_app():
+    sent, seen = _run(_middleware(10), [(b"content-length", b"8")], [b"1234", b"5678"])
+
+    assert _status(sent) == 200
+    assert b"".join(message["body"] for message in seen) == b"12345678"
+
+
+def test_invalid_content_length_is_a_bad_request():
+    for value in (b"ten", b"", b"-5"):
+        sent, seen = _run(_middleware(10), [(b"content-length", value)], [b"1234"])
+
+        assert _status(sent) == 400
+        assert seen == []
+
+
+def test_declared_oversized_bodies_are_rejected_unread():
+    sent, seen = _run(_middleware(10), [(b"content-length", b"11")], [b"12345678901"])
+
+    assert _status(sent) == 413
+    assert seen == []
+
+
+def test_chunked_bodies_are_cut_off_at_the_limit():
+    sent, seen = _run(_middleware(10), [(b"transfer-encoding", b"chunked")], [b"123456", b"789012", b"345"])
+
+    # Only the 413 goes out; the app's own response after the disconnect is dropped
+    assert [message.get("status") for message in sent if message["type"] == "http.response.start"] == [413]
+    assert seen[-1] == {"type": "http.disconnect"}
+
+
+def test_other_paths_are_not_limited():
+    sent, _ = _run(_middleware(10), [(b"content-length", b"ten")], [b"12345678901"], path="/match_jobs")
+
+    assert _status(sent) == 200
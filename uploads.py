@@ -0,0 +1,134 @@
+# uploads.py
+import asyncio
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException, UploadFile
+from starlette.responses import PlainTextResponse
+
+CHUNK_SIZE = 64 * 1024
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 1)))
+
+_parse_pool: ProcessPoolExecutor | None = None
+
+
+async def stream_to_tempfile(file: UploadFile, directory: str, max_bytes: int = MAX_UPLOAD_BYTES,
+                             suffix: str = ".part") -> tuple[str, str, int]:
+    """Copy an upload to a temp file in `directory` chunk by chunk, hashing as it goes.
+
+    Returns `(temp_path, sha256_hex, size)`. Memory use is one chunk regardless
+    of the file size; uploads larger than `max_bytes` are rejected with 413.
+
+    Starlette has already spooled the whole part (in memory up to 1 MiB, then
+    to its own temp file) before the endpoint runs, so this is a second copy.
+    It is kept because the spool is unnamed and deleted with the request, and
+    the caller needs a file under `directory` to rename into the resume cache;
+    MaxBodySizeMiddleware bounds what the spool can hold.
+    """
+    os.makedirs(directory, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := await file.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(status_code=413, detail=f"File exceeds the {max_bytes} byte limit")
+                digest.update(chunk)
+                await asyncio.to_thread(out.write, chunk)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return temp_path, digest.hexdigest(), size
+
+
+def safe_filename(filename: str | None, default: str = "upload.pdf") -> str:
+    """Strip any directory components a client put in the upload's filename."""
+    name = os.path.basename((filename or "").replace("\\", "/"))
+    return name or default
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+    return _parse_pool
+
+
+def start_workers():
+    """Fork the parse workers now, before the app starts child processes such as the Playwright driver.
+
+    Workers forked later would inherit the driver's pipes and keep it from
+    exiting when the browser is stopped. With the fork start method the pool
+    launches all of its workers on first submit and never forks again.
+    """
+    _get_pool().submit(os.getpid)
+
+
+async def run_in_worker(fn, *args):
+    """Run a CPU-bound function (e.g. PDF parsing) in the shared process pool without blocking the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(_get_pool(), fn, *args)
+
+
+def shutdown_workers():
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+
+class MaxBodySizeMiddleware:
+    """Reject request bodies over `max_bytes` before they are parsed or spooled to disk."""
+
+    def __init__(self, app, max_bytes: int = MAX_UPLOAD_BYTES, paths: tuple[str, ...] = ("/upload_resume",)):
+        self.app = app
+        # Multipart framing adds a little on top of the file itself
+        self.max_bytes = max_bytes + 64 * 1024
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+
+        too_large = PlainTextResponse("Request body too large", status_code=413)
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None:
+            try:
+                declared = int(content_length)
+            except ValueError:
+                declared = -1
+            if declared < 0:
+                return await PlainTextResponse("Invalid Content-Length header", status_code=400)(scope, receive, send)
+            if declared > self.max_bytes:
+                return await too_large(scope, receive, send)
+
+        received = 0
+        started = rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Answer 413 here, then tell the app the client is gone so it stops reading;
+                    # the error response it produces for that is dropped by guarded_send
+                    rejected = True
+                    if not started:
+                        await too_large(scope, receive, send)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            nonlocal started
+            if not rejected:
+                started = True
+                await send(message)
+
+        await self.app(scope, limited_receive, guarded_send)